@@ -1,17 +1,10 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pulp import LpMaximize, LpProblem, LpVariable, lpSum
 import os
 from dotenv import load_dotenv
-import joblib
-from google import genai
-from google.genai import types
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+# Heavy dependencies (google.genai, joblib/scikit-learn, plotly, pulp) are
+# imported inside the page that needs them, so each page only pays for its own.
 
 # Load environment variables
 load_dotenv()
@@ -661,200 +654,165 @@ with col3:
 # Initialize Gemini client
 @st.cache_resource
 def init_gemini():
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if api_key:
-        return genai.Client(api_key=api_key)
-    return None
+    from cricket_analytics.chat import FakeGeminiClient, create_gemini_client
+    if os.getenv("GEMINI_FAKE"):
+        return FakeGeminiClient()
+    return create_gemini_client(os.getenv("GOOGLE_API_KEY"))
+
+# Persistent chatbot response cache (shared by all sessions)
+@st.cache_resource
+def init_response_cache():
+    from cricket_analytics.response_cache import DEFAULT_CACHE_PATH, ResponseCache, gemini_embedder, ngram_embedder
+    embeddings = os.getenv("CHAT_CACHE_EMBEDDINGS", "off")
+    embed = None
+    if embeddings == "ngram":
+        embed = ngram_embedder()
+    elif embeddings == "gemini" and init_gemini() is not None and not os.getenv("GEMINI_FAKE"):
+        embed = gemini_embedder(init_gemini())
+    # Keep canned offline replies out of the real cache
+    path = ":memory:" if os.getenv("GEMINI_FAKE") else os.getenv("CHAT_CACHE_PATH", DEFAULT_CACHE_PATH)
+    return ResponseCache(path, embed=embed)
+
+# Bundled reference datasets, loaded once per process
+@st.cache_resource
+def load_reference_data():
+    from cricket_analytics.players import load_reference_datasets
+    return load_reference_datasets()
+
+# Read-only reference layers every session's player pool attaches instead of copying
+@st.cache_resource
+def load_reference_layers():
+    from cricket_analytics.pool import ReferenceLayer
+    return {name: ReferenceLayer(name, players) for name, players in load_reference_data().items()}
 
-# Load price prediction model
+# Retrieval index over the reference datasets
 @st.cache_resource
-def load_price_model():
+def init_player_index():
+    from cricket_analytics.retrieval import build_reference_index
+    return build_reference_index(load_reference_data())
+
+# Local answers for stat lookups (no LLM round trip)
+@st.cache_resource
+def init_stat_router():
+    from cricket_analytics.stat_router import StatRouter
+    return StatRouter(load_reference_data())
+
+# Price model registry: live version from model_registry.json, hot-reloaded, with an optional shadow
+@st.cache_resource
+def init_model_registry():
     try:
-        model = joblib.load('ipl_price_model.pkl')
-        feature_columns = joblib.load('feature_columns.pkl')
-        return model, feature_columns
+        from cricket_analytics.registry import ModelRegistry
+        return ModelRegistry()
     except FileNotFoundError as e:
         st.warning(f"⚠️ Model files not found: {e}. Please ensure 'ipl_price_model.pkl' and 'feature_columns.pkl' are in the project directory.")
-        return None, None
+        return None
     except Exception as e:
         st.error(f" Error loading model: {e}")
-        return None, None
-
-# Helper functions for feature engineering (from price_predictor.py)
-def get_nationality_premium(country):
-    country = country.lower()
-    if country == 'india':
-        return 1.0
-    elif country in ['england', 'australia', 'south africa', 'new zealand']:
-        return 0.8
-    else:
-        return 0.6
-
-def get_experience_tier(ipl_matches):
-    if ipl_matches == 0:
-        return 0
-    elif ipl_matches <= 20:
-        return 1
-    elif ipl_matches <= 50:
-        return 2
-    else:
-        return 3
-
-def get_age_bracket(age):
-    if age < 25:
-        return 'young_prospect'
-    elif age <= 32:
-        return 'prime'
-    else:
-        return 'veteran'
-
-def calculate_batting_impact(ipl_runs, ipl_sr, ipl_avg, t20_runs, t20_sr, t20_avg):
-    if ipl_runs > 0:
-        ipl_sr = ipl_sr if ipl_sr > 0 else 100
-        ipl_avg = ipl_avg if ipl_avg > 0 else 15
-        return (ipl_runs ** 0.7) * (ipl_sr / 130) * (ipl_avg / 25)
-    elif t20_runs > 0:
-        t20_sr = t20_sr if t20_sr > 0 else 100
-        t20_avg = t20_avg if t20_avg > 0 else 15
-        return (t20_runs ** 0.7) * (t20_sr / 130) * (t20_avg / 25) * 0.6
-    else:
-        return 0.0
-
-def calculate_bowling_impact(ipl_wkts, ipl_econ, ipl_sr, t20_wkts, t20_econ, t20_sr):
-    if ipl_wkts > 0:
-        ipl_econ = ipl_econ if ipl_econ > 0 else 8.5
-        ipl_sr = ipl_sr if ipl_sr > 0 else 20
-        return (ipl_wkts ** 0.7) * (8 / ipl_econ) * (20 / ipl_sr)
-    elif t20_wkts > 0:
-        t20_econ = t20_econ if t20_econ > 0 else 8.5
-        t20_sr = t20_sr if t20_sr > 0 else 20
-        return (t20_wkts ** 0.7) * (8 / t20_econ) * (20 / t20_sr) * 0.6
-    else:
-        return 0.0
-
-def calculate_consistency(ipl_runs, ipl_avg, ipl_sr, ipl_wkts, ipl_econ, ipl_bowl_sr):
-    if ipl_runs > 50:
-        ipl_avg = ipl_avg if ipl_avg > 0 else 15
-        ipl_sr = ipl_sr if ipl_sr > 0 else 100
-        return ipl_avg / (ipl_sr / 100)
-    elif ipl_wkts > 5:
-        ipl_econ = ipl_econ if ipl_econ > 0 else 8.5
-        ipl_bowl_sr = ipl_bowl_sr if ipl_bowl_sr > 0 else 20
-        return 1 / (ipl_econ * ipl_bowl_sr / 100)
-    else:
-        return 0.0
-
-def calculate_role_specialization(role, bat_impact, bowl_impact):
-    if role == 'batsman':
-        return bat_impact * 1.2
-    elif role == 'bowler':
-        return bowl_impact * 1.2
-    elif role == 'batting-allrounder':
-        return (bat_impact * 0.7) + (bowl_impact * 0.3)
-    elif role == 'bowling-allrounder':
-        return (bat_impact * 0.3) + (bowl_impact * 0.7)
-    elif role == 'wk-batsman':
-        return bat_impact * 1.1 + 10
-    else:
-        return bat_impact + bowl_impact
-
-def engineer_features(player_data):
-    """Engineer all 17 features from player data"""
-    
-    # Feature 1: Nationality Premium
-    nationality_premium = get_nationality_premium(player_data['country'])
-    
-    # Feature 2: Role Demand Score (simplified - use fixed value)
-    role_demand_score = 0.2  # Average value
-    
-    # Feature 3: Experience Tier
-    experience_tier = get_experience_tier(player_data['ipl_matches'])
+        return None
+
+# Price Predictor dashboard; built once per cached prediction (cricket_analytics.cache.cached_prediction)
+def build_price_dashboard(player_data, player_name, prediction):
+    """The four-panel performance dashboard for one priced player."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    from cricket_analytics.pricing import impact_breakdown
+
+    features = prediction['features']
+    predicted_price = prediction['predicted_price']
+
+    # Create 2x2 subplot
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Feature Contributions', 'IPL vs T20I Impact', 
+                      'Experience & Form', 'Price Category Gauge'),
+        specs=[[{"type": "bar"}, {"type": "bar"}],
+               [{"type": "scatter"}, {"type": "indicator"}]]
+    )
     
-    # Feature 4: International Exposure
-    international_exposure = np.log1p(player_data['t20_matches'])
+    # Chart 1: Top Feature Contributions
+    feature_names = ['Batting Impact', 'Bowling Impact', 'Role Spec', 'Form Momentum', 
+                   'Consistency', 'Int\'l Exposure']
+    feature_values = [features[5], features[6], features[8], features[9], 
+                    features[7], features[3]]
+    
+    fig.add_trace(
+        go.Bar(x=feature_names, y=feature_values,
+              marker_color=['#2E8B57', '#32CD32', '#90EE90', '#98FB98', '#3CB371', '#20B2AA'],
+              name='Features'),
+        row=1, col=1
+    )
     
-    # Feature 5: Uncapped Flag
-    uncapped_flag = 1 if (player_data['ipl_runs'] == 0 and player_data['ipl_wickets'] == 0) else 0
+    # Chart 2: IPL vs T20I Impact Comparison
+    breakdown = impact_breakdown(player_data)
     
-    # Feature 6: Batting Impact Index
-    batting_impact_index = calculate_batting_impact(
-        player_data['ipl_runs'], player_data['ipl_sr'], player_data['ipl_avg'],
-        player_data['t20_runs'], player_data['t20_sr'], player_data['t20_avg']
+    fig.add_trace(
+        go.Bar(x=list(breakdown.keys()),
+              y=list(breakdown.values()),
+              marker_color=['#FFD700', '#FFA500', '#4ECDC4', '#45B7D1'],
+              name='Performance'),
+        row=1, col=2
     )
     
-    # Feature 7: Bowling Impact Index
-    bowling_impact_index = calculate_bowling_impact(
-        player_data['ipl_wickets'], player_data['ipl_economy'], player_data['ipl_bowl_sr'],
-        player_data['t20_wickets'], player_data['t20_economy'], player_data['t20_bowl_sr']
+    # Chart 3: Experience vs Form Scatter
+    fig.add_trace(
+        go.Scatter(x=[features[2]], y=[features[9]], 
+                  mode='markers+text',
+                  marker=dict(size=predicted_price*10, color='#2E8B57', 
+                            line=dict(width=2, color='white')),
+                  text=[player_name or 'Player'],
+                  textposition='top center',
+                  name=player_name or 'Player'),
+        row=2, col=1
     )
     
-    # Feature 8: Consistency Metric
-    consistency_metric = calculate_consistency(
-        player_data['ipl_runs'], player_data['ipl_avg'], player_data['ipl_sr'],
-        player_data['ipl_wickets'], player_data['ipl_economy'], player_data['ipl_bowl_sr']
+    # Add reference lines
+    fig.add_hline(y=features[9], line_dash="dash", line_color="gray", 
+                opacity=0.5, row=2, col=1)
+    fig.add_vline(x=features[2], line_dash="dash", line_color="gray", 
+                opacity=0.5, row=2, col=1)
+    
+    # Chart 4: Price Category Gauge
+    fig.add_trace(
+        go.Indicator(
+            mode="gauge+number+delta",
+            value=predicted_price,
+            domain={'x': [0, 1], 'y': [0, 1]},
+            title={'text': "Price (Cr)", 'font': {'size': 16}},
+            delta={'reference': 5, 'increasing': {'color': "#2E8B57"}},
+            gauge={
+                'axis': {'range': [None, 30], 'tickwidth': 1},
+                'bar': {'color': "#2E8B57"},
+                'steps': [
+                    {'range': [0, 2], 'color': "#FFE5E5"},
+                    {'range': [2, 10], 'color': "#E5F5FF"},
+                    {'range': [10, 30], 'color': "#E5FFE5"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': predicted_price
+                }
+            }
+        ),
+        row=2, col=2
     )
     
-    # Feature 9: Role Specialization Score
-    role_specialization_score = calculate_role_specialization(
-        player_data['role'], batting_impact_index, bowling_impact_index
+    # Update layout
+    fig.update_xaxes(title_text="Features", row=1, col=1)
+    fig.update_yaxes(title_text="Value", row=1, col=1)
+    fig.update_xaxes(title_text="Performance Type", row=1, col=2)
+    fig.update_yaxes(title_text="Impact Score", row=1, col=2)
+    fig.update_xaxes(title_text="Experience Tier (0-3)", row=2, col=1)
+    fig.update_yaxes(title_text="Form Momentum", row=2, col=1)
+    
+    fig.update_layout(
+        height=800, 
+        showlegend=False,
+        title_text=f"Performance Analysis: {player_name or 'Player'}",
+        title_font_size=20
     )
-    
-    # Feature 10: Form Momentum
-    form_momentum = batting_impact_index + bowling_impact_index
-    
-    # Feature 11: Star Player Flag
-    star_player_flag = 1 if (player_data['ipl_runs'] > 2000 or 
-                             player_data['ipl_wickets'] > 100 or 
-                             player_data['t20_matches'] > 50) else 0
-    
-    # Feature 12: Explosive Factor
-    explosive_factor = 1 if (player_data['ipl_sr'] > 150 or 
-                             player_data['ipl_sixes'] > 50 or
-                             (player_data['ipl_economy'] > 0 and player_data['ipl_economy'] < 7.5)) else 0
-    
-    # Feature 13: Retention Proxy
-    retention_proxy = 1 if player_data['ipl_matches'] > 20 else 0
-    
-    # Feature 14: Hype Prospect
-    hype_prospect = 1 if (uncapped_flag and player_data['age'] < 25 and 
-                          (player_data['t20_sr'] > 140 or player_data['t20_wickets'] > 20)) else 0
-    
-    # Feature 15-17: Age Brackets (one-hot encoded)
-    age_bracket = get_age_bracket(player_data['age'])
-    age_prime = 1 if age_bracket == 'prime' else 0
-    age_veteran = 1 if age_bracket == 'veteran' else 0
-    age_young_prospect = 1 if age_bracket == 'young_prospect' else 0
-    
-    # Return features in correct order
-    features = [
-        nationality_premium,
-        role_demand_score,
-        experience_tier,
-        international_exposure,
-        uncapped_flag,
-        batting_impact_index,
-        bowling_impact_index,
-        consistency_metric,
-        role_specialization_score,
-        form_momentum,
-        star_player_flag,
-        explosive_factor,
-        retention_proxy,
-        hype_prospect,
-        age_prime,
-        age_veteran,
-        age_young_prospect
-    ]
-    
-    return features
-
-# Initialize resources
-gemini_client = init_gemini()
-model_result = load_price_model()
-if model_result[0] is not None:
-    price_model, feature_columns = model_result
-else:
-    price_model, feature_columns = None, None
+
+    return fig
 
 # Enhanced Main Header
 st.markdown("""
@@ -868,6 +826,28 @@ st.markdown("""
 # CRICKET AI CHATBOT 
 # ============================================================================
 if st.session_state.current_page == "🤖 Cricket AI Chatbot":
+    from cricket_analytics.cache import pool_fingerprint
+    from collections import deque
+    from cricket_analytics.chat import DEFAULT_TIMEOUT, stream_cricket_ai
+    from cricket_analytics.chat_history import ChatHistory
+    from cricket_analytics.retrieval import PlayerIndex, retrieve_context
+
+    gemini_client = init_gemini()
+    response_cache = init_response_cache()
+    player_index = init_player_index()
+    stat_router = init_stat_router()
+    gemini_timeout = float(os.getenv("GEMINI_TIMEOUT", DEFAULT_TIMEOUT))
+    context_tokens = int(os.getenv("GEMINI_CONTEXT_TOKENS", 1500))
+
+    # Keep this session's pool index in sync with the Best XI pool (only changed players are re-indexed)
+    if "pool_index" not in st.session_state:
+        st.session_state.pool_index = PlayerIndex()
+        st.session_state.pool_index_fp = None
+    session_pool = st.session_state.get("players")
+    if session_pool is not None and pool_fingerprint(session_pool) != st.session_state.pool_index_fp:
+        st.session_state.pool_index.update_source("your pool", session_pool)
+        st.session_state.pool_index_fp = pool_fingerprint(session_pool)
+
     st.markdown("""
     <div class="feature-card fade-in">
         <h2 style="color: #2E8B57; margin-bottom: 1rem; display: flex; align-items: center; gap: 10px;">
@@ -877,11 +857,15 @@ if st.session_state.current_page == "🤖 Cricket AI Chatbot":
     </div>
     """, unsafe_allow_html=True)
     
-    # Initialize session state for chat history
+    # Initialize session state for chat history (bounded; older turns are spilled to disk)
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = ChatHistory()
     if "user_input" not in st.session_state:
         st.session_state.user_input = ""
+    if "chat_metrics" not in st.session_state:
+        st.session_state.chat_metrics = deque(maxlen=100)
+    if "chat_page" not in st.session_state:
+        st.session_state.chat_page = 0
 
     # Function to handle submit
     def handle_submit():
@@ -889,44 +873,93 @@ if st.session_state.current_page == "🤖 Cricket AI Chatbot":
         if not user_question:
             return
 
-        # Add user message to history
+        # Add user message to history; the reply is streamed below in the main script run.
+        # A reply still streaming from the previous run is cancelled when that run is interrupted.
         st.session_state.chat_history.append(("user", user_question))
-
-        with st.spinner("🏏 Cricket AI is analyzing your question..."):
-            try:
-                if gemini_client:
-                    response = gemini_client.models.generate_content(
-                        model="gemini-2.5-flash",
-                        config=types.GenerateContentConfig(
-                            system_instruction=(
-                                "You are a Cricket AI expert with deep knowledge of IPL, international cricket, player statistics, team strategies, and match analysis. "
-                                "You ONLY reply to queries about cricket, IPL auctions, players, stats, team formations, match predictions, and cricket strategy. "
-                                "If the user asks anything unrelated to cricket, reply politely and shut down the unrelated conversation. "
-                                "If it is cricket-related, reply enthusiastically with detailed, insightful explanations including statistics where relevant."
-                            )
-                        ),
-                        contents=user_question
-                    )
-                    ai_reply = response.text.strip() if response.text else "⚠️ No response from Gemini."
-                else:
-                    ai_reply = "⚠️ Gemini AI not configured. Please add your GOOGLE_API_KEY to the .env file to unlock full AI capabilities."
-            except Exception as e:
-                ai_reply = f"⚠️ Error connecting to Cricket AI: {str(e)}"
-
-        # Add AI reply to history
-        st.session_state.chat_history.append(("ai", ai_reply))
+        st.session_state.pending_question = user_question
         st.session_state.user_input = ""
+        st.session_state.chat_page = 0
+
+    def ai_bubble(msg):
+        return f'<div class="chat-message ai-message"><strong>Cricket AI:</strong> {msg}</div>'
+
+    def user_bubble(msg):
+        return f'<div class="chat-message user-message"><strong>You:</strong> {msg}</div>'
+
+    def stream_reply(question, placeholder):
+        routed = stat_router.route(question, pool=st.session_state.get("players"))
+        if routed.answer is not None:
+            ai_reply = routed.answer.replace("\n", "<br>")
+            st.session_state.chat_history.append(("ai", ai_reply))
+            st.session_state.chat_metrics.append({
+                "status": "complete", "ttft": routed.elapsed, "total_time": routed.elapsed,
+                "chunks": 1, "chars": len(ai_reply), "cache": None, "path": routed.path,
+            })
+            placeholder.markdown(ai_bubble(ai_reply), unsafe_allow_html=True)
+            return
+
+        context = retrieve_context(question, [st.session_state.pool_index, player_index])
+        history = []
+        if st.session_state.get("chat_multiturn"):
+            history = st.session_state.chat_history.context_window(context_tokens)
+            summary = st.session_state.chat_history.summary
+            context = "\n\n".join(part for part in (summary, context) if part)
+        stream = stream_cricket_ai(gemini_client, question, timeout=gemini_timeout, cache=response_cache,
+                                   context=context, history=history)
+        placeholder.markdown(ai_bubble("🏏 <em>Cricket AI is analyzing your question...</em>"), unsafe_allow_html=True)
+        try:
+            for _ in stream:
+                if stream.chunks:
+                    placeholder.markdown(ai_bubble(stream.text + " ▌"), unsafe_allow_html=True)
+            ai_reply = stream.reply()
+        except Exception as e:
+            ai_reply = f"⚠️ Error connecting to Cricket AI: {str(e)}"
+        finally:
+            # Also runs when a new question interrupts this script run mid-stream
+            stream.cancel()
+            if stream.status == "cancelled":
+                ai_reply = stream.reply()
+            st.session_state.chat_history.append(("ai", ai_reply))
+            st.session_state.chat_metrics.append({**stream.metrics(), "path": "cache" if stream.cache_tier else "llm"})
+        placeholder.markdown(ai_bubble(ai_reply), unsafe_allow_html=True)
+
+    # Display one page of chat history with enhanced styling (one element per page, so reruns stay cheap)
+    pending_question = st.session_state.pop("pending_question", None)
+    chat_history = st.session_state.chat_history
+    if chat_history:
+        page_count = chat_history.page_count()
+        if page_count > 1:
+            def turn_page(step):
+                st.session_state.chat_page = min(max(st.session_state.chat_page + step, 0), page_count - 1)
+
+            col_older, col_page, col_newer = st.columns([1, 2, 1])
+            with col_older:
+                st.button("⬆️ Older", use_container_width=True, on_click=turn_page, args=(1,),
+                          disabled=st.session_state.chat_page >= page_count - 1)
+            with col_newer:
+                st.button("⬇️ Newer", use_container_width=True, on_click=turn_page, args=(-1,),
+                          disabled=st.session_state.chat_page == 0)
+            with col_page:
+                st.caption(f"Page {page_count - st.session_state.chat_page} of {page_count} • "
+                           f"{chat_history.total} messages")
 
-    # Display chat history with enhanced styling
-    if st.session_state.chat_history:
         st.markdown('<div class="chat-container">', unsafe_allow_html=True)
-        for role, msg in st.session_state.chat_history:
-            if role == "user":
-                st.markdown(f'<div class="chat-message user-message"><strong>You:</strong> {msg}</div>', unsafe_allow_html=True)
-            else:
-                st.markdown(f'<div class="chat-message ai-message"><strong>Cricket AI:</strong> {msg}</div>', unsafe_allow_html=True)
+        st.markdown("\n".join(user_bubble(msg) if role == "user" else ai_bubble(msg)
+                               for role, msg in chat_history.page(st.session_state.chat_page)),
+                    unsafe_allow_html=True)
+        if pending_question:
+            stream_reply(pending_question, st.empty())
         st.markdown('</div>', unsafe_allow_html=True)
 
+    if st.session_state.chat_metrics:
+        last = st.session_state.chat_metrics[-1]
+        ttft = f"{last['ttft']:.2f}s" if last["ttft"] is not None else "—"
+        if last["path"] not in ("llm", "cache"):
+            st.caption(f"⚡ Answered locally ({last['path'].replace('_', '-')}) in {last['total_time'] * 1000:.2f} ms")
+        else:
+            source = f"cached ({last['cache']} match)" if last["cache"] else last["status"]
+            st.caption(f"⚡ First token in {ttft} · full reply in {last['total_time']:.2f}s · {source}")
+
     # Enhanced input section
     col1, col2 = st.columns([4, 1])
     with col1:
@@ -939,8 +972,24 @@ if st.session_state.current_page == "🤖 Cricket AI Chatbot":
         )
     
     with col2:
-        if st.button("🚀 Send", use_container_width=True):
-            handle_submit()
+        st.button("🚀 Send", use_container_width=True, on_click=handle_submit)
+
+    st.checkbox("🧵 Remember conversation", key="chat_multiturn",
+                help=f"Send recent turns (up to ~{context_tokens} tokens) to Gemini for follow-up questions")
+
+    with st.expander("🧠 Routing & Cache Stats"):
+        routes = stat_router.stats()
+        st.caption(
+            f"**Router**: {routes['queries']} questions • lookup {routes.get('lookup', 0)} • "
+            f"top-N {routes.get('top_n', 0)} • filter {routes.get('filter', 0)} • LLM {routes.get('llm', 0)} "
+            f"({routes['offload_rate']:.0%} answered locally)"
+        )
+        stats = response_cache.stats()
+        st.caption(
+            f"**Response cache**: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%}) • "
+            f"exact {stats['exact_hits']} • normalized {stats['normalized_hits']} • semantic {stats['semantic_hits']} • "
+            f"{stats['entries']} entries • {stats['evictions']} evicted"
+        )
 
     
 
@@ -948,6 +997,11 @@ if st.session_state.current_page == "🤖 Cricket AI Chatbot":
 # PRICE PREDICTOR 
 # ============================================================================
 elif st.session_state.current_page == "💰 Price Predictor":
+    from cricket_analytics.cache import PREDICTION_CACHE, cached_prediction
+    from cricket_analytics.pricing import PLAYER_INPUT_COLUMNS, with_prices
+
+    model_registry = init_model_registry()
+
     st.markdown("""
     <div class="feature-card fade-in">
         <h2 style="color: #2E8B57; margin-bottom: 1rem; display: flex; align-items: center; gap: 10px;">
@@ -957,7 +1011,7 @@ elif st.session_state.current_page == "💰 Price Predictor":
     </div>
     """, unsafe_allow_html=True)
     
-    if not price_model:
+    if not model_registry:
         st.error(" Price prediction model not loaded. Please ensure 'ipl_price_model.pkl' and 'feature_columns.pkl' are available.")
     else:
         # Display model info
@@ -965,6 +1019,29 @@ elif st.session_state.current_page == "💰 Price Predictor":
         **🤖 Model:** Ridge Regression | **📊 Dataset:** 236 IPL Players (2024-2025)  
         **⚠️ Accuracy:** 15.7% within ±20% | **Premium Players:** 29-35% accuracy
         """)
+
+        with st.expander(f"🧪 Model Versions • live: {model_registry.live().name}"):
+            status = model_registry.status()
+            st.caption(f"Versions: {', '.join(status['versions'])} • reloads: {status['reloads']} • "
+                       f"shadow: {status['shadow']['version'] if status['shadow'] else 'none'}")
+            if status["last_error"]:
+                st.warning(f"Manifest change not applied (still serving {status['live']['version']}): "
+                           f"{status['last_error']}")
+            if status["shadow_error"]:
+                st.warning(f"Shadow model unavailable: {status['shadow_error']}")
+            report = model_registry.shadow_report()
+            if report.get("rows"):
+                col1, col2, col3, col4 = st.columns(4)
+                col1.metric("Shadowed Predictions", report["rows"])
+                col2.metric("Within ±25% Band", f"{report['within_band']:.0%}")
+                col3.metric("Mean |Δ|", f"₹{report['mean_abs_diff_cr']:.2f}Cr")
+                col4.metric("Latency p50 live / shadow",
+                            f"{report['live_p50_ms']:.1f} / {report['shadow_p50_ms']:.1f} ms")
+                st.caption(f"Same category: {report['same_category']:.0%} • median |Δ|: "
+                           f"{report['median_abs_pct_diff']:.1f}% • correlation: {report['correlation']:.3f} • "
+                           f"shadow errors: {report['errors']} • dropped batches: {report['dropped']}")
+            elif status["shadow"]:
+                st.caption("No shadowed predictions yet.")
         
         # Enhanced input form with IPL + T20I stats
         with st.form("player_form", clear_on_submit=False):
@@ -1048,22 +1125,25 @@ elif st.session_state.current_page == "💰 Price Predictor":
                     't20_bowl_sr': t20_bowl_sr
                 }
                 
-                # Engineer features
-                features = engineer_features(player_data)
-                features_array = np.array(features).reshape(1, -1)
-                
-                # Make prediction
-                log_price = price_model.predict(features_array)[0]
-                predicted_price = np.expm1(log_price)
-                predicted_price = np.clip(predicted_price, 0.2, 30)
-                
-                # Calculate confidence range (±25%)
-                lower_bound = predicted_price * 0.75
-                upper_bound = predicted_price * 1.25
+                # Engineer features, predict, derive the ±25% confidence range and build the dashboard;
+                # repeat submissions (same model version, inputs and name) are served from cache
+                def price_and_dashboard():
+                    prediction = model_registry.predict_player(player_data)
+                    return prediction, build_price_dashboard(player_data, player_name, prediction)
+
+                prediction, fig, from_cache = cached_prediction(model_registry.live().name, player_data,
+                                                                player_name, price_and_dashboard)
+                features = prediction['features']
+                predicted_price = prediction['predicted_price']
+                lower_bound = prediction['lower_bound']
+                upper_bound = prediction['upper_bound']
                 
                 # Results display
                 st.markdown("---")
                 st.markdown("### 🎯 Prediction Results")
+                stats = PREDICTION_CACHE.stats()
+                st.caption(f"{'⚡ Served from cache' if from_cache else 'Computed'} • prediction cache: "
+                           f"{stats['hits']} hits / {stats['misses']} misses • {stats['entries']} entries")
                 
                 # Row 1: Main Metrics (3 columns only)
                 col1, col2, col3 = st.columns(3)
@@ -1085,15 +1165,8 @@ elif st.session_state.current_page == "💰 Price Predictor":
                     """, unsafe_allow_html=True)
                 
                 with col3:
-                    if predicted_price > 10:
-                        category = "💎 Premium Player"
-                        color = "#FFD700"
-                    elif predicted_price >= 2:
-                        category = "⭐ Core Player"
-                        color = "#4ECDC4"
-                    else:
-                        category = "🔧 Base Player"
-                        color = "#FF6B6B"
+                    category = prediction['category']
+                    color = {"💎 Premium Player": "#FFD700", "⭐ Core Player": "#4ECDC4"}.get(category, "#FF6B6B")
                     
                     st.markdown(f"""
                     <div class="stats-card" style="background: linear-gradient(135deg, {color}22 0%, {color}44 100%);">
@@ -1177,101 +1250,6 @@ elif st.session_state.current_page == "💰 Price Predictor":
                 # Visualization using Plotly 
                 st.markdown("### 📊 Performance Analysis Dashboard")
                 
-                # Create 2x2 subplot
-                fig = make_subplots(
-                    rows=2, cols=2,
-                    subplot_titles=('Feature Contributions', 'IPL vs T20I Impact', 
-                                  'Experience & Form', 'Price Category Gauge'),
-                    specs=[[{"type": "bar"}, {"type": "bar"}],
-                           [{"type": "scatter"}, {"type": "indicator"}]]
-                )
-                
-                # Chart 1: Top Feature Contributions
-                feature_names = ['Batting Impact', 'Bowling Impact', 'Role Spec', 'Form Momentum', 
-                               'Consistency', 'Int\'l Exposure']
-                feature_values = [features[5], features[6], features[8], features[9], 
-                                features[7], features[3]]
-                
-                fig.add_trace(
-                    go.Bar(x=feature_names, y=feature_values,
-                          marker_color=['#2E8B57', '#32CD32', '#90EE90', '#98FB98', '#3CB371', '#20B2AA'],
-                          name='Features'),
-                    row=1, col=1
-                )
-                
-                # Chart 2: IPL vs T20I Impact Comparison
-                batting_impact_ipl = calculate_batting_impact(ipl_runs, ipl_sr, ipl_avg, 0, 0, 0)
-                batting_impact_t20 = calculate_batting_impact(0, 0, 0, t20_runs, t20_sr, t20_avg)
-                bowling_impact_ipl = calculate_bowling_impact(ipl_wickets, ipl_economy, ipl_bowl_sr, 0, 0, 0)
-                bowling_impact_t20 = calculate_bowling_impact(0, 0, 0, t20_wickets, t20_economy, t20_bowl_sr)
-                
-                fig.add_trace(
-                    go.Bar(x=['IPL Batting', 'T20I Batting', 'IPL Bowling', 'T20I Bowling'],
-                          y=[batting_impact_ipl, batting_impact_t20, bowling_impact_ipl, bowling_impact_t20],
-                          marker_color=['#FFD700', '#FFA500', '#4ECDC4', '#45B7D1'],
-                          name='Performance'),
-                    row=1, col=2
-                )
-                
-                # Chart 3: Experience vs Form Scatter
-                fig.add_trace(
-                    go.Scatter(x=[features[2]], y=[features[9]], 
-                              mode='markers+text',
-                              marker=dict(size=predicted_price*10, color='#2E8B57', 
-                                        line=dict(width=2, color='white')),
-                              text=[player_name or 'Player'],
-                              textposition='top center',
-                              name=player_name or 'Player'),
-                    row=2, col=1
-                )
-                
-                # Add reference lines
-                fig.add_hline(y=features[9], line_dash="dash", line_color="gray", 
-                            opacity=0.5, row=2, col=1)
-                fig.add_vline(x=features[2], line_dash="dash", line_color="gray", 
-                            opacity=0.5, row=2, col=1)
-                
-                # Chart 4: Price Category Gauge
-                fig.add_trace(
-                    go.Indicator(
-                        mode="gauge+number+delta",
-                        value=predicted_price,
-                        domain={'x': [0, 1], 'y': [0, 1]},
-                        title={'text': "Price (Cr)", 'font': {'size': 16}},
-                        delta={'reference': 5, 'increasing': {'color': "#2E8B57"}},
-                        gauge={
-                            'axis': {'range': [None, 30], 'tickwidth': 1},
-                            'bar': {'color': "#2E8B57"},
-                            'steps': [
-                                {'range': [0, 2], 'color': "#FFE5E5"},
-                                {'range': [2, 10], 'color': "#E5F5FF"},
-                                {'range': [10, 30], 'color': "#E5FFE5"}
-                            ],
-                            'threshold': {
-                                'line': {'color': "red", 'width': 4},
-                                'thickness': 0.75,
-                                'value': predicted_price
-                            }
-                        }
-                    ),
-                    row=2, col=2
-                )
-                
-                # Update layout
-                fig.update_xaxes(title_text="Features", row=1, col=1)
-                fig.update_yaxes(title_text="Value", row=1, col=1)
-                fig.update_xaxes(title_text="Performance Type", row=1, col=2)
-                fig.update_yaxes(title_text="Impact Score", row=1, col=2)
-                fig.update_xaxes(title_text="Experience Tier (0-3)", row=2, col=1)
-                fig.update_yaxes(title_text="Form Momentum", row=2, col=1)
-                
-                fig.update_layout(
-                    height=800, 
-                    showlegend=False,
-                    title_text=f"Performance Analysis: {player_name or 'Player'}",
-                    title_font_size=20
-                )
-                
                 st.plotly_chart(fig, use_container_width=True)
                 
                 
@@ -1281,11 +1259,87 @@ elif st.session_state.current_page == "💰 Price Predictor":
                 st.error(f" Prediction failed: {e}")
                 st.exception(e)
 
+        # Bulk scoring from CSV
+        st.markdown("---")
+        st.markdown("### 📁 Bulk Price Prediction (CSV)")
+        st.caption(f"Required columns: {', '.join(PLAYER_INPUT_COLUMNS)}. Any extra columns (e.g. player_name) are kept in the output.")
+
+        bulk_file = st.file_uploader("Upload auction player list", type=["csv"], key="bulk_price_csv")
+        if bulk_file:
+            try:
+                bulk_players = pd.read_csv(bulk_file)
+                # Rows the model cannot score (missing or negative stats) are listed instead of priced as NaN
+                prices, scorable = model_registry.price_finite(bulk_players)
+                if not scorable.any():
+                    raise ValueError("no row has a complete set of valid stats")
+                priced = with_prices(bulk_players[scorable], prices)
+                priced = priced.sort_values('predicted_price_cr', ascending=False)
+                st.success(f" Priced {len(priced)} players!")
+                if not scorable.all():
+                    st.warning(f" Skipped {(~scorable).sum():,} rows with missing or invalid stats")
+                    with st.expander("🚫 Rejected Rows"):
+                        # Line numbers count the header as line 1
+                        rejected = bulk_players[~scorable]
+                        st.dataframe(rejected.set_index(rejected.index + 2).rename_axis("line"),
+                                     use_container_width=True)
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Players Priced", len(priced))
+                with col2:
+                    st.metric("Total Predicted Spend", f"₹{priced['predicted_price_cr'].sum():.2f}Cr")
+                with col3:
+                    st.metric("Premium Players", int((priced['predicted_price_cr'] > 10).sum()))
+
+                st.dataframe(
+                    priced,
+                    use_container_width=True,
+                    column_config={
+                        "predicted_price_cr": st.column_config.NumberColumn("Predicted Price (Cr)", format="%.2f"),
+                        "lower_bound_cr": st.column_config.NumberColumn("Lower (Cr)", format="%.2f"),
+                        "upper_bound_cr": st.column_config.NumberColumn("Upper (Cr)", format="%.2f"),
+                        "category": "Category"
+                    }
+                )
+                st.download_button(
+                    "⬇️ Download Priced Sheet",
+                    data=priced.to_csv(index=False).encode("utf-8"),
+                    file_name="priced_players.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+            except ValueError as e:
+                st.error(f" Invalid player sheet: {e}")
+            except Exception as e:
+                st.error(f" Bulk prediction failed: {e}")
+
 
 # ============================================================================
 # BEST XI TEAM BUILDER 
 # ============================================================================
 elif st.session_state.current_page == "🏆 Best XI Team Builder":
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    from cricket_analytics.cache import (
+        cache_stats, cached_compute_impact, cached_pool_prices, cached_team, cached_top_k, pool_fingerprint
+    )
+    from cricket_analytics.ingest import ingest_csv
+    from cricket_analytics.players import memory_report
+    from cricket_analytics.pool import PlayerPool
+    from cricket_analytics.sweep import FORMATS, SWEEP_FIELDS, run_sweep, scenario_grid, sensitivity
+    from cricket_analytics.team import IncrementalTeamSelector, TeamConstraints
+    from cricket_analytics.view import (
+        LABEL_POINTS, MAX_POINTS, PAGE_SIZE, WEBGL_POINTS, downsample, page_count, payload_bytes, table_page
+    )
+
+    # Bytes each table and chart sends to the browser on this rerun (measured only while shown)
+    payload = {}
+
+    def shipped(name, value):
+        if show_payload:
+            payload[name] = payload.get(name, 0) + payload_bytes(value)
+        return value
+
     st.markdown("""
     <div class="feature-card fade-in">
         <h2 style="color: #2E8B57; margin-bottom: 1rem; display: flex; align-items: center; gap: 10px;">
@@ -1309,95 +1363,44 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
         min_allrounders = st.slider("⚡ Min All-Rounders", 0, 20, 2)
         min_wk = st.slider("🧤 Min Wicketkeepers", 0, 20, 1)
 
-    
-
-    # Session state initialization 
-    if "players" not in st.session_state:
-        st.session_state.players = pd.DataFrame(columns=[
-            "player_name", "role", "is_overseas",
-            "runs_scored", "innings_batted", "balls_faced", "strike_rate", "fours", "sixes",
-            "wickets", "balls_bowled", "runs_conceded", "economy", "dot_balls"
-        ])
-
-    # Impact Score function with format-specific formulas
-    def compute_impact(df, format_type):
-        """Calculate impact score based on format and role."""
-        df = df.copy()
-        
-        # Calculate derived metrics
-        df['batting_avg'] = df.apply(
-            lambda x: x['runs_scored'] / x['innings_batted'] if x['innings_batted'] > 0 else 0,
-            axis=1
-        )
-        df['bowling_avg'] = df.apply(
-            lambda x: x['runs_conceded'] / x['wickets'] if x['wickets'] > 0 else 999,
-            axis=1
-        )
-        df['bowler_sr'] = df.apply(
-            lambda x: x['balls_bowled'] / x['wickets'] if x['wickets'] > 0 else 999,
-            axis=1
-        )
-        df['boundary_pct'] = df.apply(
-            lambda x: ((x['fours'] + x['sixes']) / x['balls_faced'] * 100) if x['balls_faced'] > 0 else 0,
-            axis=1
-        )
-        df['dot_pct'] = df.apply(
-            lambda x: (x['dot_balls'] / x['balls_bowled'] * 100) if x['balls_bowled'] > 0 else 0,
-            axis=1
-        )
-        
-        # Initialize impact columns
-        df['batting_impact'] = 0.0
-        df['bowling_impact'] = 0.0
-        
-        # Calculate Batting Impact (for Batsman, All-Rounder, Wicketkeeper)
-        for idx, row in df.iterrows():
-            if row['role'] in ['Batsman', 'All-Rounder', 'Wicketkeeper']:
-                if format_type == 'Test':
-                    df.loc[idx, 'batting_impact'] = (
-                        (row['batting_avg'] * 0.75) +
-                        ((row['runs_scored'] / row['innings_batted'] if row['innings_batted'] > 0 else 0) * 0.15) +
-                        ((row['strike_rate'] / 2) * 0.10)
-                    )
-                elif format_type == 'ODI':
-                    df.loc[idx, 'batting_impact'] = (
-                        np.sqrt(row['batting_avg'] * row['strike_rate']) +
-                        (0.5 * row['boundary_pct'])
-                    )
-                elif format_type == 'T20':
-                    df.loc[idx, 'batting_impact'] = (
-                        (row['strike_rate'] * 0.7) +
-                        (row['batting_avg'] * 0.3) +
-                        (0.7 * (row['batting_avg'] + row['strike_rate']))
-                    )
-        
-        # Calculate Bowling Impact (for Bowler, All-Rounder)
-        for idx, row in df.iterrows():
-            if row['role'] in ['Bowler', 'All-Rounder']:
-                if row['wickets'] > 0:
-                    if format_type == 'Test':
-                        # Prevent division by zero
-                        if row['bowling_avg'] > 0 and row['bowler_sr'] > 0:
-                            df.loc[idx, 'bowling_impact'] = (
-                                (1000 / row['bowling_avg']) +
-                                ((100 / row['bowler_sr']) * 2)
-                            )
-                    else:  # ODI or T20
-                        if row['economy'] > 0:
-                            df.loc[idx, 'bowling_impact'] = (
-                                ((row['dot_pct'] * row['wickets']) / (row['economy'] ** 2)) * 100
-                            )
-        
-        # Total Impact - For All-Rounders, use average
-        df['impact'] = df.apply(
-            lambda x: (x['batting_impact'] + x['bowling_impact']) / 2 if x['role'] == 'All-Rounder' 
-            else x['batting_impact'] + x['bowling_impact'],
-            axis=1
+    col1, col2 = st.columns(2)
+    with col1:
+        solver_backend = st.selectbox(
+            "🧮 Solver",
+            options=["dp", "pulp", "highs"],
+            format_func={"dp": "Exact DP (instant)", "pulp": "PuLP / CBC", "highs": "HiGHS (scipy)"}.get,
+            help="All solvers return a team with the same total impact (or the same unmet constraints when no team fits); the DP skips the ILP solver entirely"
         )
-        
-        return df
+    with col2:
+        num_alternatives = st.slider("🔢 Alternative XIs", 1, 20, 1,
+                                     help="Also list the next-best distinct teams under the same constraints")
+        live_rebuild = st.checkbox("⚡ Live rebuild", value=False,
+                                   help="Rebuild the team on every change instead of waiting for the button")
+        show_payload = st.checkbox("📦 Show payload sizes", value=False,
+                                   help="Measure what each table and chart sends to the browser on every rerun")
+
+    # Auction purse: every pool player is priced with the live price model (cached per player)
+    col1, col2 = st.columns(2)
+    with col1:
+        use_purse = st.checkbox("💰 Auction purse", value=False,
+                                help="Pick the best XI whose predicted auction prices fit the purse")
+    budget = max_player_price = None
+    if use_purse:
+        with col1:
+            budget = st.number_input("💰 Purse (Cr)", min_value=1.0, max_value=1000.0, value=100.0, step=5.0)
+        with col2:
+            max_player_price = st.slider("🏷️ Max Price per Player (Cr)", 0.5, 30.0, 30.0, 0.5,
+                                         help="No single pick may cost more than this")
 
     
+
+    # Session state initialization: the pool is keyed by (player_name, format), so reloading a file
+    # updates rows instead of duplicating them; st.session_state.players is its current frame
+    if "player_pool" not in st.session_state:
+        st.session_state.player_pool = PlayerPool()
+    player_pool = st.session_state.player_pool
+    st.session_state.players = player_pool.frame()
+
     # Input section
     col1, col2 = st.columns([3, 1])
     
@@ -1417,17 +1420,47 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
         uploaded = st.file_uploader(
             "📁 Upload Player Data (CSV)",
             type=["csv"],
-            help="Upload a CSV file with player statistics"
+            help="Upload a CSV file with player statistics; it replaces the current player pool"
         )
 
         if uploaded:
-            df = pd.read_csv(uploaded)
-            st.session_state.players = df
-            st.success(f" Successfully loaded {len(df)} players from CSV file!")
-            
-            # Show data preview
-            with st.expander("👀 Preview Uploaded Data", expanded=True):
-                st.dataframe(df.head(), use_container_width=True)
+            # Ingest each uploaded file once; reruns with the same file only show the last report
+            upload_key = (uploaded.file_id, uploaded.name, uploaded.size)
+            if st.session_state.get("csv_ingest_key") != upload_key:
+                progress = st.progress(0.0, text=f"Reading {uploaded.name}...")
+
+                def show_progress(fraction, report):
+                    progress.progress(fraction, text=f"Read {report.rows_read:,} rows "
+                                                     f"({report.rows_rejected:,} rejected)")
+
+                # An upload replaces the current players; a failed one leaves them as they were
+                try:
+                    uploaded.seek(0)
+                    uploaded_pool = PlayerPool()
+                    report = ingest_csv(uploaded, uploaded_pool, "CSV", on_progress=show_progress)
+                    st.session_state.player_pool = player_pool = uploaded_pool
+                    st.session_state.csv_ingest = report
+                except (ValueError, pd.errors.ParserError, UnicodeDecodeError) as e:
+                    st.session_state.csv_ingest = None
+                    st.error(f" Invalid player CSV: {e}")
+                st.session_state.csv_ingest_key = upload_key
+                st.session_state.players = player_pool.frame()
+                progress.empty()
+
+            report = st.session_state.get("csv_ingest")
+            if report is not None:
+                st.success(f" Successfully loaded {report.rows_loaded:,} players from CSV file "
+                           f"in {report.elapsed:.2f}s!")
+                if report.rows_rejected:
+                    st.warning(f" Skipped {report.rows_rejected:,} invalid rows")
+                    with st.expander("🚫 Rejected Rows"):
+                        st.dataframe(pd.DataFrame(report.rejected, columns=["line", "reason"]),
+                                     use_container_width=True, hide_index=True)
+
+                # Show data preview
+                with st.expander("👀 Preview Uploaded Data", expanded=True):
+                    csv_rows = st.session_state.players
+                    st.dataframe(csv_rows[csv_rows["format"] == "CSV"].head(), use_container_width=True)
         
         # Manual player addition with dynamic fields based on role
         with st.expander("➕ Add Individual Player", expanded=len(st.session_state.players) == 0):
@@ -1476,8 +1509,9 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                             "wickets": wkts, "balls_bowled": balls_bowled, "runs_conceded": runs_conceded,
                             "economy": eco, "dot_balls": dot_balls
                         }])
-                        st.session_state.players = pd.concat([st.session_state.players, new_row], ignore_index=True)
-                        st.success(f"🎉 Added {name}!")
+                        inserted, _ = player_pool.upsert(new_row, "Custom")
+                        st.session_state.players = player_pool.frame()
+                        st.success(f"🎉 Added {name}!" if inserted else f"🎉 Updated {name}!")
                         st.rerun()
                     else:
                         st.error(" Please enter a player name!")
@@ -1488,73 +1522,53 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
         
         # Load ODI Players
         if st.button("📊 Load ODI Players", use_container_width=True, help="Load ODI player data"):
-            try:
-                import json
-                with open('ODI_output.json', 'r') as f:
-                    odi_data = json.load(f)
-                
-                # Map role names to match app format
-                role_mapping = {
-                    'Batter': 'Batsman',
-                    'Allrounder': 'All-Rounder',
-                    'Bowler': 'Bowler',
-                    'All Rounder': 'All-Rounder'
-                }
-                
-                for player in odi_data:
-                    player['role'] = role_mapping.get(player['role'], player['role'])
-                
-                odi_players = pd.DataFrame(odi_data)
-                st.session_state.players = pd.concat([st.session_state.players, odi_players], ignore_index=True)
-                st.success(f" Loaded {len(odi_players)} ODI players!")
-                st.rerun()
-            except FileNotFoundError:
+            odi_players = load_reference_layers().get("ODI")
+            if odi_players is None:
                 st.error(" ODI_output.json not found!")
-            except Exception as e:
-                st.error(f" Error loading ODI data: {e}")
+            else:
+                # Shared with every other session; only the reference is kept in this one
+                inserted = player_pool.attach(odi_players)
+                st.session_state.players = player_pool.frame()
+                st.success(f" Loaded {len(odi_players)} ODI players ({inserted} new)!")
+                st.rerun()
         
         # Load Test Players
         if st.button("🏏 Load Test Players", use_container_width=True, help="Load Test player data"):
-            try:
-                import json
-                with open('test_output.json', 'r') as f:
-                    test_data = json.load(f)
-                
-                # Map role names to match app format
-                role_mapping = {
-                    'Batsman': 'Batsman',
-                    'All Rounder': 'All-Rounder',
-                    'Bowler': 'Bowler'
-                }
-                
-                for player in test_data:
-                    player['role'] = role_mapping.get(player['role'], player['role'])
-                
-                test_players = pd.DataFrame(test_data)
-                st.session_state.players = pd.concat([st.session_state.players, test_players], ignore_index=True)
-                st.success(f" Loaded {len(test_players)} Test players!")
-                st.rerun()
-            except FileNotFoundError:
+            test_players = load_reference_layers().get("Test")
+            if test_players is None:
                 st.error(" test_output.json not found!")
-            except Exception as e:
-                st.error(f" Error loading Test data: {e}")
+            else:
+                # Shared with every other session; only the reference is kept in this one
+                inserted = player_pool.attach(test_players)
+                st.session_state.players = player_pool.frame()
+                st.success(f" Loaded {len(test_players)} Test players ({inserted} new)!")
+                st.rerun()
         
         
+        # Remove players from this session's pool (shared reference data is only hidden)
+        with st.expander("➖ Remove Players"):
+            with st.form("remove_players_form", clear_on_submit=True):
+                to_remove = st.text_input("Player names (comma-separated)", placeholder="e.g., MS Dhoni, V Kohli")
+                if st.form_submit_button("Remove", use_container_width=True):
+                    removed = player_pool.remove([n.strip() for n in to_remove.split(",") if n.strip()])
+                    st.session_state.players = player_pool.frame()
+                    if removed:
+                        st.success(f" Removed {removed} player rows")
+                    else:
+                        st.warning(" No matching players in the pool")
+
         # Clear database button
         if st.button("🗑️ Clear Database", use_container_width=True, help="Remove all players from database"):
-            st.session_state.players = pd.DataFrame(columns=[
-                "player_name", "role", "is_overseas",
-                "runs_scored", "innings_batted", "balls_faced", "strike_rate", "fours", "sixes",
-                "wickets", "balls_bowled", "runs_conceded", "economy", "dot_balls"
-            ])
+            player_pool.clear()
+            st.session_state.players = player_pool.frame()
             st.success("🗑️ Player database cleared!")
             st.rerun()
         
         # Database stats
         if not st.session_state.players.empty:
             st.markdown("### 📊 Database Stats")
-            total_players = len(st.session_state.players)
-            overseas_count = st.session_state.players['is_overseas'].sum()
+            total_players = len(player_pool)
+            overseas_count = player_pool.overseas_count()
             
             col_stat1, col_stat2 = st.columns(2)
             with col_stat1:
@@ -1562,6 +1576,38 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
             with col_stat2:
                 st.metric("Overseas Players", overseas_count)
 
+            with st.expander("🧠 Cache Stats"):
+                for name, stats in cache_stats().items():
+                    st.caption(
+                        f"**{name.title()}**: {stats['hits']} hits / {stats['misses']} misses "
+                        f"({stats['hit_rate']:.0%}) • {stats['entries']} entries • {stats['bytes'] / 1e6:.1f} MB"
+                    )
+
+            with st.expander("💾 Memory"):
+                report = memory_report(st.session_state.players)
+                typed, untyped = report["bytes"].sum(), report["untyped_bytes"].sum()
+                st.caption(f"Player table: {typed / 1e3:,.0f} KB ({untyped / max(typed, 1):.1f}x smaller than "
+                           f"untyped) • session arrays {player_pool.storage_bytes() / 1e3:,.0f} KB • "
+                           f"{player_pool.shared_rows:,} rows shared with other sessions")
+                st.dataframe(report, use_container_width=True, hide_index=True)
+
+    # Predicted prices line up with the pool rows; None without a purse. Computed after the input
+    # section, since uploads, additions and removals there replace the pool frame without a rerun
+    price_version = pool_prices = None
+    if use_purse and not st.session_state.players.empty:
+        model_registry = init_model_registry()
+        if model_registry:
+            try:
+                price_version = model_registry.live().name
+                pool_prices = cached_pool_prices(st.session_state.players, price_version, model_registry.price)
+            except ValueError as e:
+                st.warning(f"⚠️ Could not price the pool ({e}); solving without the purse.")
+                price_version = pool_prices = None
+                budget = max_player_price = None
+        else:
+            st.warning("⚠️ The purse needs the price model; solving without it.")
+            budget = max_player_price = None
+
     # Enhanced current player pool display
     if not st.session_state.players.empty:
         st.markdown("### 👥 Current Player Pool")
@@ -1570,72 +1616,128 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
         col1, col2 = st.columns(2)
         with col1:
             role_filter = st.multiselect("Filter by Role", 
-                options=st.session_state.players['role'].unique(),
-                default=st.session_state.players['role'].unique())
+                options=player_pool.roles(),
+                default=player_pool.roles())
         with col2:
             overseas_filter = st.selectbox("Overseas Filter", 
                 ["All Players", "Local Only", "Overseas Only"])
+
+        sort_labels = {"impact": "Total Impact", "batting_impact": "Batting Impact",
+                       "bowling_impact": "Bowling Impact", "player_name": "Player", "role": "Role"}
+        if pool_prices is not None:
+            sort_labels["predicted_price_cr"] = "Price"
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            pool_search = st.text_input("🔎 Search Players", key="pool_search")
+        with col2:
+            sort_by = st.selectbox("Sort by", list(sort_labels), format_func=sort_labels.get, key="pool_sort")
+        with col3:
+            ascending = st.selectbox("Order", ["Descending", "Ascending"], key="pool_order") == "Ascending"
+
+        # Impact scores for the whole pool are cached and shared with the optimizer
+        scored_df = cached_compute_impact(st.session_state.players, format_type)
+        if pool_prices is not None:
+            scored_df = scored_df.assign(predicted_price_cr=pool_prices)
+
+        # Apply filters through the pool's (role, overseas) index; scored_df rows line up with the pool
+        overseas_flag = {"Local Only": 0, "Overseas Only": 1}.get(overseas_filter)
+        filtered_df = scored_df.iloc[player_pool.rows_where(role_filter, overseas_flag)]
         
-        # Apply filters
-        filtered_df = st.session_state.players.copy()
-        filtered_df = filtered_df[filtered_df['role'].isin(role_filter)]
-        
-        if overseas_filter == "Local Only":
-            filtered_df = filtered_df[filtered_df['is_overseas'] == 0]
-        elif overseas_filter == "Overseas Only":
-            filtered_df = filtered_df[filtered_df['is_overseas'] == 1]
-        
-        # Calculate and display impact scores using format-specific formulas
-        display_df = compute_impact(filtered_df.copy(), format_type)
-        display_df = display_df.sort_values('impact', ascending=False)
-        
+        # Search, sort and paginate server-side; only the visible page is sent to the browser
+        pool_view = (tuple(role_filter), overseas_filter, pool_search, sort_by, ascending,
+                     pool_fingerprint(st.session_state.players))
+        if st.session_state.get("pool_view") != pool_view:
+            st.session_state.pool_view = pool_view
+            st.session_state.pool_page = 0
+        page_df, matches, st.session_state.pool_page = table_page(
+            filtered_df[['player_name', 'role', 'batting_impact', 'bowling_impact', 'impact']
+                        + (['predicted_price_cr'] if pool_prices is not None else [])],
+            sort_by, ascending, st.session_state.pool_page, PAGE_SIZE, pool_search
+        )
+
         st.dataframe(
-            display_df[[
-                'player_name', 'role', 'batting_impact', 'bowling_impact', 'impact'
-            ]],
+            shipped("Player pool", page_df),
             use_container_width=True,
             column_config={
                 "player_name": "Player",
                 "role": "Role",
                 "batting_impact": st.column_config.NumberColumn("Batting Impact", format="%.1f"),
                 "bowling_impact": st.column_config.NumberColumn("Bowling Impact", format="%.1f"),
-                "impact": st.column_config.NumberColumn("Total Impact", format="%.1f")
+                "impact": st.column_config.NumberColumn("Total Impact", format="%.1f"),
+                "predicted_price_cr": st.column_config.NumberColumn("Price (Cr)", format="₹%.2f")
             }
         )
 
-    # Team selection logic with strategy
-    def select_best_team(players_df, format_type):
-        players_df = compute_impact(players_df.copy(), format_type)
-
-        prob = LpProblem("BestXI", LpMaximize)
-        choices = LpVariable.dicts("select", players_df.index, cat="Binary")
+        pool_pages = page_count(matches)
+
+        def turn_pool_page(step):
+            st.session_state.pool_page = min(max(st.session_state.pool_page + step, 0), pool_pages - 1)
+
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            st.button("⬅️ Previous", key="pool_prev", use_container_width=True, on_click=turn_pool_page,
+                      args=(-1,), disabled=st.session_state.pool_page == 0)
+        with col_next:
+            st.button("Next ➡️", key="pool_next", use_container_width=True, on_click=turn_pool_page,
+                      args=(1,), disabled=st.session_state.pool_page >= pool_pages - 1)
+        with col_page:
+            st.caption(f"Page {st.session_state.pool_page + 1} of {pool_pages} • {matches:,} players")
+
+        # Whole-pool scatter, built only on request: large pools are downsampled,
+        # drawn with WebGL and labelled on hover only
+        if st.checkbox("🗺️ Show pool map", value=False, help="Batting vs bowling impact for the filtered pool"):
+            plotted = filtered_df.iloc[downsample(filtered_df["impact"].to_numpy())]
+            labelled = len(plotted) <= LABEL_POINTS
+            scatter = go.Scattergl if len(plotted) > WEBGL_POINTS else go.Scatter
+            fig = go.Figure(scatter(
+                x=plotted["batting_impact"],
+                y=plotted["bowling_impact"],
+                mode='markers+text' if labelled else 'markers',
+                text=plotted["player_name"],
+                textposition="top center",
+                hovertemplate="%{text}<br>Batting %{x:.1f} • Bowling %{y:.1f}<extra></extra>",
+                marker=dict(size=12 if labelled else 6, color=plotted["impact"], colorscale="Greens",
+                            showscale=True, colorbar=dict(title="Impact"))
+            ))
+            fig.update_layout(height=450, xaxis_title="Batting Impact", yaxis_title="Bowling Impact",
+                              margin=dict(t=30))
+            if len(plotted) < len(filtered_df):
+                st.caption(f"Showing {len(plotted):,} of {len(filtered_df):,} players: the top "
+                           f"{MAX_POINTS // 10:,} by impact and an even spread of the rest")
+            st.plotly_chart(shipped("Pool map", fig), use_container_width=True)
 
-        # Objective: maximize impact
-        prob += lpSum(players_df.loc[i, "impact"] * choices[i] for i in players_df.index)
-
-        # Constraints (removed budget constraint)
-        prob += lpSum(choices[i] for i in players_df.index) == team_size, "TeamSize"
-        prob += lpSum(players_df.loc[i, "is_overseas"] * choices[i] for i in players_df.index) <= max_overseas, "OverseasLimit"
-        prob += lpSum(choices[i] for i in players_df.index if players_df.loc[i, "role"] == "Batsman") >= min_batsmen, "MinBatsmen"
-        prob += lpSum(choices[i] for i in players_df.index if players_df.loc[i, "role"] == "Bowler") >= min_bowlers, "MinBowlers"
-        prob += lpSum(choices[i] for i in players_df.index if players_df.loc[i, "role"] == "All-Rounder") >= min_allrounders, "MinAllRounders"
-        prob += lpSum(choices[i] for i in players_df.index if players_df.loc[i, "role"] == "Wicketkeeper") >= min_wk, "MinWicketkeepers"
-
-        prob.solve()
-
-        violated = []
+    # Team selection logic with strategy
+    def get_team_selector(players_df, format_type):
+        # Solver state is reused until the pool, format, solver or price model changes
+        key = (pool_fingerprint(players_df), format_type, solver_backend, price_version)
+        cached = st.session_state.get("team_selector")
+        if cached is None or cached[0] != key:
+            scored = cached_compute_impact(players_df, format_type, key[0])
+            masks = player_pool.role_masks() if players_df is player_pool.frame() else None
+            cached = (key, IncrementalTeamSelector(scored, format_type, backend=solver_backend, scored=True,
+                                                   role_masks=masks, prices=pool_prices))
+            st.session_state.team_selector = cached
+        return cached[1]
+
+    def current_constraints():
+        return TeamConstraints(team_size, max_overseas, min_batsmen, min_bowlers, min_allrounders, min_wk,
+                               budget, max_player_price)
+
+    def team_cache_key(players_df):
+        # Priced teams also depend on the price model version
+        return (pool_fingerprint(players_df), price_version) if price_version else pool_fingerprint(players_df)
 
-        # Check constraint satisfaction
-        if prob.status != 1:  # not optimal
-            for cname, c in prob.constraints.items():
-                if c.value() is not None and c.value() < -1e-6:  # constraint violated
-                    violated.append(cname)
+    def select_best_team(players_df, format_type):
+        constraints = current_constraints()
+        selected, violated = cached_team(
+            team_cache_key(players_df), format_type, solver_backend, constraints,
+            lambda: get_team_selector(players_df, format_type).solve(constraints)
+        )
 
         if violated:
             st.error(f" Cannot build a valid team. Violated constraints: {', '.join(violated)}")
             return pd.DataFrame()
 
-        selected = players_df[[choices[i].value() == 1 for i in players_df.index]]
         return selected
 
     # Team building button
@@ -1645,7 +1747,8 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
     col1 = st.container()
 
     with col1:
-        if st.button("🏆 Build Optimal Team", use_container_width=True, type="primary"):
+        build_clicked = st.button("🏆 Build Optimal Team", use_container_width=True, type="primary")
+        if build_clicked or (live_rebuild and not st.session_state.players.empty):
             if st.session_state.players.empty:
                 st.error("⚠️ Please add players to your database first!")
             else:
@@ -1655,7 +1758,8 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                 if best_team.empty:
                     st.error(" No valid team found with current constraints. Please adjust your requirements.")
                 else:
-                    st.balloons()  # Celebration effect
+                    if build_clicked:
+                        st.balloons()  # Celebration effect
                     st.success("🎉 Your optimal team has been assembled!")
                     st.info(f"🏏 Team optimized for **{format_type}** format using format-specific impact formulas")
 
@@ -1664,8 +1768,8 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                     overseas_count = best_team["is_overseas"].sum()
                     avg_sr = best_team[best_team["strike_rate"] > 0]["strike_rate"].mean()
                     
-                    # Team summary cards
-                    col1, col2, col3, col4 = st.columns(4)
+                    # Team summary cards (plus the team's cost under a purse)
+                    col1, col2, col3, col4, *cost_col = st.columns(5 if pool_prices is not None else 4)
                     
                     with col1:
                         st.markdown(f"""
@@ -1699,6 +1803,15 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                         </div>
                         """, unsafe_allow_html=True)
 
+                    if cost_col:
+                        with cost_col[0]:
+                            st.markdown(f"""
+                            <div class="stats-card">
+                                <div class="stat-value">₹{best_team["predicted_price_cr"].sum():.1f}/{budget:.0f}Cr</div>
+                                <div class="stat-label">Team Cost</div>
+                            </div>
+                            """, unsafe_allow_html=True)
+
                     # Team composition table 
                     st.markdown("### 🏏 Your Dream Team XI")
                     team_display = best_team.copy()
@@ -1707,7 +1820,9 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                     )
                     
                     st.dataframe(
-                        team_display[['player_name', 'role', 'batting_impact', 'bowling_impact', 'impact', 'Captain Potential']],
+                        shipped("Team", team_display[['player_name', 'role', 'batting_impact', 'bowling_impact', 'impact']
+                                     + (['predicted_price_cr'] if pool_prices is not None else [])
+                                     + ['Captain Potential']]),
                         use_container_width=True,
                         column_config={
                             "player_name": "🏏 Player",
@@ -1715,6 +1830,7 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                             "batting_impact": st.column_config.NumberColumn("🏏 Batting Impact", format="%.1f"),
                             "bowling_impact": st.column_config.NumberColumn("🎳 Bowling Impact", format="%.1f"),
                             "impact": st.column_config.NumberColumn("🔥 Total Impact", format="%.1f"),
+                            "predicted_price_cr": st.column_config.NumberColumn("💰 Price (Cr)", format="₹%.2f"),
                             "Captain Potential": "🎖️ Role"
                         }
                     )
@@ -1740,6 +1856,7 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                     
                     # Role distribution pie chart
                     role_counts = best_team["role"].value_counts()
+                    role_counts = role_counts[role_counts > 0]  # categorical: skip roles not in the team
                     fig.add_trace(
                         go.Pie(
                             labels=role_counts.index, 
@@ -1797,7 +1914,7 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                         )
                     
                     fig.update_layout(height=800, showlegend=True)
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(shipped("Team analytics", fig), use_container_width=True)
                     
                     
                     
@@ -1814,6 +1931,96 @@ elif st.session_state.current_page == "🏆 Best XI Team Builder":
                         use_container_width=True
                     )
 
+                    # Ranked alternatives under the same constraints
+                    if num_alternatives > 1:
+                        st.markdown("### 🔁 Alternative XIs")
+                        alternatives = cached_top_k(
+                            team_cache_key(st.session_state.players), format_type, current_constraints(),
+                            num_alternatives,
+                            lambda: get_team_selector(st.session_state.players, format_type).top_k(
+                                current_constraints(), num_alternatives
+                            )
+                        )
+                        best_total = alternatives[0][1] if alternatives else 0
+                        st.dataframe(
+                            shipped("Alternatives", pd.DataFrame([{
+                                "Rank": rank,
+                                "Total Impact": total,
+                                "Gap to Best": best_total - total,
+                                **({"Cost (Cr)": team["predicted_price_cr"].sum()} if pool_prices is not None else {}),
+                                "Players": ", ".join(team.sort_values('impact', ascending=False)['player_name'].astype(str))
+                            } for rank, (team, total) in enumerate(alternatives, start=1)])),
+                            use_container_width=True,
+                            hide_index=True,
+                            column_config={
+                                "Total Impact": st.column_config.NumberColumn("🔥 Total Impact", format="%.1f"),
+                                "Gap to Best": st.column_config.NumberColumn("📉 Gap to Best", format="%.1f"),
+                                "Cost (Cr)": st.column_config.NumberColumn("💰 Cost (Cr)", format="₹%.1f")
+                            }
+                        )
+
+
+    # Scenario sweep: every format x constraint grid, solved in worker processes
+    if not st.session_state.players.empty:
+        st.markdown("### 🧪 Scenario Sweep")
+        with st.expander("Compare optimal XIs across formats and constraint grids"):
+            sweep_col1, sweep_col2 = st.columns(2)
+            with sweep_col1:
+                sweep_formats = st.multiselect("🏏 Formats", FORMATS, default=FORMATS, key="sweep_formats")
+                overseas_range = st.slider("🌍 Max Overseas range", 0, 10, (0, 6), key="sweep_overseas")
+            with sweep_col2:
+                bowlers_range = st.slider("🎳 Min Bowlers range", 0, 11, (1, 6), key="sweep_bowlers")
+                allrounders_range = st.slider("⚡ Min All-Rounders range", 0, 11, (0, 4), key="sweep_allrounders")
+
+            scenarios = scenario_grid(
+                sweep_formats, current_constraints(),
+                max_overseas=range(overseas_range[0], overseas_range[1] + 1),
+                min_bowlers=range(bowlers_range[0], bowlers_range[1] + 1),
+                min_allrounders=range(allrounders_range[0], allrounders_range[1] + 1),
+            )
+            st.caption(f"{len(scenarios):,} scenarios • team size, min batsmen, min wicketkeepers "
+                       f"and the purse come from Team Configuration")
+
+            if st.button("▶️ Run Sweep", use_container_width=True, disabled=not scenarios):
+                progress = st.progress(0.0, text=f"Solving {len(scenarios):,} scenarios...")
+                results = run_sweep(st.session_state.players, scenarios, prices=pool_prices,
+                                    on_progress=lambda done: progress.progress(done, text=f"{done:.0%} solved"))
+                progress.empty()
+                st.session_state.sweep_results = (pool_fingerprint(st.session_state.players), results)
+
+            # Results are kept until the pool changes
+            sweep = st.session_state.get("sweep_results")
+            if sweep is not None and sweep[0] == pool_fingerprint(st.session_state.players):
+                results = sweep[1]
+                st.dataframe(
+                    shipped("Sweep results", results), use_container_width=True, hide_index=True,
+                    column_config={"total_impact": st.column_config.NumberColumn("🔥 Total Impact", format="%.1f")}
+                )
+                st.download_button("⬇️ Download Sweep Results", data=results.to_csv(index=False).encode("utf-8"),
+                                   file_name="best_xi_sweep.csv", mime="text/csv", use_container_width=True)
+
+                axis_col1, axis_col2 = st.columns(2)
+                with axis_col1:
+                    heat_rows = st.selectbox("Heatmap rows", SWEEP_FIELDS, index=1, key="sweep_rows")
+                with axis_col2:
+                    heat_columns = st.selectbox("Heatmap columns", [f for f in SWEEP_FIELDS if f != heat_rows],
+                                                key="sweep_columns")
+                tables = sensitivity(results, heat_rows, heat_columns)
+                fig = make_subplots(rows=1, cols=len(tables), subplot_titles=list(tables))
+                for i, table in enumerate(tables.values(), start=1):
+                    fig.add_trace(go.Heatmap(
+                        z=table.to_numpy(), x=table.columns.astype(str), y=table.index.astype(str),
+                        coloraxis="coloraxis", hovertemplate="%{y} / %{x}: %{z:.1f}<extra></extra>"
+                    ), row=1, col=i)
+                    fig.update_xaxes(title_text=heat_columns.replace("_", " "), row=1, col=i)
+                fig.update_yaxes(title_text=heat_rows.replace("_", " "), row=1, col=1)
+                fig.update_layout(height=420, coloraxis={"colorscale": "Greens"},
+                                  title_text="Mean total impact (blank = infeasible)")
+                st.plotly_chart(shipped("Sweep heatmap", fig), use_container_width=True)
+
+    if payload:
+        st.caption("📦 Sent this rerun: " + " • ".join(f"{name} {size / 1e3:,.1f} KB" for name, size in payload.items())
+                   + f" • total {sum(payload.values()) / 1e3:,.1f} KB")
 
 # Footer
 st.markdown("---")
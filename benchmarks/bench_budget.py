@@ -0,0 +1,109 @@
+"""Best XI under an auction purse: pool pricing and re-solve timing.
+
+For pools of 1k, 5k and 20k players (resampled reference rows with jittered
+stats), reports the cost of pricing the whole pool with the live model
+(cold, rerun, after editing one player) and of re-solving as the purse
+moves, against the full-pool PuLP model on the smaller pools; both must
+reach the same total impact. It first checks the purse scenarios where a
+gapped HiGHS solve once fell short of the optimum (ODI+Test reference pool,
+T20 impact, random prices): dp, HiGHS and PuLP must agree on every one.
+
+    python benchmarks/bench_budget.py [n_players ...]
+"""
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from bench_impact import load_reference_pool, synthetic_pool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cricket_analytics import compute_impact  # noqa: E402
+from cricket_analytics.cache import cached_pool_prices  # noqa: E402
+from cricket_analytics.registry import ModelRegistry  # noqa: E402
+from cricket_analytics.team import (  # noqa: E402
+    SOLVERS, IncrementalTeamSelector, TeamConstraints, budget_candidates, solve_team_problem, build_team_problem,
+    team_arrays
+)
+
+SIZES = [1000, 5000, 20000]
+PURSES = [40.0, 60.0, 80.0, 120.0]
+PULP_LIMIT = 5000
+# (price seed, purse): uniform 0.2-15 Cr prices on the reference pool that once split the solvers
+PARITY_CASES = [(0, 81.657), (21, 81.657), (33, 63.0005)]
+PARITY_CONSTRAINTS = TeamConstraints(11, 1, 5, 3, 1, 0)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def parity_check(base):
+    """dp, HiGHS and PuLP reach the same total impact on PARITY_CASES; raises AssertionError if not."""
+    impact, overseas, role_masks = team_arrays(compute_impact(base, "T20"))
+    for seed, purse in PARITY_CASES:
+        prices = np.random.default_rng(seed).uniform(0.2, 15.0, len(impact))
+        constraints = PARITY_CONSTRAINTS._replace(budget=purse)
+        totals = {}
+        for name, solve in SOLVERS.items():
+            selected, violated = solve(impact, overseas, role_masks, constraints, prices=prices)
+            assert not violated, f"{name} found no team for purse {purse}: {violated}"
+            totals[name] = impact[selected].sum()
+        assert np.allclose(list(totals.values()), totals["pulp"], rtol=0, atol=1e-6), \
+            f"solvers disagree for price seed {seed}, purse {purse}: {totals}"
+        print(f"parity: price seed {seed}, purse {purse} Cr -> {totals['pulp']:,.2f} on every solver")
+    print()
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    sizes = [int(n) for n in sys.argv[1:]] or SIZES
+    base = pd.concat([load_reference_pool("ODI_output.json"), load_reference_pool("test_output.json")],
+                     ignore_index=True)
+    parity_check(base)
+    registry = ModelRegistry(os.path.join(ROOT, "model_registry.json"))
+    version = registry.live().name
+    constraints = TeamConstraints(max_player_price=12.0)
+
+    for n_players in sizes:
+        rng = np.random.default_rng(n_players)
+        pool = synthetic_pool(base, n_players)
+        pool["player_name"] = pool["player_name"] + " #" + pool.index.astype(str)
+        pool["runs_scored"] += rng.integers(0, 200, n_players)
+        pool["wickets"] += rng.integers(0, 10, n_players)
+
+        prices, cold = timed(lambda: cached_pool_prices(pool, version, registry.price))
+        _, rerun = timed(lambda: cached_pool_prices(pool, version, registry.price))
+        edited = pool.copy()
+        edited.loc[0, "runs_scored"] += 1
+        _, one_edit = timed(lambda: cached_pool_prices(edited, version, registry.price))
+        print(f"{n_players:,} players: price pool {cold:.0f} ms cold, {rerun:.2f} ms rerun, "
+              f"{one_edit:.0f} ms after one edit")
+
+        scored = compute_impact(pool, "ODI")
+        selector = IncrementalTeamSelector(scored, "ODI", backend="dp", scored=True, prices=prices)
+        impact, overseas, role_masks = team_arrays(scored)
+        for purse in PURSES:
+            purse_constraints = constraints._replace(budget=purse)
+            (team, violated), solve_ms = timed(lambda: selector.solve(purse_constraints))
+            candidates = len(budget_candidates(impact, overseas, role_masks, prices, purse_constraints))
+            line = (f"  purse {purse:5.0f} Cr: {candidates:5,} candidates, solve {solve_ms:6.1f} ms, "
+                    f"cost {team['predicted_price_cr'].sum():6.2f} Cr, impact {team['impact'].sum():,.0f}")
+            if n_players <= PULP_LIMIT:
+                (selected, _), pulp_ms = timed(lambda: solve_team_problem(
+                    *build_team_problem(impact, overseas, role_masks, purse_constraints, prices)))
+                same = np.isclose(impact[selected].sum(), team["impact"].sum())
+                line += f" | full PuLP {pulp_ms:6.0f} ms, same total: {same}"
+            print(line + (f"  violated {violated}" if violated else ""))
+        print()
+
+
+if __name__ == "__main__":
+    main()
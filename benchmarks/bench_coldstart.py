@@ -0,0 +1,91 @@
+"""Cold-start import report per page of app.py.
+
+Runs each page once in a fresh interpreter (via streamlit's AppTest) under
+``python -X importtime`` and reports total import time, wall time, and which
+heavy dependencies that page pulled in.
+
+    python benchmarks/bench_coldstart.py [--top N]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["🤖 Cricket AI Chatbot", "💰 Price Predictor", "🏆 Best XI Team Builder"]
+
+# Top-level packages worth tracking; streamlit/pandas/numpy are paid by every page
+HEAVY = ["google.genai", "plotly", "pulp", "sklearn", "joblib", "scipy", "matplotlib", "seaborn"]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_page(page):
+    """Child mode: render one page headlessly."""
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file("app.py", default_timeout=120)
+    at.session_state.current_page = page
+    at.run()
+    if at.exception:
+        raise SystemExit(f"{page} raised: {at.exception[0].value}")
+
+
+def parse_importtime(stderr):
+    """{module: cumulative_us} and the total of all top-level imports."""
+    cumulative, total = {}, 0
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        _, cum, indent, name = match.groups()
+        cumulative[name] = max(cumulative.get(name, 0), int(cum))
+        if len(indent) == 1:
+            total += int(cum)
+    return cumulative, total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--top", type=int, default=5, help="slowest top-level imports to list per page")
+    args = parser.parse_args()
+    if args.child:
+        run_page(args.child)
+        return
+
+    # Imports the harness itself needs, subtracted from every page
+    start = time.perf_counter()
+    baseline = subprocess.run([sys.executable, "-X", "importtime", "-c", "from streamlit.testing.v1 import AppTest"],
+                              capture_output=True, text=True, cwd=ROOT)
+    baseline_modules, baseline_total = parse_importtime(baseline.stderr)
+    print(f"harness baseline: {baseline_total / 1000:.0f} ms imports, {time.perf_counter() - start:.2f} s wall\n")
+
+    for page in PAGES:
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", __file__, "--child", page],
+                                capture_output=True, text=True, cwd=ROOT)
+        wall = time.perf_counter() - start
+        if result.returncode != 0:
+            print(f"{page}: failed\n{result.stderr[-2000:]}")
+            continue
+
+        modules, total = parse_importtime(result.stderr)
+        loaded = [m for m in HEAVY if m in modules]
+        print(f"{page}")
+        print(f"  imports {(total - baseline_total) / 1000:7.0f} ms over harness   wall {wall:.2f} s")
+        print(f"  heavy deps loaded: {', '.join(f'{m} ({modules[m] / 1000:.0f} ms)' for m in loaded) or 'none'}")
+        page_only = sorted(((cum, name) for name, cum in modules.items()
+                            if name not in baseline_modules and "." not in name), reverse=True)
+        for cum, name in page_only[:args.top]:
+            print(f"    {cum / 1000:7.1f} ms  {name}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
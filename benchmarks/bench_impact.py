@@ -0,0 +1,152 @@
+"""Parity check and timing for the vectorized compute_impact.
+
+Compares cricket_analytics.compute_impact against the original row-wise
+implementation on ODI_output.json and test_output.json for every format,
+then times both on a synthetic pool.
+
+    python benchmarks/bench_impact.py [n_players]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cricket_analytics import compute_impact  # noqa: E402
+from cricket_analytics.players import load_players_json  # noqa: E402
+
+FORMATS = ["T20", "ODI", "Test"]
+OUTPUT_COLUMNS = ['batting_avg', 'bowling_avg', 'bowler_sr', 'boundary_pct', 'dot_pct',
+                  'batting_impact', 'bowling_impact', 'impact']
+
+
+def compute_impact_rowwise(df, format_type):
+    """Original row-wise implementation from app.py, kept as the reference."""
+    df = df.copy()
+
+    df['batting_avg'] = df.apply(
+        lambda x: x['runs_scored'] / x['innings_batted'] if x['innings_batted'] > 0 else 0,
+        axis=1
+    )
+    df['bowling_avg'] = df.apply(
+        lambda x: x['runs_conceded'] / x['wickets'] if x['wickets'] > 0 else 999,
+        axis=1
+    )
+    df['bowler_sr'] = df.apply(
+        lambda x: x['balls_bowled'] / x['wickets'] if x['wickets'] > 0 else 999,
+        axis=1
+    )
+    df['boundary_pct'] = df.apply(
+        lambda x: ((x['fours'] + x['sixes']) / x['balls_faced'] * 100) if x['balls_faced'] > 0 else 0,
+        axis=1
+    )
+    df['dot_pct'] = df.apply(
+        lambda x: (x['dot_balls'] / x['balls_bowled'] * 100) if x['balls_bowled'] > 0 else 0,
+        axis=1
+    )
+
+    df['batting_impact'] = 0.0
+    df['bowling_impact'] = 0.0
+
+    for idx, row in df.iterrows():
+        if row['role'] in ['Batsman', 'All-Rounder', 'Wicketkeeper']:
+            if format_type == 'Test':
+                df.loc[idx, 'batting_impact'] = (
+                    (row['batting_avg'] * 0.75) +
+                    ((row['runs_scored'] / row['innings_batted'] if row['innings_batted'] > 0 else 0) * 0.15) +
+                    ((row['strike_rate'] / 2) * 0.10)
+                )
+            elif format_type == 'ODI':
+                df.loc[idx, 'batting_impact'] = (
+                    np.sqrt(row['batting_avg'] * row['strike_rate']) +
+                    (0.5 * row['boundary_pct'])
+                )
+            elif format_type == 'T20':
+                df.loc[idx, 'batting_impact'] = (
+                    (row['strike_rate'] * 0.7) +
+                    (row['batting_avg'] * 0.3) +
+                    (0.7 * (row['batting_avg'] + row['strike_rate']))
+                )
+
+    for idx, row in df.iterrows():
+        if row['role'] in ['Bowler', 'All-Rounder']:
+            if row['wickets'] > 0:
+                if format_type == 'Test':
+                    if row['bowling_avg'] > 0 and row['bowler_sr'] > 0:
+                        df.loc[idx, 'bowling_impact'] = (
+                            (1000 / row['bowling_avg']) +
+                            ((100 / row['bowler_sr']) * 2)
+                        )
+                else:
+                    if row['economy'] > 0:
+                        df.loc[idx, 'bowling_impact'] = (
+                            ((row['dot_pct'] * row['wickets']) / (row['economy'] ** 2)) * 100
+                        )
+
+    df['impact'] = df.apply(
+        lambda x: (x['batting_impact'] + x['bowling_impact']) / 2 if x['role'] == 'All-Rounder'
+        else x['batting_impact'] + x['bowling_impact'],
+        axis=1
+    )
+
+    return df
+
+
+def load_reference_pool(path):
+    return load_players_json(os.path.join(ROOT, path))
+
+
+def synthetic_pool(base, n_players, seed=0):
+    """Resample real rows (with a few wicketkeepers) up to n_players."""
+    rng = np.random.default_rng(seed)
+    pool = base.iloc[rng.integers(0, len(base), n_players)].reset_index(drop=True)
+    pool.loc[rng.random(n_players) < 0.1, 'role'] = 'Wicketkeeper'
+    return pool
+
+
+def check_parity(df, label):
+    for format_type in FORMATS:
+        expected = compute_impact_rowwise(df, format_type)[OUTPUT_COLUMNS].to_numpy(dtype=np.float64)
+        actual = compute_impact(df, format_type)[OUTPUT_COLUMNS].to_numpy(dtype=np.float64)
+        if not np.array_equal(expected, actual, equal_nan=True):
+            bad = np.argwhere(~((expected == actual) | (np.isnan(expected) & np.isnan(actual))))
+            raise SystemExit(f"Parity FAILED on {label}/{format_type}: {len(bad)} cells differ, first {bad[:5].tolist()}")
+        print(f"parity ok   {label:<18} {format_type:<5} {len(df)} rows")
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    odi = load_reference_pool('ODI_output.json')
+    test = load_reference_pool('test_output.json')
+    check_parity(odi, 'ODI_output.json')
+    check_parity(test, 'test_output.json')
+
+    # Object-typed columns, as the app sees them after concat onto its empty session frame
+    combined = pd.concat([odi, test], ignore_index=True).astype(object)
+    check_parity(synthetic_pool(combined, 2000), 'synthetic+wk')
+
+    pool = synthetic_pool(combined, n_players)
+    print(f"\ntiming on {n_players} players (best of 3)")
+    for format_type in FORMATS:
+        rowwise = best_of(lambda: compute_impact_rowwise(pool, format_type), repeat=1)
+        vectorized = best_of(lambda: compute_impact(pool, format_type))
+        print(f"{format_type:<5} row-wise {rowwise * 1000:9.1f} ms   vectorized {vectorized * 1000:7.2f} ms   "
+              f"x{rowwise / vectorized:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Peak memory of the Best XI CSV upload: one-shot pd.read_csv vs chunked ingest_csv.
+
+Writes player CSVs of growing size (the bundled ODI + Test players, renamed
+and repeated) and reports, for each, the peak traced allocation above what
+is still held once loading is done. For ingest_csv that overhead should stay
+flat as the file grows; for read_csv it grows with the file.
+
+    python benchmarks/bench_ingest.py [n_players ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cricket_analytics.ingest import ingest_csv  # noqa: E402
+from cricket_analytics.players import PLAYER_COLUMNS, REFERENCE_FILES, load_players_json  # noqa: E402
+from cricket_analytics.pool import PlayerPool  # noqa: E402
+
+
+def write_scaled_csv(path, n_players):
+    base = pd.concat([load_players_json(os.path.join(ROOT, f)) for f in REFERENCE_FILES.values()])[PLAYER_COLUMNS]
+    scaled = base.iloc[[i % len(base) for i in range(n_players)]].reset_index(drop=True)
+    scaled["player_name"] = scaled["player_name"] + " #" + scaled.index.astype(str)
+    scaled.to_csv(path, index=False)
+
+
+def traced(load):
+    """(seconds, peak MB above the memory still held afterwards, held MB); timed without tracing."""
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = load()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, (peak - held) / 1e6, held / 1e6
+
+
+def ingest(path, chunksize):
+    pool = PlayerPool()
+    with open(path, "rb") as f:
+        ingest_csv(f, pool, chunksize=chunksize)
+    return pool
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [25000, 100000, 400000]
+    chunksize = 50000
+    print(f"{'players':>9} {'file MB':>8} | {'read_csv s':>10} {'overhead MB':>11} | "
+          f"{'ingest s':>9} {'overhead MB':>11} {'pool MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_players in sizes:
+            path = os.path.join(tmp, f"players_{n_players}.csv")
+            write_scaled_csv(path, n_players)
+            read_time, read_overhead, _ = traced(lambda: pd.read_csv(path))
+            ingest_time, ingest_overhead, pool_mb = traced(lambda: ingest(path, chunksize))
+            print(f"{n_players:>9,} {os.path.getsize(path) / 1e6:>8.1f} | {read_time:>10.2f} {read_overhead:>11.1f} | "
+                  f"{ingest_time:>9.2f} {ingest_overhead:>11.1f} {pool_mb:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
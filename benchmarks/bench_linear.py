@@ -0,0 +1,76 @@
+"""Cold start and parity of the pickled Ridge model vs its pickle-free NumPy export.
+
+Each loader runs in a fresh interpreter that loads the model and prices one
+player, reporting wall time, peak RSS and whether scikit-learn was
+imported. The parent then checks that both give bit-identical predict
+output on synthetic players.
+
+    python benchmarks/bench_linear.py [n_players]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LOADERS = {
+    "joblib pickle": "import joblib; model = joblib.load('ipl_price_model.pkl')",
+    "linear JSON": ("from cricket_analytics.linear import load_linear_model; "
+                    "model = load_linear_model('ipl_price_model.json')"),
+}
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+{load}
+from cricket_analytics.pricing import engineer_features, predict_prices
+price = predict_prices(model, engineer_features({player!r}))[0]
+print(json.dumps({{"seconds": time.perf_counter() - start, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  "sklearn": "sklearn" in sys.modules, "price": float(price)}}))
+"""
+
+
+def cold_start(load, player):
+    result = subprocess.run([sys.executable, "-c", CHILD.format(load=load, player=player)],
+                            capture_output=True, text=True, cwd=ROOT, check=True)
+    return json.loads(result.stdout)
+
+
+def main():
+    import joblib
+
+    from bench_pricing import synthetic_players
+    from cricket_analytics.linear import load_linear_model
+    from cricket_analytics.pricing import engineer_features_batch
+
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    players = synthetic_players(n_players)
+    player = players.iloc[0].to_dict()
+    player = {k: v.item() if hasattr(v, "item") else v for k, v in player.items()}
+
+    print(f"{'loader':<14} {'cold start s':>12} {'peak RSS MB':>12}  sklearn imported")
+    for name, load in LOADERS.items():
+        runs = [cold_start(load, player) for _ in range(3)]
+        best = min(runs, key=lambda r: r["seconds"])
+        print(f"{name:<14} {best['seconds']:>12.3f} {best['max_rss_kb'] / 1024:>12.1f}  {best['sklearn']}")
+
+    features = engineer_features_batch(players)
+    pickled = joblib.load(os.path.join(ROOT, "ipl_price_model.pkl"))
+    linear = load_linear_model(os.path.join(ROOT, "ipl_price_model.json"))
+    start = time.perf_counter()
+    expected = pickled.predict(features)
+    pickled_time = time.perf_counter() - start
+    start = time.perf_counter()
+    got = linear.predict(features)
+    linear_time = time.perf_counter() - start
+    print(f"\npredict on {n_players:,} players: pickle {pickled_time * 1000:.2f} ms, "
+          f"linear {linear_time * 1000:.2f} ms, bit-identical: {np.array_equal(expected, got)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Player pool table payload: the whole sorted pool vs one server-side page.
+
+For pools of 1k, 10k and 50k players (resampled reference rows), reports the
+Arrow bytes Streamlit would send for the full sorted table and for one page,
+and the time to search, sort and slice that page.
+
+    python benchmarks/bench_payload.py [n_players ...]
+"""
+import os
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+from bench_impact import load_reference_pool, synthetic_pool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cricket_analytics import compute_impact  # noqa: E402
+from cricket_analytics.view import PAGE_SIZE, payload_bytes, table_page  # noqa: E402
+
+SIZES = [1000, 10000, 50000]
+COLUMNS = ["player_name", "role", "batting_impact", "bowling_impact", "impact"]
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+
+def main():
+    warnings.filterwarnings("ignore")
+    sizes = [int(n) for n in sys.argv[1:]] or SIZES
+    base = pd.concat([load_reference_pool("ODI_output.json"), load_reference_pool("test_output.json")],
+                     ignore_index=True)
+
+    print(f"{'players':>8} {'full table KB':>14} {'one page KB':>12} {'full sort ms':>13} "
+          f"{'page ms':>8} {'search page ms':>15}")
+    for n_players in sizes:
+        pool = synthetic_pool(base, n_players)
+        pool["player_name"] = pool["player_name"] + " #" + pool.index.astype(str)
+        scored = compute_impact(pool, "ODI")[COLUMNS]
+
+        full, full_ms = timed(lambda: scored.sort_values("impact", ascending=False))
+        (page, _, _), page_ms = timed(lambda: table_page(scored, "impact", page=3))
+        _, search_ms = timed(lambda: table_page(scored, "player_name", ascending=True, search="sharma"))
+        print(f"{n_players:>8,} {payload_bytes(full) / 1e3:>14,.1f} {payload_bytes(page) / 1e3:>12,.1f} "
+              f"{full_ms:>13.2f} {page_ms:>8.2f} {search_ms:>15.2f}")
+    print(f"\npage size {PAGE_SIZE} rows")
+
+
+if __name__ == "__main__":
+    main()
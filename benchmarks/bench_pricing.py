@@ -0,0 +1,81 @@
+"""Parity check and timing for batch price prediction.
+
+Checks that engineer_features_batch + one predict call gives the same
+prices as the per-player form path, then reports per-player cost of both.
+
+    python benchmarks/bench_pricing.py [n_players]
+"""
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cricket_analytics.pricing import (  # noqa: E402
+    PLAYER_INPUT_COLUMNS, engineer_features, engineer_features_batch, predict_prices
+)
+
+COUNTRIES = ['india', 'australia', 'england', 'south africa', 'new zealand',
+             'west indies', 'pakistan', 'sri lanka', 'bangladesh', 'afghanistan', 'other']
+ROLES = ['batsman', 'bowler', 'batting-allrounder', 'bowling-allrounder', 'wk-batsman']
+
+
+def synthetic_players(n_players, seed=0):
+    """Random form-like inputs, with plenty of zeros to hit every fallback branch."""
+    rng = np.random.default_rng(seed)
+
+    def stat(high, decimals=None, zero_share=0.35):
+        values = rng.uniform(0, high, n_players)
+        values = np.round(values, decimals) if decimals else values.astype(int)
+        values[rng.random(n_players) < zero_share] = 0
+        return values
+
+    return pd.DataFrame({
+        'country': rng.choice(COUNTRIES, n_players),
+        'age': rng.integers(16, 46, n_players),
+        'role': rng.choice(ROLES, n_players),
+        'ipl_matches': stat(250), 'ipl_runs': stat(8000), 'ipl_avg': stat(60, 1),
+        'ipl_sr': stat(200, 1), 'ipl_sixes': stat(300), 'ipl_wickets': stat(200),
+        'ipl_economy': stat(12, 1), 'ipl_bowl_sr': stat(40, 1),
+        't20_matches': stat(150), 't20_runs': stat(4000), 't20_avg': stat(60, 1),
+        't20_sr': stat(200, 1), 't20_wickets': stat(150), 't20_economy': stat(12, 1),
+        't20_bowl_sr': stat(40, 1),
+    })[PLAYER_INPUT_COLUMNS]
+
+
+def main():
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    model = joblib.load(os.path.join(ROOT, 'ipl_price_model.pkl'))
+    players = synthetic_players(n_players)
+    records = players.to_dict('records')
+
+    start = time.perf_counter()
+    single = np.array([predict_prices(model, np.array(engineer_features(p)))[0] for p in records])
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    features = engineer_features_batch(players)
+    batch = predict_prices(model, features)
+    batch_time = time.perf_counter() - start
+
+    row_features = np.array([engineer_features(p) for p in records], dtype=np.float64)
+    # NumPy's vectorized pow may differ from math.pow in the last ulp
+    if not np.allclose(row_features, features, rtol=1e-12, atol=0):
+        raise SystemExit("Parity FAILED: engineered features differ")
+    if not np.allclose(single, batch, rtol=1e-12, atol=0):
+        raise SystemExit("Parity FAILED: prices differ")
+    print(f"parity ok   {n_players} players")
+
+    print(f"per-player  {single_time / n_players * 1e6:9.1f} us   (engineer_features + predict per row)")
+    print(f"batch       {batch_time / n_players * 1e6:9.1f} us   (engineer_features_batch + one predict)")
+
+
+if __name__ == "__main__":
+    import warnings
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    main()
@@ -0,0 +1,59 @@
+"""Memory of many Best XI sessions that all load the ODI + Test reference players.
+
+Compares copying the reference rows into every session's PlayerPool (upsert)
+against attaching the shared, process-wide ReferenceLayers, with a few
+sessions also removing a player or adding their own rows.
+
+    python benchmarks/bench_sessions.py [n_sessions]
+"""
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cricket_analytics.players import load_reference_datasets  # noqa: E402
+from cricket_analytics.pool import PlayerPool, ReferenceLayer  # noqa: E402
+
+
+def sessions(n_sessions, datasets, layers, edit_every=10):
+    pools = []
+    for i in range(n_sessions):
+        pool = PlayerPool()
+        for name, players in datasets.items():
+            if layers is None:
+                pool.upsert(players, name)
+            else:
+                pool.attach(layers[name])
+        if i % edit_every == 0:
+            pool.remove([datasets["ODI"]["player_name"].iloc[i % 50]])
+            pool.upsert(datasets["Test"].head(5).assign(player_name=lambda d: d["player_name"] + f" ({i})"),
+                        "Custom")
+        pool.frame()
+        pools.append(pool)
+    return pools
+
+
+def traced(build):
+    tracemalloc.start()
+    result = build()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held / 1e6
+
+
+def main():
+    n_sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    datasets = load_reference_datasets(ROOT)
+    layers = {name: ReferenceLayer(name, players) for name, players in datasets.items()}
+    copied = traced(lambda: sessions(n_sessions, datasets, None))
+    shared = traced(lambda: sessions(n_sessions, datasets, layers))
+    print(f"{n_sessions} sessions, 1 in 10 edited")
+    print(f"copied into each pool   {copied:8.2f} MB")
+    print(f"shared reference layers {shared:8.2f} MB   x{copied / shared:,.0f} less")
+
+
+if __name__ == "__main__":
+    main()
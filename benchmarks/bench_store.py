@@ -0,0 +1,64 @@
+"""JSON vs columnar store load times for the Best XI "Load players" buttons.
+
+Scales the bundled ODI + Test files up to n_players rows, converts them once
+and compares json.load + role mapping + DataFrame against reading the
+memory-mapped Arrow IPC store and the Parquet store.
+
+    python benchmarks/bench_store.py [n_players]
+"""
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_impact import best_of  # noqa: E402
+from cricket_analytics.players import PLAYER_COLUMNS, load_players_json  # noqa: E402
+from cricket_analytics.store import convert_json, read_player_store  # noqa: E402
+
+
+def write_scaled_json(path, n_players):
+    records = []
+    for name in ('ODI_output.json', 'test_output.json'):
+        with open(os.path.join(ROOT, name)) as f:
+            records.extend(json.load(f))
+    scaled = [dict(records[i % len(records)], player_name=f"{records[i % len(records)]['player_name']} #{i}")
+              for i in range(n_players)]
+    with open(path, 'w') as f:
+        json.dump(scaled, f)
+
+
+def main():
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, 'players.json')
+        write_scaled_json(json_path, n_players)
+        arrow_path = os.path.join(tmp, 'players.arrow')
+        parquet_path = os.path.join(tmp, 'players.parquet')
+
+        convert_time = best_of(lambda: convert_json(json_path, arrow_path), repeat=1)
+        convert_json(json_path, parquet_path)
+
+        expected = load_players_json(json_path)[PLAYER_COLUMNS]
+        for path in (arrow_path, parquet_path):
+            pd.testing.assert_frame_equal(read_player_store(path), expected)
+        print(f"parity ok   {n_players} players")
+
+        print(f"\nsizes: json {os.path.getsize(json_path) / 1e6:.1f} MB   arrow {os.path.getsize(arrow_path) / 1e6:.1f} MB"
+              f"   parquet {os.path.getsize(parquet_path) / 1e6:.1f} MB   (one-off conversion {convert_time * 1000:.0f} ms)")
+        json_time = best_of(lambda: load_players_json(json_path))
+        arrow_time = best_of(lambda: read_player_store(arrow_path))
+        parquet_time = best_of(lambda: read_player_store(parquet_path))
+        names_time = best_of(lambda: read_player_store(arrow_path, columns=['player_name', 'role']))
+        print(f"json load          {json_time * 1000:8.1f} ms")
+        print(f"arrow (mmap)       {arrow_time * 1000:8.1f} ms   x{json_time / arrow_time:,.0f}")
+        print(f"parquet            {parquet_time * 1000:8.1f} ms   x{json_time / parquet_time:,.0f}")
+        print(f"arrow, 2 columns   {names_time * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
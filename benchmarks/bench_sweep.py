@@ -0,0 +1,39 @@
+"""Best XI scenario sweep: one process vs a process pool.
+
+Sweeps every format over a max_overseas x min_bowlers x min_allrounders x
+min_wk grid of the bundled ODI + Test players and checks both runs agree.
+
+    python benchmarks/bench_sweep.py [workers]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cricket_analytics.players import load_reference_datasets  # noqa: E402
+from cricket_analytics.sweep import run_sweep, scenario_grid  # noqa: E402
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    players = pd.concat(load_reference_datasets(ROOT).values(), ignore_index=True)
+    scenarios = scenario_grid(max_overseas=range(0, 11), min_bowlers=range(0, 8), min_allrounders=range(0, 8),
+                              min_wk=range(0, 3))
+    start = time.perf_counter()
+    inline = run_sweep(players, scenarios, workers=1)
+    inline_time = time.perf_counter() - start
+    start = time.perf_counter()
+    pooled = run_sweep(players, scenarios, workers=workers)
+    pooled_time = time.perf_counter() - start
+    pd.testing.assert_frame_equal(inline, pooled)
+    print(f"{len(scenarios):,} scenarios, {inline['feasible'].mean():.0%} feasible; parity ok")
+    print(f"{'1 process':<14} {inline_time:6.2f} s   {inline_time / len(scenarios) * 1e3:.2f} ms/scenario")
+    print(f"{f'{workers} workers':<14} {pooled_time:6.2f} s   x{inline_time / pooled_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
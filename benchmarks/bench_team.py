@@ -0,0 +1,89 @@
+"""Build vs solve timing for the Best XI ILP.
+
+Times the original per-index PuLP construction (players_df.loc per player per
+constraint) against the array-built models in cricket_analytics.team, and
+reports solve time separately, for pools of 200, 2k and 20k players:
+
+- PuLP model from arrays, solved by CBC (what the app uses)
+- sparse matrix model, solved by scipy's HiGHS MILP (no MPS file round trip)
+- exact top-k + DP solver (no model to build at all)
+
+    python benchmarks/bench_team.py [n_players ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from pulp import LpMaximize, LpProblem, LpVariable, lpSum
+
+from bench_impact import load_reference_pool, synthetic_pool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cricket_analytics import compute_impact  # noqa: E402
+from cricket_analytics.team import (  # noqa: E402
+    TeamConstraints, build_team_matrix, build_team_problem, solve_team_dp, solve_team_matrix, solve_team_problem,
+    team_arrays
+)
+
+SIZES = [200, 2000, 20000]
+
+
+def build_legacy(players_df, c):
+    """Original generator-expression construction from app.py."""
+    prob = LpProblem("BestXI", LpMaximize)
+    choices = LpVariable.dicts("select", players_df.index, cat="Binary")
+    prob += lpSum(players_df.loc[i, "impact"] * choices[i] for i in players_df.index)
+    prob += lpSum(choices[i] for i in players_df.index) == c.team_size, "TeamSize"
+    prob += lpSum(players_df.loc[i, "is_overseas"] * choices[i] for i in players_df.index) <= c.max_overseas, "OverseasLimit"
+    prob += lpSum(choices[i] for i in players_df.index if players_df.loc[i, "role"] == "Batsman") >= c.min_batsmen, "MinBatsmen"
+    prob += lpSum(choices[i] for i in players_df.index if players_df.loc[i, "role"] == "Bowler") >= c.min_bowlers, "MinBowlers"
+    prob += lpSum(choices[i] for i in players_df.index if players_df.loc[i, "role"] == "All-Rounder") >= c.min_allrounders, "MinAllRounders"
+    prob += lpSum(choices[i] for i in players_df.index if players_df.loc[i, "role"] == "Wicketkeeper") >= c.min_wk, "MinWicketkeepers"
+    return prob, list(choices.values())
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or SIZES
+    base = pd.concat([load_reference_pool('ODI_output.json'), load_reference_pool('test_output.json')],
+                     ignore_index=True)
+    constraints = TeamConstraints()
+
+    # Pay scipy's import cost outside the timings
+    solve_team_matrix(*build_team_matrix(*team_arrays(compute_impact(synthetic_pool(base, 50), "ODI")), constraints))
+
+    print(f"{'players':>8} | {'legacy build':>12} | {'pulp build':>10} {'cbc solve':>10} | "
+          f"{'sparse build':>12} {'highs solve':>11} | {'dp solve':>9} | objective")
+    for n_players in sizes:
+        pool = compute_impact(synthetic_pool(base, n_players), "ODI")
+        arrays = team_arrays(pool)
+
+        (legacy_prob, legacy_choices), legacy_build = timed(lambda: build_legacy(pool, constraints))
+        (prob, choices), pulp_build = timed(lambda: build_team_problem(*arrays, constraints))
+        (cbc_selected, violated), cbc_solve = timed(lambda: solve_team_problem(prob, choices))
+        model, sparse_build = timed(lambda: build_team_matrix(*arrays, constraints))
+        (highs_selected, _), highs_solve = timed(lambda: solve_team_matrix(*model))
+        (dp_selected, _), dp_solve = timed(lambda: solve_team_dp(*arrays, constraints))
+
+        legacy_selected, _ = solve_team_problem(legacy_prob, legacy_choices)
+        impact = pool['impact'].to_numpy()
+        objective = impact[cbc_selected].sum()
+        for other in (legacy_selected, highs_selected, dp_selected):
+            if violated or not np.isclose(objective, impact[other].sum()):
+                raise SystemExit(f"Objective mismatch at {n_players} players")
+
+        print(f"{n_players:>8} | {legacy_build * 1000:>9.1f} ms | {pulp_build * 1000:>7.1f} ms {cbc_solve * 1000:>7.1f} ms | "
+              f"{sparse_build * 1000:>9.2f} ms {highs_solve * 1000:>8.1f} ms | {dp_solve * 1000:>6.2f} ms | {objective:.2f}")
+
+
+if __name__ == "__main__":
+    main()
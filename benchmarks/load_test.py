@@ -0,0 +1,85 @@
+"""Load test for the scoring service (python -m cricket_analytics.service).
+
+Fires requests at a running service with a fixed number of concurrent
+clients and reports throughput and p50/p90/p99 latency per endpoint.
+
+    python benchmarks/load_test.py --url http://127.0.0.1:8600 --requests 2000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_pricing import synthetic_players  # noqa: E402
+
+
+def payloads(endpoint, n_requests, batch_size):
+    players = synthetic_players(max(n_requests, batch_size)).to_dict("records")
+    if endpoint == "/predict":
+        return [players[i] for i in range(n_requests)]
+    if endpoint == "/predict/batch":
+        return [{"players": players[:batch_size]}] * n_requests
+    # Alternate formats and overseas caps so both cache hits and solves show up
+    return [{"dataset": "ODI", "format": ["T20", "ODI", "Test"][i % 3],
+             "constraints": {"min_wk": 0, "max_overseas": 2 + i % 4}} for i in range(n_requests)]
+
+
+async def run_endpoint(url, endpoint, n_requests, concurrency, batch_size):
+    client = AsyncHTTPClient(max_clients=concurrency)
+    bodies = [json.dumps(p, default=lambda v: v.item()) for p in payloads(endpoint, n_requests, batch_size)]
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for body in bodies:
+        queue.put_nowait(body)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            body = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.fetch(HTTPRequest(url + endpoint, method="POST", body=body), raise_error=False)
+            latencies.append(time.perf_counter() - start)
+            if response.code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    print(f"{endpoint:<15} {n_requests:>6} req  {n_requests / elapsed:>8.0f} req/s  "
+          f"p50 {np.percentile(ms, 50):7.2f} ms  p90 {np.percentile(ms, 90):7.2f} ms  "
+          f"p99 {np.percentile(ms, 99):7.2f} ms  errors {errors}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8600")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=500, help="players per /predict/batch request")
+    parser.add_argument("--endpoints", nargs="+", default=["/predict", "/predict/batch", "/best-xi"])
+    args = parser.parse_args()
+
+    for endpoint in args.endpoints:
+        await run_endpoint(args.url, endpoint, args.requests, args.concurrency, args.batch_size)
+
+    health = await AsyncHTTPClient().fetch(args.url + "/health")
+    stats = json.loads(health.body)
+    if stats["prediction_batches"]:
+        print(f"micro-batching: {stats['prediction_requests']} /predict calls in {stats['prediction_batches']} "
+              f"batches ({stats['prediction_requests'] / stats['prediction_batches']:.1f} per batch)")
+
+
+if __name__ == "__main__":
+    import warnings
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    asyncio.run(main())
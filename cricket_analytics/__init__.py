@@ -0,0 +1,14 @@
+"""Headless analytics core used by the Streamlit app.
+
+Everything here is UI-free and takes explicit parameters, so it can be
+imported from batch jobs, workers and benchmarks as well as from app.py.
+"""
+
+from .impact import compute_impact
+from .players import PLAYER_COLUMNS, PLAYER_DTYPES, empty_pool, load_players_json, memory_report, to_player_schema
+from .pool import PlayerPool
+from .pricing import (
+    engineer_features, engineer_features_batch, load_price_model, predict_player, predict_prices, price_players
+)
+from .team import SOLVERS, IncrementalTeamSelector, TeamConstraints, select_best_team, top_k_teams
+from .sweep import run_sweep, scenario_grid
@@ -0,0 +1,195 @@
+import hashlib
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .impact import compute_impact
+from .pricing import player_key, pool_price_inputs
+
+
+def _sizeof(value):
+    """Rough memory footprint of a cached value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_sizeof(v) for v in value.values())
+    if hasattr(value, "to_plotly_json"):
+        return len(value.to_json())  # plotly figure: size of its serialized spec
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and total estimated bytes."""
+
+    def __init__(self, max_entries=128, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """get() that leaves the hit/miss counters alone, for probes inside a lookup counted elsewhere."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                return self._data[key][0]
+            return default
+
+    def put(self, key, value):
+        size = _sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self.bytes -= self._data.pop(key)[1]
+            if size > self.max_bytes:
+                return value  # would evict everything else; serve it uncached
+            self._data[key] = (value, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Process-wide caches, shared by every session (keys are content hashes)
+IMPACT_CACHE = LRUCache(max_entries=32, max_bytes=256 * 1024 * 1024)
+TEAM_CACHE = LRUCache(max_entries=512, max_bytes=32 * 1024 * 1024)
+PREDICTION_CACHE = LRUCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+# One float per (model version, player price inputs), plus whole-pool price arrays
+PRICE_CACHE = LRUCache(max_entries=200_000, max_bytes=64 * 1024 * 1024)
+
+# id(frame) -> (weakref to frame, fingerprint); pool frames are replaced, never edited in place
+_fingerprints = {}
+_fingerprints_lock = threading.Lock()
+
+
+def pool_fingerprint(players_df):
+    """Stable content hash of a player pool (values, column names and order)."""
+    key = id(players_df)
+    with _fingerprints_lock:
+        known = _fingerprints.get(key)
+        if known is not None and known[0]() is players_df:
+            return known[1]
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\x1f".join(map(str, players_df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(players_df, index=False).to_numpy().tobytes())
+    fingerprint = digest.hexdigest()
+
+    with _fingerprints_lock:
+        _fingerprints[key] = (weakref.ref(players_df, lambda _, key=key: _fingerprints.pop(key, None)),
+                              fingerprint)
+    return fingerprint
+
+
+def cached_compute_impact(players_df, format_type, fingerprint=None):
+    """compute_impact memoized on (pool fingerprint, format). Treat the result as read-only."""
+    fingerprint = fingerprint or pool_fingerprint(players_df)
+    return IMPACT_CACHE.get_or_compute(
+        (fingerprint, format_type), lambda: compute_impact(players_df, format_type)
+    )
+
+
+def cached_team(fingerprint, format_type, backend, constraints, solve):
+    """Memoize solve() -> (team, violated) on pool, format, solver and constraint tuple."""
+    team, violated = TEAM_CACHE.get_or_compute(
+        ("team", fingerprint, format_type, backend, tuple(constraints)), solve
+    )
+    return team.copy(), violated
+
+
+def cached_top_k(fingerprint, format_type, constraints, k, solve):
+    """Memoize solve() -> [(team, total impact), ...] for the alternative-XI list."""
+    return TEAM_CACHE.get_or_compute(("top_k", fingerprint, format_type, tuple(constraints), k), solve)
+
+
+def cached_prediction(version, player_data, player_name, compute):
+    """Memoize compute() -> (prediction, dashboard figure) on model version, normalized inputs and name.
+
+    Returns (prediction, figure, from_cache). Treat both as read-only.
+    """
+    key = ("prediction", version, player_key(player_data), player_name)
+    missing = object()
+    cached = PREDICTION_CACHE.get(key, missing)
+    if cached is not missing:
+        return (*cached, True)
+    return (*PREDICTION_CACHE.put(key, compute()), False)
+
+
+def cached_pool_prices(players_df, version, price, fingerprint=None):
+    """Predicted auction price (Cr) for every row of a Best XI pool; treat the array as read-only.
+
+    Memoized per pool (fingerprint, model version) and per player (model
+    version, hash of the player's price inputs), so after an edit only the
+    new or changed players go to price(), in one batch. Only the pool lookup
+    counts towards the cache's hits and misses.
+    """
+    fingerprint = fingerprint or pool_fingerprint(players_df)
+
+    def compute():
+        inputs = pool_price_inputs(players_df)
+        keys = pd.util.hash_pandas_object(inputs, index=False).tolist()
+        prices = np.array([PRICE_CACHE.peek(("player_price", version, key), np.nan) for key in keys])
+        missing = np.flatnonzero(np.isnan(prices))
+        if len(missing):
+            prices[missing] = price(inputs.iloc[missing])
+            for i in missing.tolist():
+                PRICE_CACHE.put(("player_price", version, keys[i]), float(prices[i]))
+        return prices
+
+    return PRICE_CACHE.get_or_compute(("pool_prices", fingerprint, version), compute)
+
+
+def cache_stats():
+    return {"impact": IMPACT_CACHE.stats(), "team": TEAM_CACHE.stats(), "prediction": PREDICTION_CACHE.stats(),
+            "price": PRICE_CACHE.stats()}
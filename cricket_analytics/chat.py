@@ -0,0 +1,228 @@
+import functools
+import hashlib
+import json
+import queue
+import threading
+import time
+
+GEMINI_MODEL = "gemini-2.5-flash"
+
+SYSTEM_INSTRUCTION = (
+    "You are a Cricket AI expert with deep knowledge of IPL, international cricket, player statistics, team strategies, and match analysis. "
+    "You ONLY reply to queries about cricket, IPL auctions, players, stats, team formations, match predictions, and cricket strategy. "
+    "If the user asks anything unrelated to cricket, reply politely and shut down the unrelated conversation. "
+    "If it is cricket-related, reply enthusiastically with detailed, insightful explanations including statistics where relevant."
+)
+
+NOT_CONFIGURED_REPLY = "⚠️ Gemini AI not configured. Please add your GOOGLE_API_KEY to the .env file to unlock full AI capabilities."
+EMPTY_REPLY = "⚠️ No response from Gemini."
+TIMEOUT_REPLY = "⚠️ Cricket AI took too long to respond. Please try again."
+
+DEFAULT_TIMEOUT = 30.0  # seconds for the whole streamed reply
+
+# Passed as a dict so building it needs no google.genai import; FakeGeminiClient ignores it
+GENERATION_CONFIG = {"system_instruction": SYSTEM_INSTRUCTION}
+
+
+def create_gemini_client(api_key):
+    """Gemini client for api_key, or None when no key is configured."""
+    if not api_key:
+        return None
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
+class ChatStream:
+    """Streams reply chunks from a background thread with a deadline and cancellation.
+
+    Iterating yields text chunks as they arrive, plus "" every poll_interval
+    while waiting so the caller can refresh its UI. Iteration stops on
+    completion, cancel() or timeout; status and metrics() say which.
+    """
+
+    def __init__(self, chunks, timeout=DEFAULT_TIMEOUT, poll_interval=0.1, on_complete=None, cache_tier=None):
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.on_complete = on_complete
+        self.cache_tier = cache_tier
+        self.status = "streaming"
+        self.error = None
+        self.chunks = []
+        self.started = time.perf_counter()
+        self.first_token_at = None
+        self.finished_at = None
+        self._queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._produce, args=(chunks,), daemon=True)
+        self._thread.start()
+
+    def _produce(self, chunks):
+        try:
+            iterator = iter(chunks() if callable(chunks) else chunks)
+            for chunk in iterator:
+                if self._cancelled.is_set():
+                    break
+                text = getattr(chunk, "text", chunk)
+                if text:
+                    self._queue.put(("chunk", text))
+            if hasattr(iterator, "close"):
+                iterator.close()
+            self._queue.put(("done", None))
+        except Exception as e:
+            self._queue.put(("error", e))
+
+    def __iter__(self):
+        deadline = self.started + self.timeout
+        while self.status == "streaming":
+            if self._cancelled.is_set():
+                self._finish("cancelled")
+                return
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self._cancelled.set()
+                self._finish("timeout")
+                return
+            try:
+                kind, value = self._queue.get(timeout=min(remaining, self.poll_interval))
+            except queue.Empty:
+                yield ""
+                continue
+            if kind == "chunk":
+                if self.first_token_at is None:
+                    self.first_token_at = time.perf_counter()
+                self.chunks.append(value)
+                yield value
+            elif kind == "done":
+                self._finish("complete")
+                if self.on_complete is not None and self.text:
+                    self.on_complete(self.text)
+            else:
+                self.error = value
+                self._finish("error")
+                raise value
+
+    def _finish(self, status):
+        self.status = status
+        self.finished_at = time.perf_counter()
+
+    def cancel(self):
+        """Stop waiting for more chunks; the producer thread stops at its next chunk."""
+        self._cancelled.set()
+        if self.status == "streaming":
+            self._finish("cancelled")
+
+    @property
+    def text(self):
+        return "".join(self.chunks).strip()
+
+    def reply(self):
+        """Final reply text for the chat history, including timeout/cancel notes."""
+        if self.status == "timeout":
+            return f"{self.text}\n\n{TIMEOUT_REPLY}" if self.text else TIMEOUT_REPLY
+        if self.status == "cancelled":
+            return f"{self.text} _(cancelled)_" if self.text else "_(cancelled)_"
+        return self.text or EMPTY_REPLY
+
+    def metrics(self):
+        end = self.finished_at or time.perf_counter()
+        return {
+            "status": self.status,
+            "ttft": None if self.first_token_at is None else self.first_token_at - self.started,
+            "total_time": end - self.started,
+            "chunks": len(self.chunks),
+            "chars": sum(len(c) for c in self.chunks),
+            "cache": self.cache_tier,
+        }
+
+
+def build_prompt(question, context=""):
+    """User turn sent to Gemini: retrieved player records (if any) followed by the question."""
+    return f"{context}\n\nQuestion: {question}" if context else question
+
+
+def build_contents(prompt, history=()):
+    """Gemini contents: the prompt alone, or earlier (role, text) turns followed by it."""
+    if not history:
+        return prompt
+    turns = [{"role": "user" if role == "user" else "model", "parts": [{"text": text}]} for role, text in history]
+    return turns + [{"role": "user", "parts": [{"text": prompt}]}]
+
+
+def _cache_namespace(model, context, history=()):
+    # The same question grounded in different player records or earlier turns is a different request
+    if not context and not history:
+        return model
+    key = json.dumps([context, list(history)])
+    return f"{model}:{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"
+
+
+def stream_cricket_ai(client, question, model=GEMINI_MODEL, timeout=DEFAULT_TIMEOUT, cache=None, context="",
+                      history=()):
+    """Start a streamed Gemini reply to question and return its ChatStream.
+
+    context is a block of retrieved player records prepended to the question;
+    history is a list of earlier (role, text) turns sent along for multi-turn
+    answers. With a ResponseCache, cached replies are served without calling
+    Gemini and completed replies are stored for next time.
+    """
+    if client is None:
+        return ChatStream([NOT_CONFIGURED_REPLY], timeout=timeout)
+    on_complete = None
+    if cache is not None:
+        namespace = _cache_namespace(model, context, history)
+        cached, tier = cache.get(question, namespace)
+        if cached is not None:
+            return ChatStream([cached], timeout=timeout, cache_tier=tier)
+        on_complete = functools.partial(cache.put, question, namespace)
+    contents = build_contents(build_prompt(question, context), history)
+    return ChatStream(
+        lambda: client.models.generate_content_stream(model=model, config=GENERATION_CONFIG, contents=contents),
+        timeout=timeout,
+        on_complete=on_complete,
+    )
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeModels:
+    def __init__(self, client):
+        self._client = client
+
+    def generate_content_stream(self, model, contents, config=None):
+        # config (system instruction) is accepted for signature parity and ignored
+        client = self._client
+        time.sleep(client.first_token_delay)
+        if client.fail_with is not None:
+            raise client.fail_with
+        if isinstance(contents, list):
+            contents = contents[-1]["parts"][0]["text"]
+        words = client.reply_for(contents.rsplit("Question: ", 1)[-1]).split(" ")
+        for i in range(0, len(words), client.chunk_words):
+            if i:
+                time.sleep(client.chunk_delay)
+            yield _FakeResponse(" ".join(words[i:i + client.chunk_words]) + " ")
+
+
+class FakeGeminiClient:
+    """Offline stand-in for genai.Client that streams a canned reply with realistic delays.
+
+    Set GEMINI_FAKE=1 to use it in the app without network access.
+    """
+
+    def __init__(self, reply=None, first_token_delay=0.4, chunk_delay=0.03, chunk_words=3, fail_with=None):
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.chunk_words = chunk_words
+        self.fail_with = fail_with
+        self.models = _FakeModels(self)
+
+    def reply_for(self, question):
+        if self.reply is not None:
+            return self.reply
+        return (f"(Offline Cricket AI) You asked: \"{question}\". In a live session Gemini would answer "
+                "with player stats, recent form and match context. This canned reply is streamed in small "
+                "chunks so the chat UI, timeouts and time-to-first-token metrics can be exercised offline.")
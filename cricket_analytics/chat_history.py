@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+import time
+import uuid
+import weakref
+from collections import deque
+
+DEFAULT_SPILL_DIR = os.path.join(tempfile.gettempdir(), "cricket_chat_history")
+SUMMARY_CHARS = 600
+PAGE_SIZE = 20
+# Spill files not written for this long belong to sessions that ended without cleanup (e.g. a crash)
+SPILL_MAX_AGE = 24 * 3600  # seconds
+
+
+def _remove_spill(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def expire_spill_files(spill_dir=DEFAULT_SPILL_DIR, max_age=SPILL_MAX_AGE):
+    """Delete spill files older than max_age seconds; returns how many were removed."""
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(spill_dir))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.name.endswith(".jsonl") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass  # removed by another session meanwhile
+    return removed
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+class ChatHistory:
+    """Chat messages as a capped ring buffer; older messages are spilled to a JSONL file.
+
+    Behaves like the list of (role, message) tuples it replaces for append,
+    iteration and len (which counts only the in-memory window). Spilled
+    messages stay readable via page() and are condensed into summary for the
+    LLM context window. The spill file is deleted when the history is garbage
+    collected (the session ended) or the interpreter exits; files left behind by
+    a crash are expired when a new history is created.
+    """
+
+    def __init__(self, max_messages=60, spill_dir=DEFAULT_SPILL_DIR):
+        self._messages = deque()
+        self.max_messages = max_messages
+        self.spill_path = os.path.join(spill_dir, f"{uuid.uuid4().hex}.jsonl") if spill_dir else None
+        self.spilled = 0
+        self._spilled_questions = deque(maxlen=20)
+        if self.spill_path is not None:
+            expire_spill_files(spill_dir)
+            weakref.finalize(self, _remove_spill, self.spill_path)
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __iter__(self):
+        return iter(self._messages)
+
+    def __getitem__(self, index):
+        return self._messages[index]
+
+    @property
+    def total(self):
+        return self.spilled + len(self._messages)
+
+    def append(self, message):
+        self._messages.append(message)
+        if len(self._messages) > self.max_messages:
+            self._spill(self._messages.popleft())
+
+    def _spill(self, message):
+        role, text = message
+        if role == "user":
+            self._spilled_questions.append(text)
+        if self.spill_path is not None:
+            os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps([role, text]) + "\n")
+        self.spilled += 1
+
+    def page(self, page, page_size=PAGE_SIZE):
+        """Messages of one page counting back from the newest (page 0 = most recent)."""
+        end = self.total - page * page_size
+        start = max(end - page_size, 0)
+        if end <= 0:
+            return []
+        if start >= self.spilled:
+            return list(self._messages)[start - self.spilled:end - self.spilled]
+        older = self._read_spilled(start, min(end, self.spilled))
+        return older + list(self._messages)[:max(end - self.spilled, 0)]
+
+    def page_count(self, page_size=PAGE_SIZE):
+        return max((self.total + page_size - 1) // page_size, 1)
+
+    def _read_spilled(self, start, end):
+        if self.spill_path is None or not os.path.exists(self.spill_path):
+            return [("ai", "_(older messages were not kept)_")] if end > start else []
+        messages = []
+        with open(self.spill_path, encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                if i >= end:
+                    break
+                if i >= start:
+                    messages.append(tuple(json.loads(line)))
+        return messages
+
+    @property
+    def summary(self):
+        """Short extractive summary of the spilled turns ("" when nothing was spilled)."""
+        if not self._spilled_questions:
+            return ""
+        text = "; ".join(self._spilled_questions)
+        if len(text) > SUMMARY_CHARS:
+            text = "…" + text[-SUMMARY_CHARS:]
+        return f"Earlier in this conversation the user asked about: {text}"
+
+    def context_window(self, token_budget, exclude_latest=True):
+        """Most recent (role, text) turns that fit in token_budget, oldest first."""
+        messages = list(self._messages)
+        if exclude_latest and messages:
+            messages = messages[:-1]
+        window, used = [], 0
+        for role, text in reversed(messages):
+            cost = estimate_tokens(text)
+            if used + cost > token_budget:
+                break
+            window.append((role, text))
+            used += cost
+        return window[::-1]
+
+    def clear(self):
+        self._messages.clear()
+        self._spilled_questions.clear()
+        self.spilled = 0
+        if self.spill_path is not None:
+            _remove_spill(self.spill_path)
@@ -0,0 +1,83 @@
+import numpy as np
+
+# Roles that contribute to each side of the impact score
+BATTING_ROLES = ['Batsman', 'All-Rounder', 'Wicketkeeper']
+BOWLING_ROLES = ['Bowler', 'All-Rounder']
+
+
+def _column(df, name):
+    """Return a column as a float64 array (handles object columns after concat)."""
+    return df[name].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _safe_ratio(num, den, fallback):
+    """num / den where den > 0, otherwise fallback (no divide warnings)."""
+    out = np.full(num.shape, fallback, dtype=np.float64)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def compute_impact(df, format_type):
+    """Calculate impact score based on format and role."""
+    df = df.copy()
+
+    runs = _column(df, 'runs_scored')
+    innings = _column(df, 'innings_batted')
+    balls_faced = _column(df, 'balls_faced')
+    strike_rate = _column(df, 'strike_rate')
+    wickets = _column(df, 'wickets')
+    balls_bowled = _column(df, 'balls_bowled')
+    economy = _column(df, 'economy')
+    role = df['role'].to_numpy(dtype=object)
+
+    # Calculate derived metrics
+    batting_avg = _safe_ratio(runs, innings, 0.0)
+    bowling_avg = _safe_ratio(_column(df, 'runs_conceded'), wickets, 999.0)
+    bowler_sr = _safe_ratio(balls_bowled, wickets, 999.0)
+    boundary_pct = _safe_ratio(_column(df, 'fours') + _column(df, 'sixes'), balls_faced, 0.0) * 100
+    dot_pct = _safe_ratio(_column(df, 'dot_balls'), balls_bowled, 0.0) * 100
+
+    df['batting_avg'] = batting_avg
+    df['bowling_avg'] = bowling_avg
+    df['bowler_sr'] = bowler_sr
+    df['boundary_pct'] = boundary_pct
+    df['dot_pct'] = dot_pct
+
+    is_allrounder = role == 'All-Rounder'
+    bats = np.isin(role, BATTING_ROLES)
+    bowls = np.isin(role, BOWLING_ROLES) & (wickets > 0)
+
+    batting_impact = np.zeros(len(df), dtype=np.float64)
+    bowling_impact = np.zeros(len(df), dtype=np.float64)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Calculate Batting Impact (for Batsman, All-Rounder, Wicketkeeper)
+        if format_type == 'Test':
+            score = (batting_avg * 0.75) + (batting_avg * 0.15) + ((strike_rate / 2) * 0.10)
+        elif format_type == 'ODI':
+            score = np.sqrt(batting_avg * strike_rate) + (0.5 * boundary_pct)
+        elif format_type == 'T20':
+            score = (strike_rate * 0.7) + (batting_avg * 0.3) + (0.7 * (batting_avg + strike_rate))
+        else:
+            score = None
+        if score is not None:
+            batting_impact[bats] = score[bats]
+
+        # Calculate Bowling Impact (for Bowler, All-Rounder)
+        if format_type == 'Test':
+            # Prevent division by zero
+            mask = bowls & (bowling_avg > 0) & (bowler_sr > 0)
+            score = (1000 / bowling_avg) + ((100 / bowler_sr) * 2)
+        else:  # ODI or T20
+            mask = bowls & (economy > 0)
+            score = ((dot_pct * wickets) / (economy ** 2)) * 100
+        bowling_impact[mask] = score[mask]
+
+    df['batting_impact'] = batting_impact
+    df['bowling_impact'] = bowling_impact
+
+    # Total Impact - For All-Rounders, use average
+    total = batting_impact + bowling_impact
+    df['impact'] = np.where(is_allrounder, total / 2, total)
+
+    return df
@@ -0,0 +1,120 @@
+"""Chunked CSV ingestion for player uploads.
+
+The file is read chunksize rows at a time, each chunk is validated against
+PLAYER_COLUMNS, bad rows are dropped (with line numbers and reasons) and the
+good ones are cast to the compact PLAYER_DTYPES and upserted into a
+PlayerPool, so the memory needed on top of the pool itself does not grow
+with the file.
+"""
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .players import COUNT_COLUMNS, PLAYER_COLUMNS, PLAYER_DTYPES, PLAYER_ROLES, RATE_COLUMNS, normalize_roles
+
+IngestReport = namedtuple("IngestReport", ["rows_read", "rows_loaded", "rows_rejected", "rejected", "chunks",
+                                           "elapsed"])
+
+
+def _source_size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if getattr(source, "size", None):
+        return source.size
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def _numeric(values):
+    """A parsed numeric column as float64; dirty (object) columns are coerced, bad cells become NaN."""
+    if values.dtype.kind in "biuf":
+        return values.astype(np.float64).fillna(0)  # empty stat = 0
+    text = values.fillna("").astype(str).str.strip()
+    return pd.to_numeric(text.mask(text == "", "0"), errors="coerce")
+
+
+def validate_chunk(chunk):
+    """Split a raw chunk into a typed frame of valid rows and a Series of rejection reasons."""
+    reasons = pd.Series("", index=chunk.index, dtype=object)
+
+    def reject(mask, reason):
+        reasons[mask & (reasons == "")] = reason
+
+    names = chunk["player_name"].fillna("").str.strip()
+    reject(names == "", "missing player_name")
+    roles = normalize_roles(chunk["role"].fillna("").str.strip())
+    reject(~roles.isin(PLAYER_ROLES), "unknown role")
+
+    numbers = {}
+    for column in ["is_overseas"] + COUNT_COLUMNS + RATE_COLUMNS:
+        values = _numeric(chunk[column])
+        reject(values.isna(), f"non-numeric {column}")
+        reject(np.isinf(values), f"non-finite {column}")
+        reject(values < 0, f"negative {column}")
+        # The cast to PLAYER_DTYPES must neither truncate nor overflow
+        dtype = np.dtype(PLAYER_DTYPES[column])
+        if dtype.kind == "i":
+            reject(values % 1 != 0, f"non-integer {column}")
+            reject(values > np.iinfo(dtype).max, f"{column} too large")
+        else:
+            reject(values > np.finfo(dtype).max, f"{column} too large")
+        numbers[column] = values
+    reject(~numbers["is_overseas"].isin([0, 1]), "is_overseas must be 0 or 1")
+
+    good = reasons == ""
+    if good.all():
+        clean = pd.DataFrame({"player_name": names, "role": roles, **numbers})[PLAYER_COLUMNS]
+    else:
+        clean = pd.DataFrame({"player_name": names[good], "role": roles[good],
+                              **{c: v[good] for c, v in numbers.items()}})[PLAYER_COLUMNS]
+    return clean.astype(PLAYER_DTYPES), reasons[~good]
+
+
+def ingest_csv(source, pool, format_type="CSV", chunksize=50_000, on_progress=None,
+               max_examples=20, max_bad_share=0.5):
+    """Stream a player CSV into pool; returns an IngestReport.
+
+    Raises ValueError before loading anything if required columns are missing
+    or more than max_bad_share of the first chunk is invalid. on_progress is
+    called after each chunk with (fraction of the file read, report so far).
+    """
+    start = time.perf_counter()
+    total_bytes = _source_size(source) or 1
+    # Numeric columns are parsed by the C reader; only chunks with bad cells fall back to strings
+    reader = pd.read_csv(source, chunksize=chunksize, dtype={"player_name": str, "role": str},
+                         keep_default_na=False, na_values=[""], skipinitialspace=True,
+                         usecols=lambda c: c.strip() in PLAYER_COLUMNS)
+    rows_read = rows_loaded = rows_rejected = chunks = 0
+    rejected = []
+    for chunk in reader:
+        chunk.columns = chunk.columns.str.strip()
+        missing = [c for c in PLAYER_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+        clean, reasons = validate_chunk(chunk)
+        if chunks == 0 and len(reasons) > max_bad_share * len(chunk):
+            line, reason = reasons.index[0] + 2, reasons.iloc[0]
+            raise ValueError(f"{len(reasons)} of the first {len(chunk)} rows are invalid "
+                             f"(e.g. line {line}: {reason})")
+
+        pool.upsert(clean, format_type)
+        chunks += 1
+        rows_read += len(chunk)
+        rows_loaded += len(clean)
+        rows_rejected += len(reasons)
+        # Line numbers count the header as line 1
+        rejected.extend((int(i) + 2, r) for i, r in reasons.iloc[:max_examples - len(rejected)].items())
+
+        if on_progress is not None:
+            position = source.tell() if hasattr(source, "tell") else total_bytes
+            on_progress(min(position / total_bytes, 1.0),
+                        IngestReport(rows_read, rows_loaded, rows_rejected, rejected, chunks,
+                                     time.perf_counter() - start))
+
+    return IngestReport(rows_read, rows_loaded, rows_rejected, rejected, chunks, time.perf_counter() - start)
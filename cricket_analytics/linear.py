@@ -0,0 +1,113 @@
+"""Pickle-free artifact and NumPy scorer for linear price models.
+
+    python -m cricket_analytics.linear ipl_price_model.pkl feature_columns.pkl ipl_price_model.json
+
+Export reads a fitted linear estimator (the Ridge price model) once and
+writes its coefficients, intercept and feature order to a small JSON file.
+Floats are written with repr, which round-trips float64 exactly, so
+LinearModel.predict computes the same X @ coef_ + intercept_ as the
+estimator and returns bit-identical output. Loading the artifact needs only
+json and NumPy: no joblib, no scikit-learn, no unpickling.
+"""
+import argparse
+import hashlib
+import json
+
+import numpy as np
+
+ARTIFACT_FORMAT = "linear-model"
+ARTIFACT_VERSION = 1
+
+
+class LinearModel:
+    """predict(X) = X @ coef_ + intercept_, with the attributes the registry reads from estimators."""
+
+    def __init__(self, coef, intercept, feature_columns):
+        self.coef_ = np.asarray(coef, dtype=np.float64)
+        self.intercept_ = np.float64(intercept)
+        self.feature_columns = list(feature_columns)
+        if self.coef_.ndim != 1 or len(self.coef_) != len(self.feature_columns):
+            raise ValueError(f"{self.coef_.shape} coefficients for {len(self.feature_columns)} feature columns")
+        self.n_features_in_ = len(self.coef_)
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has shape {X.shape}; the model expects {self.n_features_in_} features")
+        # Like the scikit-learn estimator, refuse NaN/inf rather than return a NaN price
+        bad = np.flatnonzero(~np.isfinite(X).all(axis=1))
+        if len(bad):
+            raise ValueError(f"Input contains NaN or infinity in {len(bad)} row(s) (first: row {bad[0]})")
+        return X @ self.coef_ + self.intercept_
+
+
+def _probe_rows(n_features, n_rows=256, seed=0):
+    """Rows for the export parity check: zeros, one-hots and random values across magnitudes."""
+    rng = np.random.default_rng(seed)
+    scales = 10.0 ** rng.integers(-3, 4, (n_rows, 1))
+    return np.vstack([np.zeros(n_features), np.eye(n_features), rng.normal(size=(n_rows, n_features)) * scales])
+
+
+def export_linear_model(model, feature_columns, path, source_sha256=None):
+    """Write model's coefficients to a JSON artifact at path; returns the loaded LinearModel.
+
+    Raises ValueError if the estimator is not a single-output linear model or
+    if the exported scorer does not reproduce model.predict exactly.
+    """
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    intercept = np.asarray(model.intercept_, dtype=np.float64)
+    if coef.ndim != 1 or intercept.ndim != 0:
+        raise ValueError(f"Expected a single-output linear model, got coef_ of shape {coef.shape}")
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None and list(names) != list(feature_columns):
+        raise ValueError("feature_columns do not match the order the model was fitted on")
+
+    linear = LinearModel(coef, intercept, feature_columns)
+    probe = _probe_rows(linear.n_features_in_)
+    if not np.array_equal(linear.predict(probe), model.predict(probe)):
+        raise ValueError("The NumPy scorer does not reproduce model.predict exactly")
+
+    artifact = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "estimator": type(model).__name__,
+        "source_sha256": source_sha256,
+        "feature_columns": linear.feature_columns,
+        "coef": [float(c) for c in coef],
+        "intercept": float(intercept),
+    }
+    with open(path, "w") as f:
+        json.dump(artifact, f, indent=2)
+        f.write("\n")
+    return load_linear_model(path)
+
+
+def load_linear_model(path):
+    """LinearModel from an artifact written by export_linear_model."""
+    with open(path) as f:
+        artifact = json.load(f)
+    if artifact.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} is not a {ARTIFACT_FORMAT} artifact")
+    if artifact.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"{path}: unsupported {ARTIFACT_FORMAT} version {artifact.get('version')!r}")
+    return LinearModel(artifact["coef"], artifact["intercept"], artifact["feature_columns"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a pickled linear model to a pickle-free JSON artifact.")
+    parser.add_argument("model", help="joblib pickle of the fitted estimator")
+    parser.add_argument("feature_columns", help="joblib pickle of the feature column order")
+    parser.add_argument("output", help="JSON artifact to write")
+    args = parser.parse_args()
+
+    import joblib
+
+    with open(args.model, "rb") as f:
+        source_sha256 = hashlib.sha256(f.read()).hexdigest()
+    linear = export_linear_model(joblib.load(args.model), list(joblib.load(args.feature_columns)), args.output,
+                                 source_sha256=source_sha256)
+    print(f"Wrote {args.output}: {linear.n_features_in_} coefficients, predict output identical to {args.model}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columns of the Best XI player pool
+PLAYER_COLUMNS = [
+    "player_name", "role", "is_overseas",
+    "runs_scored", "innings_batted", "balls_faced", "strike_rate", "fours", "sixes",
+    "wickets", "balls_bowled", "runs_conceded", "economy", "dot_balls"
+]
+
+PLAYER_ROLES = ["Batsman", "Bowler", "All-Rounder", "Wicketkeeper"]
+COUNT_COLUMNS = ["runs_scored", "innings_batted", "balls_faced", "fours", "sixes",
+                 "wickets", "balls_bowled", "runs_conceded", "dot_balls"]
+RATE_COLUMNS = ["strike_rate", "economy"]
+
+# Canonical in-memory dtypes of the player pool columns
+PLAYER_DTYPES = {
+    "player_name": object,
+    "role": pd.CategoricalDtype(PLAYER_ROLES),
+    "is_overseas": np.int8,
+    **{c: np.int32 for c in COUNT_COLUMNS},
+    **{c: np.float32 for c in RATE_COLUMNS},
+}
+
+# Map role names used in the scraped JSON files to the app's role names
+ROLE_MAPPING = {
+    'Batter': 'Batsman',
+    'Batsman': 'Batsman',
+    'Allrounder': 'All-Rounder',
+    'All Rounder': 'All-Rounder',
+    'Bowler': 'Bowler'
+}
+
+# Bundled reference datasets
+REFERENCE_FILES = {
+    "ODI": "ODI_output.json",
+    "Test": "test_output.json",
+}
+
+
+def empty_pool():
+    """An empty player pool with the expected columns."""
+    return pd.DataFrame(columns=PLAYER_COLUMNS).astype(PLAYER_DTYPES)
+
+
+def to_player_schema(players_df):
+    """Copy of players_df with PLAYER_COLUMNS cast to PLAYER_DTYPES; other columns are kept as they are.
+
+    Missing or empty counts become 0 and missing rates NaN. Raises ValueError
+    for unknown roles and for values that do not fit their column.
+    """
+    players = players_df.copy()
+    for column in COUNT_COLUMNS + ["is_overseas"]:
+        players[column] = pd.to_numeric(players[column]).fillna(0) if column in players else 0
+    for column in RATE_COLUMNS:
+        players[column] = pd.to_numeric(players[column]) if column in players else np.nan
+    if "role" in players:
+        unknown = set(players["role"].dropna()) - set(PLAYER_ROLES)
+        if unknown:
+            raise ValueError(f"Unknown roles: {', '.join(sorted(map(str, unknown)))}")
+    counts = players[COUNT_COLUMNS + ["is_overseas"]]
+    if (counts < 0).any().any() or (counts > np.iinfo(np.int32).max).any().any() or (counts % 1 != 0).any().any():
+        raise ValueError("Counts must be whole numbers between 0 and 2**31 - 1")
+    if not players["is_overseas"].isin([0, 1]).all():
+        raise ValueError("is_overseas must be 0 or 1")
+    return players.astype({c: t for c, t in PLAYER_DTYPES.items() if c in players})
+
+
+def memory_report(players_df):
+    """Per-column memory (deep) of a player frame next to what the same data takes untyped.
+
+    The baseline is the schema-less frame this replaced: object strings and
+    64-bit numbers.
+    """
+    rows = []
+    for column in players_df.columns:
+        values = players_df[column]
+        baseline = values.astype(object) if isinstance(values.dtype, pd.CategoricalDtype) or \
+            values.dtype == object else values.astype(np.float64)
+        rows.append({"column": column, "dtype": str(values.dtype),
+                     "bytes": int(values.memory_usage(deep=True, index=False)),
+                     "untyped_bytes": int(baseline.memory_usage(deep=True, index=False))})
+    return pd.DataFrame(rows, columns=["column", "dtype", "bytes", "untyped_bytes"])
+
+
+def normalize_roles(roles):
+    """Map raw role names onto Batsman / Bowler / All-Rounder (unknown names pass through)."""
+    return roles.map(lambda role: ROLE_MAPPING.get(role, role))
+
+
+def load_players_json(path):
+    """Load a scraped player JSON file into a DataFrame with normalized roles."""
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    players = pd.DataFrame(data)
+    if 'role' in players:
+        players['role'] = normalize_roles(players['role'])
+    return players
+
+
+def load_reference_datasets(root="."):
+    """Load every bundled reference file that exists under root ({"ODI": df, "Test": df})."""
+    from .store import load_players
+    datasets = {}
+    for name, path in REFERENCE_FILES.items():
+        full_path = os.path.join(root, path)
+        if os.path.exists(full_path):
+            datasets[name] = load_players(full_path)
+    return datasets
+
@@ -0,0 +1,342 @@
+import uuid
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache
+from .players import PLAYER_DTYPES, PLAYER_ROLES, empty_pool, to_player_schema
+from .team import ROLE_MINIMUMS
+
+# Source of a row in the pool; part of the key next to player_name
+FORMAT_COLUMN = "format"
+KEY_COLUMNS = ["player_name", "role", "is_overseas"]
+
+# (frame, groups) of unedited pools, shared by every pool that attached the same layers
+_shared_frames = LRUCache(max_entries=16)
+
+
+def _frame_groups(players_df):
+    """(role, is_overseas) -> sorted row positions of a typed player frame."""
+    codes = players_df["role"].cat.codes.to_numpy()
+    overseas = players_df["is_overseas"].to_numpy()
+    groups = {}
+    for code, role in enumerate(PLAYER_ROLES):
+        for flag in (0, 1):
+            members = np.flatnonzero((codes == code) & (overseas == flag))
+            if len(members):
+                groups[(role, flag)] = members
+    return groups
+
+
+def _stack(parts):
+    """Concatenate (frame, groups) parts into one frame with groups shifted to its row positions."""
+    if not parts:
+        return empty_pool().assign(**{FORMAT_COLUMN: pd.Series(dtype=object)}), {}
+    if len(parts) == 1:
+        data = parts[0][0].reset_index(drop=True)
+    else:
+        data = pd.concat([frame for frame, _ in parts], ignore_index=True)
+    data[FORMAT_COLUMN] = data[FORMAT_COLUMN].astype("category")  # parts have different format categories
+    groups, offset = defaultdict(list), 0
+    for frame, part_groups in parts:
+        for key, members in part_groups.items():
+            groups[key].append(members + offset)
+        offset += len(frame)
+    return data, {key: np.concatenate(members) for key, members in groups.items()}
+
+
+class ReferenceLayer:
+    """Read-only player table (one bundled dataset) that pools attach instead of copying.
+
+    Build one per dataset per process (e.g. behind st.cache_resource) and pass
+    the same object to every session's PlayerPool.attach; nothing modifies it.
+    """
+
+    def __init__(self, name, players_df):
+        frame = to_player_schema(players_df).drop_duplicates("player_name", keep="last").reset_index(drop=True)
+        frame[FORMAT_COLUMN] = pd.Categorical.from_codes(np.zeros(len(frame), dtype=np.int8), categories=[name])
+        self.name = name
+        self.token = uuid.uuid4().hex  # tells rebuilt layers of the same name apart
+        self.frame = frame
+        self.positions = {player: i for i, player in enumerate(frame["player_name"])}
+        self.groups = _frame_groups(frame)
+
+    def __len__(self):
+        return len(self.frame)
+
+
+class PlayerPool:
+    """Session player pool keyed by (player_name, format) with upsert semantics.
+
+    The pool is an overlay: attached ReferenceLayers are shared with every
+    other session and only referenced here, with removed rows recorded as
+    hidden positions. The session's own rows (uploads, manual additions) live
+    in preallocated NumPy arrays that double when full, so adding rows is
+    amortized O(1) instead of a pd.concat of the whole pool. Rows are indexed
+    by (role, is_overseas) for filters and the optimizer's role masks.
+    frame() materializes a DataFrame once per change (version); a pool with
+    no edits of its own returns the shared frame of its layers.
+
+    Every batch is cast to the canonical PLAYER_DTYPES on the way in; roles
+    are stored as int8 category codes.
+    """
+
+    def __init__(self, capacity=256):
+        self._initial_capacity = capacity
+        self.version = 0
+        self.clear()
+
+    def clear(self):
+        self._capacity = self._initial_capacity
+        self._size = 0
+        self._columns = {}  # name -> array of length capacity
+        self._rows = {}  # (player_name, format) -> position
+        self._index = defaultdict(set)  # (role, is_overseas) -> positions
+        self._layers = {}  # name -> attached ReferenceLayer
+        self._hidden = {}  # layer name -> layer positions removed from this pool or overridden by own rows
+        self._frame = None
+        self.version += 1
+
+    def __len__(self):
+        return self.shared_rows + self._size
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def shared_rows(self):
+        """Rows that come from attached reference layers rather than this pool's own storage."""
+        return sum(len(layer) - len(self._hidden[name]) for name, layer in self._layers.items())
+
+    def _overridden(self, layer):
+        """Positions in layer of players this pool holds its own row for under the layer's format."""
+        return {layer.positions[name] for name, format_type in self._rows
+                if format_type == layer.name and name in layer.positions}
+
+    def attach(self, layer):
+        """Add a shared ReferenceLayer's rows without copying them; returns the number of rows added.
+
+        Attaching the same layer again brings back rows removed from it.
+        """
+        hidden = self._overridden(layer)
+        current = self._layers.get(layer.name)
+        before = len(current) - len(self._hidden[layer.name]) if current is not None else 0
+        changed = current is not layer or self._hidden[layer.name] != hidden
+        self._layers[layer.name] = layer
+        self._hidden[layer.name] = hidden
+        if changed:
+            self.version += 1
+        return max(len(layer) - len(hidden) - before, 0)
+
+    def detach(self, name):
+        """Drop an attached reference layer (and what was removed from it) from this pool."""
+        if self._layers.pop(name, None) is not None:
+            del self._hidden[name]
+            self.version += 1
+
+    def _grow(self, needed):
+        capacity = self._capacity
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        for name, values in self._columns.items():
+            grown = np.empty(capacity, dtype=values.dtype) if values.dtype == object else \
+                np.zeros(capacity, dtype=values.dtype)
+            grown[:self._size] = values[:self._size]
+            self._columns[name] = grown
+        self._capacity = capacity
+
+    def _column(self, name, values):
+        """Storage for a column, created or widened (int -> float -> object) to hold values."""
+        current = self._columns.get(name)
+        dtype = values.dtype if values.dtype.kind in "biuf" else np.dtype(object)
+        if current is None and self._size and dtype.kind in "biu":
+            dtype = np.dtype(np.float64)  # earlier rows had no value for this column: NaN, not 0
+        if current is None:
+            current = np.empty(self._capacity, dtype=object) if dtype == object else \
+                np.full(self._capacity, np.nan if dtype.kind == "f" else 0, dtype=dtype)
+            if dtype == object:
+                current[:self._size] = None
+        elif current.dtype != object and np.result_type(current.dtype, dtype) != current.dtype:
+            current = current.astype(np.result_type(current.dtype, dtype) if dtype != object else object)
+        self._columns[name] = current
+        return current
+
+    def _index_key(self, position):
+        code = self._columns["role"][position]
+        return PLAYER_ROLES[code] if code >= 0 else None, int(self._columns["is_overseas"][position])
+
+    def upsert(self, players_df, format_type):
+        """Insert new (player_name, format) rows and overwrite existing ones; returns (inserted, updated).
+
+        Raises ValueError for missing key columns or values that don't fit the schema (see to_player_schema).
+        """
+        if players_df.empty:
+            return 0, 0
+        missing = [c for c in KEY_COLUMNS if c not in players_df.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        players_df = to_player_schema(players_df)
+        names = players_df["player_name"].tolist()
+        if len(set(names)) < len(names):
+            players_df = players_df.drop_duplicates("player_name", keep="last")
+            names = players_df["player_name"].tolist()
+        keys = [(name, format_type) for name in names]
+        positions = np.empty(len(keys), dtype=np.int64)
+        inserted = 0
+        for i, key in enumerate(keys):
+            position = self._rows.get(key)
+            if position is None:
+                position = self._size + inserted
+                inserted += 1
+            positions[i] = position
+        existing = positions < self._size
+        self._grow(self._size + inserted)
+
+        changed = inserted > 0
+        old_index_keys = {int(p): self._index_key(p) for p in positions[existing]}
+        values = {**{c: players_df[c].to_numpy() for c in players_df.columns},
+                  "role": players_df["role"].cat.codes.to_numpy(),
+                  FORMAT_COLUMN: np.full(len(keys), format_type, dtype=object)}
+        for name, column_values in values.items():
+            column = self._column(name, column_values)
+            if not changed and existing.any():
+                old = column[positions[existing]]
+                new = column_values[existing]
+                changed = not np.array_equal(old.astype(object), new.astype(object))
+            column[positions] = column_values
+        if inserted:
+            # Columns this batch doesn't have are missing (NaN / None) for its new rows, as with pd.concat
+            new_positions = positions[~existing]
+            for name in self._columns.keys() - values.keys():
+                column = self._column(name, np.array([np.nan]))
+                column[new_positions] = None if column.dtype == object else np.nan
+
+        layer = self._layers.get(format_type)
+        if layer is not None:
+            # Own rows replace the shared rows of the same (player_name, format)
+            overridden = {layer.positions[name] for name in names if name in layer.positions}
+            if not overridden <= self._hidden[format_type]:
+                self._hidden[format_type] |= overridden
+                changed = True
+
+        if not changed:
+            return 0, 0
+        for key, position in zip(keys, positions):
+            self._rows.setdefault(key, int(position))
+        self._size += inserted
+        for position in positions.tolist():
+            old_key = old_index_keys.get(position)
+            if old_key is not None:
+                self._index[old_key].discard(position)
+            self._index[self._index_key(position)].add(position)
+        self.version += 1
+        return inserted, int(existing.sum())
+
+    def _delete(self, position):
+        """Drop one own row by moving the last row into its place."""
+        last = self._size - 1
+        self._index[self._index_key(position)].discard(position)
+        del self._rows[(self._columns["player_name"][position], self._columns[FORMAT_COLUMN][position])]
+        if position != last:
+            moved = self._index_key(last)
+            self._index[moved].discard(last)
+            self._index[moved].add(position)
+            for values in self._columns.values():
+                values[position] = values[last]
+            self._rows[(self._columns["player_name"][position], self._columns[FORMAT_COLUMN][position])] = position
+        for values in self._columns.values():
+            if values.dtype == object:
+                values[last] = None
+        self._size = last
+
+    def remove(self, names, formats=None):
+        """Remove players by name (only from the given formats, if any); returns the number of rows removed.
+
+        Rows of attached layers are hidden from this pool only.
+        """
+        names = set(names)
+        removed = 0
+        for name, layer in self._layers.items():
+            if formats is None or name in formats:
+                hidden = {layer.positions[player] for player in names if player in layer.positions}
+                removed += len(hidden - self._hidden[name])
+                self._hidden[name] |= hidden
+        for key in [k for k in self._rows if k[0] in names and (formats is None or k[1] in formats)]:
+            self._delete(self._rows[key])
+            removed += 1
+        if removed:
+            self.version += 1
+        return removed
+
+    def _own_part(self):
+        # Copies, so frames handed out earlier never change underneath their fingerprints
+        data = pd.DataFrame({name: values[:self._size].copy() for name, values in self._columns.items()})
+        data["role"] = pd.Categorical.from_codes(data["role"], dtype=PLAYER_DTYPES["role"])
+        groups = {key: np.array(sorted(members), dtype=np.int64) for key, members in self._index.items() if members}
+        return data, groups
+
+    def _layer_part(self, layer):
+        hidden = self._hidden[layer.name]
+        if not hidden:
+            return layer.frame, layer.groups
+        keep = np.ones(len(layer), dtype=bool)
+        keep[list(hidden)] = False
+        remap = np.cumsum(keep) - 1
+        groups = {key: remap[members[keep[members]]] for key, members in layer.groups.items()}
+        return layer.frame[keep], {key: members for key, members in groups.items() if len(members)}
+
+    def _build(self):
+        layers = list(self._layers.values())
+        if self._size == 0 and not any(self._hidden.values()):
+            if len(layers) == 1:
+                return layers[0].frame, layers[0].groups
+            if layers:
+                return _shared_frames.get_or_compute(
+                    tuple(layer.token for layer in layers),
+                    lambda: _stack([(layer.frame, layer.groups) for layer in layers])
+                )
+        parts = [self._layer_part(layer) for layer in layers]
+        if self._size:
+            parts.append(self._own_part())
+        return _stack(parts)
+
+    def frame(self):
+        """The pool as a DataFrame (same object until the next change); treat it as read-only."""
+        if self._frame is None or self._frame[0] != self.version:
+            self._frame = (self.version, *self._build())
+        return self._frame[1]
+
+    def _groups(self):
+        self.frame()
+        return self._frame[2]
+
+    def storage_bytes(self):
+        """Bytes of this pool's own column arrays, spare capacity included (object columns count their
+        pointers only); attached layers are shared and not counted."""
+        return sum(values.nbytes for values in self._columns.values())
+
+    def rows_where(self, roles=None, overseas=None):
+        """Sorted positions (matching frame() rows) for the given roles and overseas flag, via the index."""
+        members = [positions for (role, is_overseas), positions in self._groups().items()
+                   if (roles is None or role in roles) and (overseas is None or is_overseas == overseas)]
+        return np.sort(np.concatenate(members)) if members else np.array([], dtype=np.int64)
+
+    def roles(self):
+        """Roles present in the pool, in first-seen order."""
+        return list(dict.fromkeys(role for role, _ in self._groups()))
+
+    def overseas_count(self):
+        return sum(len(members) for (_, is_overseas), members in self._groups().items() if is_overseas)
+
+    def role_masks(self):
+        """Boolean role masks over frame() rows, as team_arrays builds them, without scanning roles."""
+        masks = {}
+        for _, role, _ in ROLE_MINIMUMS:
+            mask = np.zeros(len(self), dtype=bool)
+            mask[self.rows_where([role])] = True
+            masks[role] = mask
+        return masks
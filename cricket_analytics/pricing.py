@@ -0,0 +1,452 @@
+import numpy as np
+import pandas as pd
+
+MODEL_PATH = 'ipl_price_model.pkl'
+FEATURE_COLUMNS_PATH = 'feature_columns.pkl'
+# Pickle-free export of the same Ridge model (python -m cricket_analytics.linear)
+LINEAR_MODEL_PATH = 'ipl_price_model.json'
+
+# Inputs expected by engineer_features / engineer_features_batch
+PLAYER_INPUT_COLUMNS = [
+    'country', 'age', 'role',
+    'ipl_matches', 'ipl_runs', 'ipl_avg', 'ipl_sr', 'ipl_sixes',
+    'ipl_wickets', 'ipl_economy', 'ipl_bowl_sr',
+    't20_matches', 't20_runs', 't20_avg', 't20_sr',
+    't20_wickets', 't20_economy', 't20_bowl_sr'
+]
+
+TOP_NATIONS = ['england', 'australia', 'south africa', 'new zealand']
+
+
+# Helper functions for feature engineering (from price_predictor.py)
+def get_nationality_premium(country):
+    country = country.lower()
+    if country == 'india':
+        return 1.0
+    elif country in TOP_NATIONS:
+        return 0.8
+    else:
+        return 0.6
+
+
+def get_experience_tier(ipl_matches):
+    if ipl_matches == 0:
+        return 0
+    elif ipl_matches <= 20:
+        return 1
+    elif ipl_matches <= 50:
+        return 2
+    else:
+        return 3
+
+
+def get_age_bracket(age):
+    if age < 25:
+        return 'young_prospect'
+    elif age <= 32:
+        return 'prime'
+    else:
+        return 'veteran'
+
+
+def calculate_batting_impact(ipl_runs, ipl_sr, ipl_avg, t20_runs, t20_sr, t20_avg):
+    if ipl_runs > 0:
+        ipl_sr = ipl_sr if ipl_sr > 0 else 100
+        ipl_avg = ipl_avg if ipl_avg > 0 else 15
+        return (ipl_runs ** 0.7) * (ipl_sr / 130) * (ipl_avg / 25)
+    elif t20_runs > 0:
+        t20_sr = t20_sr if t20_sr > 0 else 100
+        t20_avg = t20_avg if t20_avg > 0 else 15
+        return (t20_runs ** 0.7) * (t20_sr / 130) * (t20_avg / 25) * 0.6
+    else:
+        return 0.0
+
+
+def calculate_bowling_impact(ipl_wkts, ipl_econ, ipl_sr, t20_wkts, t20_econ, t20_sr):
+    if ipl_wkts > 0:
+        ipl_econ = ipl_econ if ipl_econ > 0 else 8.5
+        ipl_sr = ipl_sr if ipl_sr > 0 else 20
+        return (ipl_wkts ** 0.7) * (8 / ipl_econ) * (20 / ipl_sr)
+    elif t20_wkts > 0:
+        t20_econ = t20_econ if t20_econ > 0 else 8.5
+        t20_sr = t20_sr if t20_sr > 0 else 20
+        return (t20_wkts ** 0.7) * (8 / t20_econ) * (20 / t20_sr) * 0.6
+    else:
+        return 0.0
+
+
+def calculate_consistency(ipl_runs, ipl_avg, ipl_sr, ipl_wkts, ipl_econ, ipl_bowl_sr):
+    if ipl_runs > 50:
+        ipl_avg = ipl_avg if ipl_avg > 0 else 15
+        ipl_sr = ipl_sr if ipl_sr > 0 else 100
+        return ipl_avg / (ipl_sr / 100)
+    elif ipl_wkts > 5:
+        ipl_econ = ipl_econ if ipl_econ > 0 else 8.5
+        ipl_bowl_sr = ipl_bowl_sr if ipl_bowl_sr > 0 else 20
+        return 1 / (ipl_econ * ipl_bowl_sr / 100)
+    else:
+        return 0.0
+
+
+def calculate_role_specialization(role, bat_impact, bowl_impact):
+    if role == 'batsman':
+        return bat_impact * 1.2
+    elif role == 'bowler':
+        return bowl_impact * 1.2
+    elif role == 'batting-allrounder':
+        return (bat_impact * 0.7) + (bowl_impact * 0.3)
+    elif role == 'bowling-allrounder':
+        return (bat_impact * 0.3) + (bowl_impact * 0.7)
+    elif role == 'wk-batsman':
+        return bat_impact * 1.1 + 10
+    else:
+        return bat_impact + bowl_impact
+
+
+def engineer_features(player_data):
+    """Engineer all 17 features from player data"""
+    
+    # Feature 1: Nationality Premium
+    nationality_premium = get_nationality_premium(player_data['country'])
+    
+    # Feature 2: Role Demand Score (simplified - use fixed value)
+    role_demand_score = 0.2  # Average value
+    
+    # Feature 3: Experience Tier
+    experience_tier = get_experience_tier(player_data['ipl_matches'])
+    
+    # Feature 4: International Exposure
+    international_exposure = np.log1p(player_data['t20_matches'])
+    
+    # Feature 5: Uncapped Flag
+    uncapped_flag = 1 if (player_data['ipl_runs'] == 0 and player_data['ipl_wickets'] == 0) else 0
+    
+    # Feature 6: Batting Impact Index
+    batting_impact_index = calculate_batting_impact(
+        player_data['ipl_runs'], player_data['ipl_sr'], player_data['ipl_avg'],
+        player_data['t20_runs'], player_data['t20_sr'], player_data['t20_avg']
+    )
+    
+    # Feature 7: Bowling Impact Index
+    bowling_impact_index = calculate_bowling_impact(
+        player_data['ipl_wickets'], player_data['ipl_economy'], player_data['ipl_bowl_sr'],
+        player_data['t20_wickets'], player_data['t20_economy'], player_data['t20_bowl_sr']
+    )
+    
+    # Feature 8: Consistency Metric
+    consistency_metric = calculate_consistency(
+        player_data['ipl_runs'], player_data['ipl_avg'], player_data['ipl_sr'],
+        player_data['ipl_wickets'], player_data['ipl_economy'], player_data['ipl_bowl_sr']
+    )
+    
+    # Feature 9: Role Specialization Score
+    role_specialization_score = calculate_role_specialization(
+        player_data['role'], batting_impact_index, bowling_impact_index
+    )
+    
+    # Feature 10: Form Momentum
+    form_momentum = batting_impact_index + bowling_impact_index
+    
+    # Feature 11: Star Player Flag
+    star_player_flag = 1 if (player_data['ipl_runs'] > 2000 or 
+                             player_data['ipl_wickets'] > 100 or 
+                             player_data['t20_matches'] > 50) else 0
+    
+    # Feature 12: Explosive Factor
+    explosive_factor = 1 if (player_data['ipl_sr'] > 150 or 
+                             player_data['ipl_sixes'] > 50 or
+                             (player_data['ipl_economy'] > 0 and player_data['ipl_economy'] < 7.5)) else 0
+    
+    # Feature 13: Retention Proxy
+    retention_proxy = 1 if player_data['ipl_matches'] > 20 else 0
+    
+    # Feature 14: Hype Prospect
+    hype_prospect = 1 if (uncapped_flag and player_data['age'] < 25 and 
+                          (player_data['t20_sr'] > 140 or player_data['t20_wickets'] > 20)) else 0
+    
+    # Feature 15-17: Age Brackets (one-hot encoded)
+    age_bracket = get_age_bracket(player_data['age'])
+    age_prime = 1 if age_bracket == 'prime' else 0
+    age_veteran = 1 if age_bracket == 'veteran' else 0
+    age_young_prospect = 1 if age_bracket == 'young_prospect' else 0
+    
+    # Return features in correct order
+    features = [
+        nationality_premium,
+        role_demand_score,
+        experience_tier,
+        international_exposure,
+        uncapped_flag,
+        batting_impact_index,
+        bowling_impact_index,
+        consistency_metric,
+        role_specialization_score,
+        form_momentum,
+        star_player_flag,
+        explosive_factor,
+        retention_proxy,
+        hype_prospect,
+        age_prime,
+        age_veteran,
+        age_young_prospect
+    ]
+    
+    return features
+
+
+def _batting_impact_batch(runs, sr, avg, t20_runs, t20_sr, t20_avg):
+    ipl = (runs ** 0.7) * (np.where(sr > 0, sr, 100) / 130) * (np.where(avg > 0, avg, 15) / 25)
+    t20 = (t20_runs ** 0.7) * (np.where(t20_sr > 0, t20_sr, 100) / 130) * (np.where(t20_avg > 0, t20_avg, 15) / 25) * 0.6
+    return np.where(runs > 0, ipl, np.where(t20_runs > 0, t20, 0.0))
+
+
+def _bowling_impact_batch(wkts, econ, sr, t20_wkts, t20_econ, t20_sr):
+    ipl = (wkts ** 0.7) * (8 / np.where(econ > 0, econ, 8.5)) * (20 / np.where(sr > 0, sr, 20))
+    t20 = (t20_wkts ** 0.7) * (8 / np.where(t20_econ > 0, t20_econ, 8.5)) * (20 / np.where(t20_sr > 0, t20_sr, 20)) * 0.6
+    return np.where(wkts > 0, ipl, np.where(t20_wkts > 0, t20, 0.0))
+
+
+def engineer_features_batch(players):
+    """Vectorized engineer_features over a DataFrame; returns an (n, 17) float array."""
+    missing = [c for c in PLAYER_INPUT_COLUMNS if c not in players.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    col = {c: players[c].to_numpy(dtype=np.float64) for c in PLAYER_INPUT_COLUMNS if c not in ('country', 'role')}
+    country = players['country'].astype(str).str.lower().to_numpy()
+    role = players['role'].astype(str).to_numpy()
+    n = len(players)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        nationality_premium = np.where(country == 'india', 1.0, np.where(np.isin(country, TOP_NATIONS), 0.8, 0.6))
+        role_demand_score = np.full(n, 0.2)
+        ipl_matches = col['ipl_matches']
+        experience_tier = np.select([ipl_matches == 0, ipl_matches <= 20, ipl_matches <= 50], [0, 1, 2], 3)
+        international_exposure = np.log1p(col['t20_matches'])
+        uncapped = (col['ipl_runs'] == 0) & (col['ipl_wickets'] == 0)
+
+        batting_impact_index = _batting_impact_batch(
+            col['ipl_runs'], col['ipl_sr'], col['ipl_avg'],
+            col['t20_runs'], col['t20_sr'], col['t20_avg']
+        )
+        bowling_impact_index = _bowling_impact_batch(
+            col['ipl_wickets'], col['ipl_economy'], col['ipl_bowl_sr'],
+            col['t20_wickets'], col['t20_economy'], col['t20_bowl_sr']
+        )
+
+        ipl_avg = np.where(col['ipl_avg'] > 0, col['ipl_avg'], 15)
+        ipl_sr = np.where(col['ipl_sr'] > 0, col['ipl_sr'], 100)
+        ipl_econ = np.where(col['ipl_economy'] > 0, col['ipl_economy'], 8.5)
+        ipl_bowl_sr = np.where(col['ipl_bowl_sr'] > 0, col['ipl_bowl_sr'], 20)
+        consistency_metric = np.where(
+            col['ipl_runs'] > 50, ipl_avg / (ipl_sr / 100),
+            np.where(col['ipl_wickets'] > 5, 1 / (ipl_econ * ipl_bowl_sr / 100), 0.0)
+        )
+
+        role_specialization_score = np.select(
+            [role == 'batsman', role == 'bowler', role == 'batting-allrounder',
+             role == 'bowling-allrounder', role == 'wk-batsman'],
+            [batting_impact_index * 1.2, bowling_impact_index * 1.2,
+             (batting_impact_index * 0.7) + (bowling_impact_index * 0.3),
+             (batting_impact_index * 0.3) + (bowling_impact_index * 0.7),
+             batting_impact_index * 1.1 + 10],
+            batting_impact_index + bowling_impact_index
+        )
+        form_momentum = batting_impact_index + bowling_impact_index
+
+    star_player_flag = (col['ipl_runs'] > 2000) | (col['ipl_wickets'] > 100) | (col['t20_matches'] > 50)
+    explosive_factor = ((col['ipl_sr'] > 150) | (col['ipl_sixes'] > 50) |
+                        ((col['ipl_economy'] > 0) & (col['ipl_economy'] < 7.5)))
+    retention_proxy = ipl_matches > 20
+    age = col['age']
+    hype_prospect = uncapped & (age < 25) & ((col['t20_sr'] > 140) | (col['t20_wickets'] > 20))
+    age_young_prospect = age < 25
+    age_prime = ~age_young_prospect & (age <= 32)
+    age_veteran = ~age_young_prospect & ~age_prime
+
+    # Same column order as engineer_features
+    return np.column_stack([
+        nationality_premium,
+        role_demand_score,
+        experience_tier,
+        international_exposure,
+        uncapped,
+        batting_impact_index,
+        bowling_impact_index,
+        consistency_metric,
+        role_specialization_score,
+        form_momentum,
+        star_player_flag,
+        explosive_factor,
+        retention_proxy,
+        hype_prospect,
+        age_prime,
+        age_veteran,
+        age_young_prospect
+    ]).astype(np.float64)
+
+
+# Inputs of the season-stats price model (best_price_model.pkl)
+SEASON_STAT_COLUMNS = [
+    'season', 'runs_scored', 'balls_faced', 'fours', 'sixes', 'innings_batted', 'strike_rate',
+    'balls_bowled', 'runs_conceded', 'wickets', 'dot_balls', 'economy', 'boundary_percent',
+    'wicket_strike_rate', 'impact_score'
+]
+CURRENT_SEASON = 2025
+
+
+def season_stats_features(players):
+    """Approximate season-stats model inputs from the IPL fields of the price form.
+
+    The form has no fours, dot balls or innings, so fours and dot balls are 0,
+    innings come from runs / average and balls from the rates; impact_score is
+    the batting + bowling impact index.
+    """
+    missing = [c for c in PLAYER_INPUT_COLUMNS if c not in players.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    col = {c: players[c].to_numpy(dtype=np.float64) for c in PLAYER_INPUT_COLUMNS if c not in ('country', 'role')}
+    runs, wickets = col['ipl_runs'], col['ipl_wickets']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        balls_faced = np.where(col['ipl_sr'] > 0, runs / col['ipl_sr'] * 100, 0.0)
+        balls_bowled = wickets * col['ipl_bowl_sr']
+        features = pd.DataFrame({
+            'season': np.full(len(players), CURRENT_SEASON),
+            'runs_scored': runs,
+            'balls_faced': balls_faced,
+            'fours': np.zeros(len(players)),
+            'sixes': col['ipl_sixes'],
+            'innings_batted': np.where(col['ipl_avg'] > 0, np.round(runs / col['ipl_avg']), 0.0),
+            'strike_rate': col['ipl_sr'],
+            'balls_bowled': balls_bowled,
+            'runs_conceded': balls_bowled / 6 * col['ipl_economy'],
+            'wickets': wickets,
+            'dot_balls': np.zeros(len(players)),
+            'economy': col['ipl_economy'],
+            'boundary_percent': np.where(balls_faced > 0, col['ipl_sixes'] / balls_faced * 100, 0.0),
+            'wicket_strike_rate': col['ipl_bowl_sr'],
+            'impact_score': (
+                _batting_impact_batch(runs, col['ipl_sr'], col['ipl_avg'], col['t20_runs'], col['t20_sr'], col['t20_avg'])
+                + _bowling_impact_batch(wickets, col['ipl_economy'], col['ipl_bowl_sr'],
+                                        col['t20_wickets'], col['t20_economy'], col['t20_bowl_sr'])
+            ),
+        })
+    return features[SEASON_STAT_COLUMNS]
+
+
+# Best XI pool role -> price form role
+POOL_PRICE_ROLES = {
+    'Batsman': 'batsman',
+    'Bowler': 'bowler',
+    'All-Rounder': 'batting-allrounder',
+    'Wicketkeeper': 'wk-batsman',
+}
+
+
+def pool_price_inputs(players, age=28):
+    """Approximate price form inputs (PLAYER_INPUT_COLUMNS) for Best XI pool players.
+
+    The pool's stats fill the IPL fields, and its matches also count as T20I
+    caps for international exposure. Matches are innings batted (or bowling
+    innings at 36 balls each, if more), averages are per innings (the pool has
+    no not-outs), local players are Indian and overseas ones from an
+    unranked nation, and everyone is age (the pool has no ages). Missing or
+    non-finite rates count as 0, so every row can be priced.
+    """
+    runs = players['runs_scored'].to_numpy(dtype=np.float64)
+    innings = players['innings_batted'].to_numpy(dtype=np.float64)
+    balls_bowled = players['balls_bowled'].to_numpy(dtype=np.float64)
+    wickets = players['wickets'].to_numpy(dtype=np.float64)
+    matches = np.maximum(innings, np.ceil(balls_bowled / 36))
+    zeros = np.zeros(len(players))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        inputs = pd.DataFrame({
+            'country': np.where(players['is_overseas'].to_numpy() > 0, 'other', 'india'),
+            'age': np.full(len(players), age),
+            'role': players['role'].astype(str).map(POOL_PRICE_ROLES).fillna('batsman').to_numpy(),
+            'ipl_matches': matches,
+            'ipl_runs': runs,
+            'ipl_avg': np.where(innings > 0, runs / innings, 0.0),
+            'ipl_sr': np.nan_to_num(players['strike_rate'].to_numpy(dtype=np.float64), posinf=0.0, neginf=0.0),
+            'ipl_sixes': players['sixes'].to_numpy(dtype=np.float64),
+            'ipl_wickets': wickets,
+            'ipl_economy': np.nan_to_num(players['economy'].to_numpy(dtype=np.float64), posinf=0.0, neginf=0.0),
+            'ipl_bowl_sr': np.where(wickets > 0, balls_bowled / wickets, 0.0),
+            't20_matches': matches,
+            't20_runs': zeros, 't20_avg': zeros, 't20_sr': zeros,
+            't20_wickets': zeros, 't20_economy': zeros, 't20_bowl_sr': zeros,
+        })
+    return inputs[PLAYER_INPUT_COLUMNS]
+
+
+def load_price_model(model_path=MODEL_PATH, feature_columns_path=FEATURE_COLUMNS_PATH):
+    """Load the fitted price model and its feature column order."""
+    import joblib
+    return joblib.load(model_path), joblib.load(feature_columns_path)
+
+
+def predict_prices(model, features):
+    """Predicted auction price in crores for each feature row (one predict call)."""
+    log_price = model.predict(np.atleast_2d(features))
+    return np.clip(np.expm1(log_price), 0.2, 30)
+
+
+def price_category(predicted_price):
+    if predicted_price > 10:
+        return "💎 Premium Player"
+    elif predicted_price >= 2:
+        return "⭐ Core Player"
+    else:
+        return "🔧 Base Player"
+
+
+def prediction_record(features, predicted_price):
+    """The features, price (Cr), ±25% band and category of one prediction."""
+    return {
+        'features': features,
+        'predicted_price': predicted_price,
+        'lower_bound': predicted_price * 0.75,
+        'upper_bound': predicted_price * 1.25,
+        'category': price_category(predicted_price),
+    }
+
+
+def player_key(player_data):
+    """Hashable form of player_data; inputs that engineer the same features give the same key."""
+    return tuple(
+        str(player_data[c]).lower() if c == 'country' else str(player_data[c]) if c == 'role'
+        else float(player_data[c])
+        for c in PLAYER_INPUT_COLUMNS
+    )
+
+
+def predict_player(model, player_data):
+    """Price one player; returns the features, price (Cr), ±25% band and category."""
+    features = engineer_features(player_data)
+    return prediction_record(features, predict_prices(model, np.array(features).reshape(1, -1))[0])
+
+
+def impact_breakdown(player_data):
+    """IPL vs T20I batting and bowling impact, each scored on its own."""
+    p = player_data
+    return {
+        'IPL Batting': calculate_batting_impact(p['ipl_runs'], p['ipl_sr'], p['ipl_avg'], 0, 0, 0),
+        'T20I Batting': calculate_batting_impact(0, 0, 0, p['t20_runs'], p['t20_sr'], p['t20_avg']),
+        'IPL Bowling': calculate_bowling_impact(p['ipl_wickets'], p['ipl_economy'], p['ipl_bowl_sr'], 0, 0, 0),
+        'T20I Bowling': calculate_bowling_impact(0, 0, 0, p['t20_wickets'], p['t20_economy'], p['t20_bowl_sr']),
+    }
+
+
+def price_players(model, players):
+    """Score a DataFrame of players and return it with price columns appended."""
+    return with_prices(players, predict_prices(model, engineer_features_batch(players)))
+
+
+def with_prices(players, prices):
+    """players with predicted price, ±25% band and category columns appended."""
+    priced = players.copy()
+    priced['predicted_price_cr'] = prices
+    priced['lower_bound_cr'] = prices * 0.75
+    priced['upper_bound_cr'] = prices * 1.25
+    priced['category'] = pd.Series(prices, index=priced.index).map(price_category)
+    return priced
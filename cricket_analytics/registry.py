@@ -0,0 +1,366 @@
+"""Versioned price model registry with hot reload and shadow scoring.
+
+    python -m cricket_analytics.registry list
+    python -m cricket_analytics.registry register ridge-v2 models/ridge_v2.pkl --features engineered
+    python -m cricket_analytics.registry promote ridge-v2
+    python -m cricket_analytics.registry shadow xgb-v1      (or --none)
+
+The manifest (model_registry.json) lists every version's artifact, feature
+set, target transform and sha256, and names the live version and an
+optional shadow. Artifacts ending in .json are pickle-free linear models
+(cricket_analytics.linear) and load without joblib or scikit-learn; any
+other path is a joblib pickle. A version's artifact never changes: a
+different file means a new version. Every process holding a ModelRegistry notices manifest
+changes and swaps models without a restart. The new models are loaded in
+full before one reference is replaced, so in-flight requests finish on the
+model they started with, and a version that fails to load leaves the
+current one live.
+
+The shadow model scores the same batches as the live one on a background
+thread. Only live prices are returned. shadow_report() compares latency and
+disagreement between the two. At most max_shadow_pending batches wait for
+the shadow at once; batches beyond that are dropped (and counted) rather
+than queued, so a slow shadow cannot hold on to unbounded input frames.
+"""
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .linear import load_linear_model
+from .pricing import (
+    FEATURE_COLUMNS_PATH, LINEAR_MODEL_PATH, MODEL_PATH, engineer_features, engineer_features_batch, prediction_record,
+    price_category, season_stats_features
+)
+
+MANIFEST_PATH = "model_registry.json"
+
+# Feature set name -> function from a DataFrame of price-form inputs to model input
+FEATURE_SETS = {
+    "engineered": engineer_features_batch,
+    "season_stats": season_stats_features,
+}
+
+# Target transform name -> function from raw model output to price in crores
+TARGETS = {
+    "log1p_price": lambda output: np.clip(np.expm1(output), 0.2, 30),
+    "price": lambda output: np.clip(output, 0.2, 30),
+}
+
+# Used when there is no manifest: the bundled Ridge model, served from its pickle-free export, no shadow
+DEFAULT_MANIFEST = {
+    "live": "ridge-v1-np",
+    "shadow": None,
+    "versions": {
+        "ridge-v1": {"path": MODEL_PATH, "feature_columns": FEATURE_COLUMNS_PATH,
+                     "features": "engineered", "target": "log1p_price"},
+        "ridge-v1-np": {"path": LINEAR_MODEL_PATH, "features": "engineered", "target": "log1p_price"},
+    },
+}
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ModelVersion:
+    """One loaded registry version: the estimator plus how to feed it and read its output."""
+
+    def __init__(self, name, spec, root="."):
+        if spec.get("features") not in FEATURE_SETS:
+            raise ValueError(f"{name}: unknown feature set {spec.get('features')!r}")
+        if spec.get("target") not in TARGETS:
+            raise ValueError(f"{name}: unknown target {spec.get('target')!r}")
+        self.name = name
+        self.path = os.path.join(root, spec["path"])
+        self.features = spec["features"]
+        self.target = spec["target"]
+        self.sha256 = file_sha256(self.path)
+        if spec.get("sha256") and spec["sha256"] != self.sha256:
+            raise ValueError(f"{name}: {spec['path']} does not match the registered sha256")
+        if self.path.endswith(".json"):
+            # Pickle-free linear artifact: the feature order travels inside it
+            self.model = load_linear_model(self.path)
+        else:
+            import joblib
+
+            self.model = joblib.load(self.path)
+        if spec.get("feature_columns"):
+            import joblib
+
+            columns = joblib.load(os.path.join(root, spec["feature_columns"]))
+            expected = getattr(self.model, "n_features_in_", len(columns))
+            if len(columns) != expected:
+                raise ValueError(f"{name}: {len(columns)} feature columns for a model fitted on {expected}")
+
+    def price(self, players):
+        """Predicted prices (Cr) for a DataFrame of price-form inputs."""
+        return TARGETS[self.target](self.model.predict(FEATURE_SETS[self.features](players)))
+
+    def finite_rows(self, players):
+        """Mask of the rows whose features are all finite (missing or negative stats can give NaN)."""
+        return np.isfinite(FEATURE_SETS[self.features](players)).all(axis=1)
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if len(values) else float("nan")
+
+
+class ModelRegistry:
+    """Serves prices from the live version, shadow-scores with the candidate and hot-reloads the manifest."""
+
+    def __init__(self, manifest_path=MANIFEST_PATH, check_interval=2.0, shadow_history=500, max_shadow_pending=4):
+        self.manifest_path = manifest_path
+        self.root = os.path.dirname(os.path.abspath(manifest_path))
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_error = None
+        self.shadow_error = None
+        self._lock = threading.Lock()
+        self._checked = 0.0
+        self._mtime = None
+        self._versions = {}  # (name, sha256) -> ModelVersion, so unchanged versions are not reloaded
+        self._state = None  # (live ModelVersion, shadow ModelVersion or None), swapped as one reference
+        self._shadow_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scoring")
+        self._shadow_batches = deque(maxlen=shadow_history)
+        self._shadow_slots = threading.BoundedSemaphore(max_shadow_pending)
+        self._shadow_dropped = 0
+        self.refresh(force=True)
+
+    # Manifest
+
+    def read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return DEFAULT_MANIFEST
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def write_manifest(self, manifest):
+        """Replace the manifest atomically and reload it in this process."""
+        # A temp file of its own per writer, so concurrent promotions never clobber each other before the rename
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.root, delete=False,
+                                         prefix=os.path.basename(self.manifest_path) + ".", suffix=".tmp") as f:
+            json.dump(manifest, f, indent=2)
+            f.write("\n")
+        try:
+            os.replace(f.name, self.manifest_path)
+        except BaseException:
+            os.remove(f.name)
+            raise
+        self.refresh(force=True)
+
+    def _load(self, name, manifest):
+        spec = manifest["versions"].get(name)
+        if spec is None:
+            raise KeyError(f"Unknown model version {name!r}")
+        key = (name, spec.get("sha256") or file_sha256(os.path.join(self.root, spec["path"])))
+        if key not in self._versions:
+            self._versions[key] = ModelVersion(name, spec, self.root)
+        return self._versions[key]
+
+    def refresh(self, force=False):
+        """Reload the manifest if it changed; returns True when the live or shadow model was swapped."""
+        with self._lock:
+            self._checked = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.manifest_path)
+            except OSError:
+                mtime = None
+            if not force and mtime == self._mtime:
+                return False
+            self._mtime = mtime
+            try:
+                manifest = self.read_manifest()
+                live = self._load(manifest["live"], manifest)
+            except Exception as e:
+                if self._state is None:
+                    raise
+                self.last_error = f"{type(e).__name__}: {e}"  # keep serving the current version
+                return False
+            shadow = None
+            self.shadow_error = None
+            if manifest.get("shadow"):
+                try:
+                    shadow = self._load(manifest["shadow"], manifest)
+                except Exception as e:
+                    self.shadow_error = f"{manifest['shadow']}: {type(e).__name__}: {e}"
+            previous = self._state
+            self._state = (live, shadow)
+            self.last_error = None
+            if previous is not None and (previous[0] is not live or previous[1] is not shadow):
+                self.reloads += 1
+                if previous[1] is not shadow:
+                    self._shadow_batches.clear()
+                    self._shadow_dropped = 0
+            return previous is None or previous != self._state
+
+    def _current(self):
+        if time.monotonic() - self._checked > self.check_interval:
+            self.refresh()
+        return self._state
+
+    def live(self):
+        return self._current()[0]
+
+    def shadow(self):
+        return self._current()[1]
+
+    # Scoring
+
+    def price(self, players):
+        """Live prices (Cr) for a DataFrame of price-form inputs; the shadow scores the same batch."""
+        live, shadow = self._current()
+        start = time.perf_counter()
+        prices = live.price(players)
+        live_ms = (time.perf_counter() - start) * 1000
+        if shadow is not None:
+            if self._shadow_slots.acquire(blocking=False):
+                self._shadow_pool.submit(self._score_shadow, shadow, live.name, players, prices, live_ms)
+            else:
+                # The shadow is behind; skip this batch instead of queueing it
+                self._shadow_dropped += 1
+        return prices
+
+    def price_finite(self, players):
+        """(live prices for the rows the live model can score, mask of those rows); never NaN prices."""
+        scorable = self.live().finite_rows(players)
+        prices = self.price(players[scorable]) if scorable.any() else np.empty(0)
+        return prices, scorable
+
+    def predict_player(self, player_data):
+        """predict_player() for one form dict, priced by the live version."""
+        return prediction_record(engineer_features(player_data), self.price(pd.DataFrame([player_data]))[0])
+
+    def _score_shadow(self, shadow, live_name, players, live_prices, live_ms):
+        start = time.perf_counter()
+        try:
+            shadow_prices = shadow.price(players)
+        except Exception as e:
+            self._shadow_batches.append({"live": live_name, "shadow": shadow.name, "rows": len(players),
+                                         "live_ms": live_ms, "error": f"{type(e).__name__}: {e}"})
+            return
+        finally:
+            self._shadow_slots.release()
+        self._shadow_batches.append({
+            "live": live_name, "shadow": shadow.name, "rows": len(players), "live_ms": live_ms,
+            "shadow_ms": (time.perf_counter() - start) * 1000,
+            "live_prices": np.asarray(live_prices, dtype=np.float64),
+            "shadow_prices": np.asarray(shadow_prices, dtype=np.float64),
+        })
+
+    def wait_for_shadow(self):
+        """Block until every submitted shadow batch is scored (for reports right after scoring)."""
+        self._shadow_pool.submit(lambda: None).result()
+
+    def shadow_report(self):
+        """Latency and disagreement between live and shadow over the recent shadowed batches."""
+        live, shadow = self._current()
+        batches = list(self._shadow_batches)
+        scored = [b for b in batches if "error" not in b]
+        report = {"live": live.name, "shadow": shadow.name if shadow else None, "shadow_error": self.shadow_error,
+                  "batches": len(batches), "errors": len(batches) - len(scored), "dropped": self._shadow_dropped,
+                  "rows": sum(b["rows"] for b in scored)}
+        if not scored:
+            return report
+        live_prices = np.concatenate([b["live_prices"] for b in scored])
+        shadow_prices = np.concatenate([b["shadow_prices"] for b in scored])
+        diff = shadow_prices - live_prices
+        live_ms = [b["live_ms"] for b in scored]
+        shadow_ms = [b["shadow_ms"] for b in scored]
+        report.update({
+            "live_p50_ms": _percentile(live_ms, 50), "live_p95_ms": _percentile(live_ms, 95),
+            "shadow_p50_ms": _percentile(shadow_ms, 50), "shadow_p95_ms": _percentile(shadow_ms, 95),
+            "mean_abs_diff_cr": float(np.abs(diff).mean()),
+            "mean_diff_cr": float(diff.mean()),
+            "median_abs_pct_diff": float(np.median(np.abs(diff) / live_prices) * 100),
+            # Shadow price inside the live ±25% band
+            "within_band": float(((shadow_prices >= live_prices * 0.75) & (shadow_prices <= live_prices * 1.25)).mean()),
+            "same_category": float(np.mean([price_category(a) == price_category(b)
+                                            for a, b in zip(live_prices, shadow_prices)])),
+            "correlation": float(np.corrcoef(live_prices, shadow_prices)[0, 1]) if len(diff) > 1 else float("nan"),
+        })
+        return report
+
+    def status(self):
+        live, shadow = self._current()
+        manifest = self.read_manifest()
+        return {
+            "manifest": self.manifest_path if os.path.exists(self.manifest_path) else None,
+            "live": {"version": live.name, "sha256": live.sha256, "features": live.features},
+            "shadow": {"version": shadow.name, "sha256": shadow.sha256, "features": shadow.features}
+            if shadow else None,
+            "versions": sorted(manifest["versions"]),
+            "reloads": self.reloads,
+            "last_error": self.last_error,
+            "shadow_error": self.shadow_error,
+        }
+
+    # Manifest edits (picked up by every process watching the manifest)
+
+    def register(self, name, path, features="engineered", target="log1p_price", feature_columns=None):
+        manifest = self.read_manifest()
+        if name in manifest["versions"]:
+            raise ValueError(f"Version {name!r} already exists; register the new artifact under a new name")
+        spec = {"path": os.path.relpath(os.path.abspath(path), self.root), "features": features, "target": target,
+                "sha256": file_sha256(path)}
+        if feature_columns:
+            spec["feature_columns"] = os.path.relpath(os.path.abspath(feature_columns), self.root)
+        ModelVersion(name, spec, self.root)  # refuse artifacts that don't load
+        self.write_manifest({**manifest, "versions": {**manifest["versions"], name: spec}})
+
+    def promote(self, name):
+        """Make name the live version (the previous live one is kept registered for rollback)."""
+        manifest = self.read_manifest()
+        self._load(name, manifest)  # fail here rather than in every watching process
+        shadow = None if manifest.get("shadow") == name else manifest.get("shadow")
+        self.write_manifest({**manifest, "live": name, "shadow": shadow})
+
+    def set_shadow(self, name):
+        manifest = self.read_manifest()
+        if name is not None and name not in manifest["versions"]:
+            raise KeyError(f"Unknown model version {name!r}")
+        self.write_manifest({**manifest, "shadow": name})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage price model versions.")
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list")
+    register = commands.add_parser("register")
+    register.add_argument("name")
+    register.add_argument("path")
+    register.add_argument("--features", choices=list(FEATURE_SETS), default="engineered")
+    register.add_argument("--target", choices=list(TARGETS), default="log1p_price")
+    register.add_argument("--feature-columns")
+    promote = commands.add_parser("promote")
+    promote.add_argument("name")
+    shadow = commands.add_parser("shadow")
+    shadow.add_argument("name", nargs="?")
+    shadow.add_argument("--none", action="store_true")
+    args = parser.parse_args()
+
+    registry = ModelRegistry(args.manifest)
+    if args.command == "register":
+        registry.register(args.name, args.path, args.features, args.target, args.feature_columns)
+    elif args.command == "promote":
+        registry.promote(args.name)
+    elif args.command == "shadow":
+        registry.set_shadow(None if args.none else args.name)
+    print(json.dumps(registry.status(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
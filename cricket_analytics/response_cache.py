@@ -0,0 +1,218 @@
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = "chat_cache.sqlite3"
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+GEMINI_EMBEDDING_MODEL = "text-embedding-004"
+
+# Words that change nothing about the answer
+_FILLER_WORDS = {"please", "pls", "plz", "hey", "hi", "hello", "kindly", "thanks", "thank", "you"}
+# Punctuation, except a decimal point between digits ("7.5" is not "75")
+_NON_WORD = re.compile(r"(?:(?!(?<=\d)\.(?=\d))[^\w\s])+")
+# Comparisons change the answer, so they become words before punctuation is dropped (longest first)
+_COMPARISONS = [("<=", " le "), (">=", " ge "), ("!=", " ne "), ("==", " eq "), ("=", " eq "),
+                ("<", " lt "), (">", " gt "), ("≤", " le "), ("≥", " ge ")]
+
+
+def normalize_question(question):
+    """Case, punctuation, whitespace and filler-word insensitive form of a question.
+
+    Comparison operators and decimal points are kept: "SR > 150" and "SR < 150"
+    are different questions.
+    """
+    text = unicodedata.normalize("NFKC", question).casefold()
+    for operator, word in _COMPARISONS:
+        text = text.replace(operator, word)
+    words = _NON_WORD.sub(" ", text).split()
+    return " ".join(w for w in words if w not in _FILLER_WORDS)
+
+
+def ngram_embedder(dim=512):
+    """Local embedding: hashed character trigrams of the normalized question, L2-normalized.
+
+    Catches typos and reordered words without an API call; not a true semantic model.
+    """
+    def embed(text):
+        text = f"  {normalize_question(text)}  "
+        vector = np.zeros(dim, dtype=np.float32)
+        for i in range(len(text) - 2):
+            vector[zlib.crc32(text[i:i + 3].encode()) % dim] += 1.0
+        return vector
+    return embed
+
+
+def gemini_embedder(client, model=GEMINI_EMBEDDING_MODEL):
+    """Embedding via the Gemini embeddings API (one call per cache miss)."""
+    def embed(text):
+        response = client.models.embed_content(model=model, contents=text)
+        return np.asarray(response.embeddings[0].values, dtype=np.float32)
+    return embed
+
+
+class ResponseCache:
+    """Persistent (SQLite) cache of chatbot replies with TTL and LRU eviction.
+
+    Lookups try an exact question match, then the normalized question, then
+    (when an embed function is given) the most similar cached question with
+    cosine similarity >= similarity_threshold. Replies are keyed per model.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=2000, ttl=DEFAULT_TTL,
+                 embed=None, similarity_threshold=0.92):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self.hits = {"exact": 0, "normalized": 0, "semantic": 0}
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY,
+                model TEXT NOT NULL,
+                question TEXT NOT NULL,
+                normalized TEXT NOT NULL,
+                reply TEXT NOT NULL,
+                embedding BLOB,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS responses_question ON responses (model, question);
+            CREATE UNIQUE INDEX IF NOT EXISTS responses_normalized ON responses (model, normalized);
+            CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+        """)
+        self._vectors = None  # (model, ids, unit vectors) for the semantic tier, loaded lazily
+        self._last_embedding = (None, None)  # a miss is usually followed by put() of the same question
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _expire(self, now):
+        if self.ttl is not None:
+            removed = self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)).rowcount
+            if removed:
+                self._db.commit()
+                self._vectors = None
+
+    def _hit(self, row_id, tier, now):
+        self._db.execute("UPDATE responses SET last_used = ?, hit_count = hit_count + 1 WHERE id = ?", (now, row_id))
+        self._db.commit()
+        self.hits[tier] += 1
+
+    def _load_vectors(self, model):
+        rows = self._db.execute(
+            "SELECT id, embedding FROM responses WHERE model = ? AND embedding IS NOT NULL", (model,)
+        ).fetchall()
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32)
+        ids = np.array([r[0] for r in rows], dtype=np.int64)
+        vectors = np.stack([np.frombuffer(r[1], dtype=np.float32) for r in rows])
+        return ids, vectors
+
+    @staticmethod
+    def _unit(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _embed(self, question):
+        if self.embed is None:
+            return None
+        if self._last_embedding[0] == question:
+            return self._last_embedding[1]
+        try:
+            vector = self._unit(self.embed(question))
+        except Exception:
+            return None  # the semantic tier is best-effort; exact/normalized still work
+        self._last_embedding = (question, vector)
+        return vector
+
+    def get(self, question, model):
+        """Cached reply and the tier that matched ("exact", "normalized", "semantic"), or (None, None)."""
+        now = time.time()
+        normalized = normalize_question(question)
+        with self._lock:
+            self._expire(now)
+            row = self._db.execute(
+                "SELECT id, reply FROM responses WHERE model = ? AND question = ?", (model, question)
+            ).fetchone()
+            if row:
+                self._hit(row[0], "exact", now)
+                return row[1], "exact"
+            row = normalized and self._db.execute(
+                "SELECT id, reply FROM responses WHERE model = ? AND normalized = ?", (model, normalized)
+            ).fetchone()
+            if row:
+                self._hit(row[0], "normalized", now)
+                return row[1], "normalized"
+
+        query = self._embed(question) if normalized else None
+        if query is not None:
+            with self._lock:
+                if self._vectors is None or self._vectors[0] != model:
+                    self._vectors = (model, *self._load_vectors(model))
+                _, ids, vectors = self._vectors
+                if len(ids) and vectors.shape[1] == query.shape[0]:
+                    scores = vectors @ query
+                    best = int(np.argmax(scores))
+                    if scores[best] >= self.similarity_threshold:
+                        row = self._db.execute("SELECT reply FROM responses WHERE id = ?", (int(ids[best]),)).fetchone()
+                        if row:
+                            self._hit(int(ids[best]), "semantic", now)
+                            return row[0], "semantic"
+
+        with self._lock:
+            self.misses += 1
+        return None, None
+
+    def put(self, question, model, reply):
+        now = time.time()
+        normalized = normalize_question(question)
+        if not normalized:
+            return  # nothing left to match on ("hi!", "thanks")
+        vector = self._embed(question)
+        embedding = None if vector is None else vector.tobytes()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (model, question, normalized, reply, embedding, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (model, question, normalized, reply, embedding, now, now),
+            )
+            overflow = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._db.execute(
+                    "DELETE FROM responses WHERE id IN (SELECT id FROM responses ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+            self._db.commit()
+            self._vectors = None
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._vectors = None
+
+    def stats(self):
+        hits = sum(self.hits.values())
+        lookups = hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": hits,
+            **{f"{tier}_hits": count for tier, count in self.hits.items()},
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,179 @@
+import difflib
+import math
+import re
+from collections import defaultdict
+
+import pandas as pd
+
+# Extra index terms per role so "batters", "keeper" or "all rounders" find the right players
+ROLE_TERMS = {
+    "Batsman": ["batsman", "batter", "batting", "bat"],
+    "Bowler": ["bowler", "bowling", "bowl"],
+    "All-Rounder": ["allrounder", "all", "rounder", "batting", "bowling"],
+    "Wicketkeeper": ["wicketkeeper", "keeper", "wk", "batsman", "batter", "batting"],
+}
+BOWLING_TERMS = {"bowler", "bowling", "bowl", "wickets", "economy", "death", "spinner", "pacer"}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "best", "by", "compare", "does", "for", "from", "has", "have",
+    "how", "in", "is", "me", "of", "on", "or", "show", "stats", "tell", "than", "the", "to", "top",
+    "vs", "was", "what", "which", "who", "with", "about", "many", "much", "his", "their", "ipl",
+}
+NAME_WEIGHT = 3.0
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text).lower())
+
+
+def _stat(row, column):
+    """Numeric stat from a record; missing or NaN counts as 0."""
+    value = pd.to_numeric(row.get(column), errors="coerce")
+    return 0.0 if pd.isna(value) else float(value)
+
+
+def player_record(row, source):
+    """One-line stat summary of a player, as injected into the prompt."""
+    runs, innings, wickets = _stat(row, "runs_scored"), _stat(row, "innings_batted"), _stat(row, "wickets")
+    parts = [f"{row['player_name']} ({row.get('role', 'Unknown')}, {source})"]
+    if innings:
+        parts.append(
+            f"{runs:.0f} runs in {innings:.0f} innings, avg {runs / innings:.1f}, SR {_stat(row, 'strike_rate'):.1f}, "
+            f"{_stat(row, 'fours'):.0f} fours, {_stat(row, 'sixes'):.0f} sixes"
+        )
+    if wickets:
+        parts.append(
+            f"{wickets:.0f} wickets, economy {_stat(row, 'economy'):.2f}, "
+            f"bowling avg {_stat(row, 'runs_conceded') / wickets:.1f}"
+        )
+    if _stat(row, "is_overseas"):
+        parts.append("overseas")
+    return "; ".join(parts)
+
+
+def _signature(row):
+    # str() so NaN compares equal to NaN
+    return tuple((column, str(value)) for column, value in row.items())
+
+
+class PlayerIndex:
+    """In-memory inverted index over player names, roles and sources.
+
+    Players are grouped by source ("ODI", "Test", "Your pool"); update_source
+    re-indexes only the players of that source that were added, removed or
+    changed since the last call.
+    """
+
+    def __init__(self):
+        self._docs = {}  # doc id -> (record, name tokens, other tokens, runs, wickets)
+        self._postings = defaultdict(set)  # token -> doc ids
+        self._sources = defaultdict(dict)  # source -> player name -> (doc id, row signature)
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def _add(self, row, source):
+        doc_id = self._next_id
+        self._next_id += 1
+        name_tokens = set(tokenize(row["player_name"]))
+        other_tokens = set(ROLE_TERMS.get(row.get("role"), tokenize(row.get("role", ""))))
+        other_tokens.update(tokenize(source))
+        if _stat(row, "is_overseas"):
+            other_tokens.add("overseas")
+        self._docs[doc_id] = (
+            player_record(row, source), name_tokens, other_tokens, _stat(row, "runs_scored"), _stat(row, "wickets"),
+        )
+        for token in name_tokens | other_tokens:
+            self._postings[token].add(doc_id)
+        return doc_id
+
+    def _remove(self, doc_id):
+        _, name_tokens, other_tokens, _, _ = self._docs.pop(doc_id)
+        for token in name_tokens | other_tokens:
+            postings = self._postings[token]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[token]
+
+    def update_source(self, source, players_df):
+        """Sync the players of one source with players_df; returns (added, removed) counts."""
+        known = self._sources[source]
+        rows = {}
+        if not players_df.empty:
+            for row in players_df.to_dict("records"):
+                if not pd.isna(row["player_name"]):
+                    rows[str(row["player_name"])] = row
+
+        removed = 0
+        for name in list(known):
+            doc_id, signature = known[name]
+            if name not in rows or _signature(rows[name]) != signature:
+                self._remove(doc_id)
+                del known[name]
+                removed += 1
+
+        added = 0
+        for name, row in rows.items():
+            if name not in known:
+                known[name] = (self._add(row, source), _signature(row))
+                added += 1
+        return added, removed
+
+    def _query_tokens(self, question):
+        tokens = []
+        for token in tokenize(question):
+            if token in STOPWORDS:
+                continue
+            if token not in self._postings and token.endswith("s") and token[:-1] in self._postings:
+                token = token[:-1]  # bowlers -> bowler
+            if token not in self._postings and len(token) >= 4:
+                close = difflib.get_close_matches(token, self._postings.keys(), n=1, cutoff=0.85)
+                token = close[0] if close else token  # kohlii -> kohli
+            tokens.append(token)
+        return tokens
+
+    def search(self, question, k=5):
+        """Top-k (score, record) pairs for a question; name matches dominate role matches."""
+        tokens = self._query_tokens(question)
+        if not tokens or not self._docs:
+            return []
+
+        n_docs = len(self._docs)
+        scores = defaultdict(float)
+        for token in set(tokens):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + n_docs / len(postings))
+            for doc_id in postings:
+                in_name = token in self._docs[doc_id][1]
+                scores[doc_id] += idf * (NAME_WEIGHT if in_name else 1.0)
+
+        # Among equally relevant players, prefer the most prolific for the kind of question asked
+        stat = 4 if BOWLING_TERMS.intersection(tokens) else 3
+        ranked = sorted(scores, key=lambda d: (-scores[d], -self._docs[d][stat]))[:k]
+        return [(scores[d], self._docs[d][0]) for d in ranked]
+
+
+def build_reference_index(datasets):
+    """Index every reference dataset ({"ODI": df, "Test": df}) once."""
+    index = PlayerIndex()
+    for source, players_df in datasets.items():
+        index.update_source(f"{source} data", players_df)
+    return index
+
+
+def retrieve_context(question, indexes, k=5):
+    """Prompt block with the k most relevant player records across indexes ("" if none match)."""
+    hits = [hit for index in indexes if index is not None for hit in index.search(question, k)]
+    if not hits:
+        return ""
+    hits.sort(key=lambda hit: -hit[0])
+    lines = "\n".join(f"- {record}" for _, record in hits[:k])
+    return (
+        "Player data from this app's datasets (career stats; prefer these numbers over memory "
+        f"for these players):\n{lines}"
+    )
+
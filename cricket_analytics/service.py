@@ -0,0 +1,337 @@
+"""Headless HTTP scoring service for price prediction and Best XI selection.
+
+    python -m cricket_analytics.service --port 8600
+
+Endpoints (JSON in, JSON out):
+
+    GET  /health
+    GET  /models          live / shadow versions and the shadow report
+    POST /predict         one player_data dict (the Price Predictor form fields)
+    POST /predict/batch   {"players": [player_data, ...]}
+    POST /best-xi         {"players": [...] | "dataset": "ODI" | "Test",
+                           "format": "T20", "constraints": {...}, "backend": "dp", "top_k": 1}
+                          constraints may set "budget" and "max_player_price" (crores);
+                          the pool is then priced with the live model; top_k is 1..20
+
+Prices come from the model registry (model_registry.json): promoting a
+version there swaps the model in the running service, and a shadow version
+scores the same batches in the background. Single /predict calls are
+micro-batched: requests arriving within a few milliseconds of each other
+share one registry price call. Solver calls run on a
+bounded thread pool so a burst of /best-xi requests cannot starve the
+event loop.
+"""
+import argparse
+import asyncio
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import tornado.web
+
+from .cache import cached_compute_impact, cached_pool_prices, cached_team, cached_top_k, pool_fingerprint
+from .players import load_reference_datasets
+from .pricing import PLAYER_INPUT_COLUMNS, price_category
+from .registry import MANIFEST_PATH, ModelRegistry
+from .team import SOLVERS, IncrementalTeamSelector, TeamConstraints, has_price_limits
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _price_record(price):
+    price = float(price)
+    return {
+        "predicted_price": price,
+        "lower_bound": price * 0.75,
+        "upper_bound": price * 1.25,
+        "category": price_category(price),
+    }
+
+
+class PredictionBatcher:
+    """Collects single-player predictions and scores them in one predict call.
+
+    price is a function from a DataFrame of players to prices (ModelRegistry.price).
+    """
+
+    def __init__(self, price, max_batch=256, max_wait_ms=2.0):
+        self.price = price
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.requests = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def predict(self, player_data):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((player_data, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            batch = [await self.queue.get()]
+            deadline = asyncio.get_running_loop().time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self._score(batch)
+
+    def _score(self, batch):
+        self.batches += 1
+        self.requests += len(batch)
+        try:
+            prices = self.price(pd.DataFrame([p for p, _ in batch]))
+        except Exception:
+            # One bad row must not fail its neighbours: fall back to scoring one by one
+            for player_data, future in batch:
+                try:
+                    price = self.price(pd.DataFrame([player_data]))[0]
+                    future.set_result(_price_record(price))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+        for (_, future), price in zip(batch, prices):
+            future.set_result(_price_record(price))
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, service):
+        self.service = service
+
+    def write_json(self, payload, status=200):
+        self.set_status(status)
+        self.set_header("Content-Type", "application/json")
+        self.finish(json.dumps(payload, default=_json_default))
+
+    def body_json(self):
+        try:
+            return json.loads(self.request.body or b"null")
+        except json.JSONDecodeError as e:
+            raise tornado.web.HTTPError(400, reason=f"Invalid JSON: {e}")
+
+    def write_error(self, status_code, **kwargs):
+        error = kwargs.get("exc_info", (None, None))[1]
+        message = error.reason if isinstance(error, tornado.web.HTTPError) and error.reason else self._reason
+        self.write_json({"error": message}, status=status_code)
+
+
+# Same ceilings as the Best XI page: team size up to 30, up to 20 alternative XIs
+MAX_TEAM_SIZE = 30
+MAX_TOP_K = 20
+PRICE_FIELDS = ("budget", "max_player_price")
+
+
+def _parse_constraints(raw):
+    """TeamConstraints from a request's "constraints" object; 400 on unknown keys or bad values.
+
+    Counts must be whole numbers in 0..MAX_TEAM_SIZE; budget and max_player_price
+    positive numbers or null.
+    """
+    if not isinstance(raw, dict):
+        raise tornado.web.HTTPError(400, reason="Expected \"constraints\" to be a JSON object")
+    unknown = sorted(set(raw) - set(TeamConstraints._fields))
+    if unknown:
+        raise tornado.web.HTTPError(400, reason=f"Unknown constraints: {', '.join(unknown)}")
+    values = {}
+    for key, value in raw.items():
+        if value is None and key in PRICE_FIELDS:
+            values[key] = None
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise tornado.web.HTTPError(400, reason=f"Invalid constraints: {key} must be a number")
+        if key in PRICE_FIELDS:
+            if value <= 0:
+                raise tornado.web.HTTPError(400, reason=f"Invalid constraints: {key} must be positive")
+            values[key] = float(value)
+        elif value != int(value) or not 0 <= value <= MAX_TEAM_SIZE:
+            raise tornado.web.HTTPError(
+                400, reason=f"Invalid constraints: {key} must be a whole number from 0 to {MAX_TEAM_SIZE}")
+        else:
+            values[key] = int(value)
+    return TeamConstraints(**values)
+
+
+def _parse_top_k(value):
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_TOP_K:
+        raise tornado.web.HTTPError(400, reason=f"top_k must be a whole number from 1 to {MAX_TOP_K}")
+    return value
+
+
+def _validate_player(player_data):
+    if not isinstance(player_data, dict):
+        raise tornado.web.HTTPError(400, reason="Expected a JSON object with player fields")
+    missing = [c for c in PLAYER_INPUT_COLUMNS if c not in player_data]
+    if missing:
+        raise tornado.web.HTTPError(400, reason=f"Missing columns: {', '.join(missing)}")
+
+
+class HealthHandler(BaseHandler):
+    def get(self):
+        self.write_json({
+            "status": "ok",
+            "model_version": self.service.registry.live().name,
+            "prediction_batches": self.service.batcher.batches,
+            "prediction_requests": self.service.batcher.requests,
+        })
+
+
+class ModelsHandler(BaseHandler):
+    def get(self):
+        self.write_json({**self.service.registry.status(), "shadow_report": self.service.registry.shadow_report()})
+
+
+class PredictHandler(BaseHandler):
+    async def post(self):
+        player_data = self.body_json()
+        _validate_player(player_data)
+        try:
+            result = await self.service.batcher.predict(player_data)
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, reason=str(e))
+        self.write_json(result)
+
+
+class PredictBatchHandler(BaseHandler):
+    def post(self):
+        body = self.body_json()
+        players = body.get("players") if isinstance(body, dict) else None
+        if not isinstance(players, list) or not players:
+            raise tornado.web.HTTPError(400, reason="Expected {\"players\": [player_data, ...]}")
+        try:
+            prices = self.service.registry.price(pd.DataFrame(players))
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, reason=str(e))
+        self.write_json({"predictions": [_price_record(p) for p in prices]})
+
+
+class BestXIHandler(BaseHandler):
+    async def post(self):
+        body = self.body_json()
+        if not isinstance(body, dict):
+            raise tornado.web.HTTPError(400, reason="Expected a JSON object")
+
+        format_type = body.get("format", "T20")
+        backend = body.get("backend", "dp")
+        if backend not in SOLVERS:
+            raise tornado.web.HTTPError(400, reason=f"Unknown backend {backend!r}")
+        constraints = _parse_constraints(body.get("constraints", {}))
+        top_k = _parse_top_k(body.get("top_k", 1))
+
+        if "dataset" in body:
+            if body["dataset"] not in self.service.datasets:
+                raise tornado.web.HTTPError(400, reason=f"Unknown dataset {body['dataset']!r}")
+            players = self.service.datasets[body["dataset"]]
+        elif isinstance(body.get("players"), list):
+            players = pd.DataFrame(body["players"])
+        else:
+            raise tornado.web.HTTPError(400, reason="Send either \"players\" or \"dataset\"")
+
+        try:
+            result = await self.service.solve(players, format_type, backend, constraints, top_k)
+        except (KeyError, ValueError) as e:
+            raise tornado.web.HTTPError(400, reason=f"Invalid player pool: {e}")
+        self.write_json(result)
+
+
+class ScoringService:
+    """Holds the model registry, the reference datasets, the batcher and the solver pool."""
+
+    def __init__(self, registry, datasets=None, solver_workers=4, max_batch=256, max_wait_ms=2.0):
+        self.registry = registry
+        self.datasets = datasets or {}
+        self.batcher = PredictionBatcher(registry.price, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self.solver_pool = ThreadPoolExecutor(max_workers=solver_workers, thread_name_prefix="best-xi")
+
+    def _solve_sync(self, players, format_type, backend, constraints, top_k):
+        fingerprint = pool_fingerprint(players)
+        # A purse or price cap prices the pool with the live model; teams then depend on its version too
+        prices, team_key = None, fingerprint
+        if has_price_limits(constraints):
+            version = self.registry.live().name
+            prices = cached_pool_prices(players, version, self.registry.price, fingerprint)
+            team_key = (fingerprint, version)
+        selector = []
+
+        def get_selector():
+            # Only built on a cache miss
+            if not selector:
+                scored = cached_compute_impact(players, format_type, fingerprint)
+                selector.append(IncrementalTeamSelector(scored, format_type, backend=backend, scored=True,
+                                                        prices=prices))
+            return selector[0]
+
+        team, violated = cached_team(team_key, format_type, backend, constraints,
+                                     lambda: get_selector().solve(constraints))
+        result = {
+            "team": team.to_dict("records"),
+            "total_impact": float(team["impact"].sum()),
+            "violated": violated,
+        }
+        if prices is not None:
+            result["total_price_cr"] = float(team["predicted_price_cr"].sum())
+        if top_k > 1 and not violated:
+            alternatives = cached_top_k(team_key, format_type, constraints, top_k,
+                                        lambda: get_selector().top_k(constraints, top_k))
+            result["alternatives"] = [
+                {"total_impact": total, "players": alt["player_name"].tolist(),
+                 **({"total_price_cr": float(alt["predicted_price_cr"].sum())} if prices is not None else {})}
+                for alt, total in alternatives
+            ]
+        return result
+
+    async def solve(self, players, format_type, backend, constraints, top_k=1):
+        return await asyncio.get_running_loop().run_in_executor(
+            self.solver_pool, self._solve_sync, players, format_type, backend, constraints, top_k
+        )
+
+    def make_app(self):
+        routes = [
+            (r"/health", HealthHandler),
+            (r"/models", ModelsHandler),
+            (r"/predict", PredictHandler),
+            (r"/predict/batch", PredictBatchHandler),
+            (r"/best-xi", BestXIHandler),
+        ]
+        return tornado.web.Application([(path, handler, {"service": self}) for path, handler in routes])
+
+
+async def serve(port, service):
+    service.batcher.start()
+    service.make_app().listen(port)
+    print(f"Cricket scoring service listening on http://127.0.0.1:{port}")
+    await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--solver-workers", type=int, default=4)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="model registry manifest")
+    args = parser.parse_args()
+
+    service = ScoringService(ModelRegistry(args.manifest), load_reference_datasets(), solver_workers=args.solver_workers,
+                             max_batch=args.max_batch, max_wait_ms=args.max_wait_ms)
+    asyncio.run(serve(args.port, service))
+
+
+if __name__ == "__main__":
+    main()
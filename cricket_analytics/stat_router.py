@@ -0,0 +1,248 @@
+"""Rule-based fast path for chatbot stat questions.
+
+Plain lookups ("strike rate of Shubman Gill in ODIs"), rankings ("top 5
+wicket takers in the Test data") and filters ("bowlers with economy under 4")
+are answered from the player tables; everything else is routed to the LLM.
+A filter is only applied when the question asks for players ("which", a role
+noun, ...), so "Is a strike rate above 150 good?" still goes to the LLM, as
+does a filter that matches nobody.
+"""
+import re
+import time
+from collections import Counter, namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache, pool_fingerprint
+from .impact import _safe_ratio
+from .retrieval import player_record, tokenize
+
+RouteResult = namedtuple("RouteResult", ["path", "answer", "elapsed"])
+
+# Stat column -> (label, lower is better, qualifier column, qualifier minimum for rankings)
+STATS = {
+    "runs_scored": ("runs", False, None, 0),
+    "wickets": ("wickets", False, None, 0),
+    "strike_rate": ("strike rate", False, "balls_faced", 100),
+    "batting_avg": ("batting average", False, "innings_batted", 10),
+    "bowling_avg": ("bowling average", True, "wickets", 10),
+    "bowler_sr": ("bowling strike rate", True, "wickets", 10),
+    "economy": ("economy", True, "balls_bowled", 300),
+    "sixes": ("sixes", False, None, 0),
+    "fours": ("fours", False, None, 0),
+    "boundaries": ("boundaries", False, None, 0),
+    "innings_batted": ("innings", False, None, 0),
+    "balls_faced": ("balls faced", False, None, 0),
+    "balls_bowled": ("balls bowled", False, None, 0),
+    "dot_balls": ("dot balls", False, None, 0),
+}
+
+# Longest phrases first so "bowling average" wins over "average"
+STAT_PHRASES = [
+    ("bowling strike rate", "bowler_sr"), ("bowling average", "bowling_avg"), ("bowling avg", "bowling_avg"),
+    ("batting average", "batting_avg"), ("batting avg", "batting_avg"), ("strike rate", "strike_rate"),
+    ("economy rate", "economy"), ("wicket takers", "wickets"), ("wicket-takers", "wickets"),
+    ("run scorers", "runs_scored"), ("run-scorers", "runs_scored"), ("run getters", "runs_scored"),
+    ("dot balls", "dot_balls"), ("balls faced", "balls_faced"), ("balls bowled", "balls_bowled"),
+    ("average", "batting_avg"), ("avg", "batting_avg"), ("economy", "economy"), ("econ", "economy"),
+    ("wickets", "wickets"), ("wkts", "wickets"), ("runs", "runs_scored"), ("sixes", "sixes"),
+    ("fours", "fours"), ("boundaries", "boundaries"), ("innings", "innings_batted"), ("sr", "strike_rate"),
+]
+_STAT_PATTERN = re.compile(r"\b(" + "|".join(re.escape(p) for p, _ in STAT_PHRASES) + r")\b")
+_STAT_BY_PHRASE = dict(STAT_PHRASES)
+
+ROLE_WORDS = {
+    "bowlers": "Bowler", "bowler": "Bowler",
+    "batsmen": "Batsman", "batsman": "Batsman", "batters": "Batsman", "batter": "Batsman",
+    "allrounders": "All-Rounder", "allrounder": "All-Rounder",
+    "keepers": "Wicketkeeper", "wicketkeepers": "Wicketkeeper", "keeper": "Wicketkeeper",
+}
+DEFAULT_STAT_FOR_ROLE = {"Bowler": "wickets", "Batsman": "runs_scored", "All-Rounder": "runs_scored",
+                         "Wicketkeeper": "runs_scored"}
+DATASET_WORDS = {"odi": "ODI", "odis": "ODI", "test": "Test", "tests": "Test",
+                 "pool": "Your pool", "squad": "Your pool"}
+# Formats we hold no data for: let the LLM answer
+LLM_ONLY_WORDS = {"ipl", "t20", "t20i", "t20s", "auction", "why", "compare", "predict", "should"}
+# A filter question must ask for players: one of these words or a role noun
+PLAYER_LIST_WORDS = {"list", "which", "who", "show", "find", "players", "names"}
+
+_TOP = re.compile(r"(?<!at )\b(top|best|most|highest|lowest|leading|fewest|least)\b(?:\s+(\d{1,2}))?")
+_COMPARATORS = [
+    (r"at least|min(?:imum)?|>=", np.greater_equal), (r"at most|max(?:imum)?|<=", np.less_equal),
+    (r"above|over|more than|greater than|>", np.greater), (r"under|below|less than|fewer than|<", np.less),
+]
+_NUMBER = r"(\d+(?:\.\d+)?)"
+_STAT_ALT = "|".join(re.escape(p) for p, _ in STAT_PHRASES)
+_FILTERS = [
+    (re.compile(rf"\b({_STAT_ALT})\s+(?:of\s+)?(?:{words})\s*{_NUMBER}"), op, 1, 2)
+    for words, op in _COMPARATORS
+] + [
+    (re.compile(rf"(?:{words})\s*{_NUMBER}\s+({_STAT_ALT})\b"), op, 2, 1)
+    for words, op in _COMPARATORS
+]
+
+
+def prepare_table(players_df):
+    """Numeric arrays (plus derived ratios) for one player table."""
+    def column(name):
+        if name not in players_df:
+            return np.zeros(len(players_df))
+        return pd.to_numeric(players_df[name], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+
+    table = {name: column(name) for name in
+             ["runs_scored", "innings_batted", "balls_faced", "strike_rate", "fours", "sixes", "wickets",
+              "balls_bowled", "runs_conceded", "economy", "dot_balls", "is_overseas"]}
+    table["batting_avg"] = _safe_ratio(table["runs_scored"], table["innings_batted"], 0.0)
+    table["bowling_avg"] = _safe_ratio(table["runs_conceded"], table["wickets"], np.inf)
+    table["bowler_sr"] = _safe_ratio(table["balls_bowled"], table["wickets"], np.inf)
+    table["boundaries"] = table["fours"] + table["sixes"]
+    table["role"] = players_df["role"].to_numpy(dtype=object) if "role" in players_df else np.full(len(players_df), "")
+    table["names"] = players_df["player_name"].astype(str).to_numpy(dtype=object)
+    table["records"] = players_df.to_dict("records")
+
+    # surname -> row positions; initials and short tokens are only used to disambiguate
+    surnames = {}
+    for i, name in enumerate(table["names"]):
+        tokens = tokenize(name)
+        if tokens:
+            surnames.setdefault(tokens[-1], []).append(i)
+    table["surnames"] = surnames
+    return table
+
+
+def _format_value(stat, value):
+    if not np.isfinite(value):
+        return "n/a"
+    return f"{value:.2f}" if stat in ("strike_rate", "batting_avg", "bowling_avg", "bowler_sr", "economy") \
+        else f"{value:.0f}"
+
+
+class StatRouter:
+    """Answers lookup / top-N / filter questions from player tables; reports the path taken."""
+
+    def __init__(self, datasets):
+        self.tables = {f"{name} data": prepare_table(df) for name, df in datasets.items()}
+        self.counts = Counter()
+        self._pool_tables = LRUCache(max_entries=16)  # session pools, by fingerprint
+
+    def _tables_for(self, words, pool):
+        """Tables named in the question; the reference data when none is named."""
+        wanted = {DATASET_WORDS[w] for w in words if w in DATASET_WORDS}
+        if not wanted:
+            return self.tables
+        tables = {name: t for name, t in self.tables.items() if any(name.startswith(w) for w in wanted)}
+        if "Your pool" in wanted and pool is not None and not pool.empty and "player_name" in pool:
+            tables["Your pool"] = self._pool_tables.get_or_compute(
+                pool_fingerprint(pool), lambda: prepare_table(pool[pool["player_name"].notna()])
+            )
+        return tables
+
+    @staticmethod
+    def _find_players(question, words, table):
+        """Rows whose surname is in the question, named either capitalized or with a matching first name."""
+        rows = []
+        for word in set(words):
+            for i in table["surnames"].get(word, ()):
+                name_tokens = tokenize(table["names"][i])
+                first_names = name_tokens[:-1]
+                capitalized = re.search(rf"\b{re.escape(word.capitalize())}\b", question) is not None
+                if capitalized or any(t in words for t in first_names):
+                    rows.append(i)
+        # Prefer rows whose full name is matched ("Virat Kohli" over another Kohli)
+        full = [i for i in rows if all(t in words or len(t) <= 2 for t in tokenize(table["names"][i]))]
+        return full or rows
+
+    def route(self, question, pool=None):
+        """RouteResult with path "lookup", "top_n", "filter" or "llm" (answer is None for llm)."""
+        start = time.perf_counter()
+        path, answer = self._answer(question, pool)
+        self.counts[path] += 1
+        return RouteResult(path, answer, time.perf_counter() - start)
+
+    def _answer(self, question, pool):
+        text = question.lower().replace("all-rounders", "allrounders").replace("all rounders", "allrounders")
+        words = tokenize(text)
+        if not words or LLM_ONLY_WORDS.intersection(words):
+            return "llm", None
+
+        stat_match = _STAT_PATTERN.search(text)
+        stat = _STAT_BY_PHRASE[stat_match.group(1)] if stat_match else None
+        wants_record = "stats" in words or "record" in words
+        role = next((ROLE_WORDS[w] for w in words if w in ROLE_WORDS), None)
+        tables = self._tables_for(words, pool)
+        if not tables:
+            return "llm", None
+
+        # Single-player lookups
+        found = {name: self._find_players(question, words, t) for name, t in tables.items()}
+        if any(found.values()):
+            if stat is None and not wants_record:
+                return "llm", None  # "Who is Virat Kohli?" is open-ended
+            lines = []
+            for name, rows in found.items():
+                table = tables[name]
+                for i in rows:
+                    if stat is None:
+                        lines.append(player_record(table["records"][i], name))
+                    else:
+                        label = STATS[stat][0]
+                        lines.append(f"{table['names'][i]} ({name}): {label} "
+                                     f"{_format_value(stat, table[stat][i])}")
+            return "lookup", "\n".join(lines)
+
+        filters = []
+        for pattern, op, stat_group, number_group in _FILTERS:
+            for match in pattern.finditer(text):
+                filters.append((_STAT_BY_PHRASE[match.group(stat_group)], op, float(match.group(number_group))))
+        top = _TOP.search(text)
+        if filters and not top and role is None and not PLAYER_LIST_WORDS.intersection(words):
+            return "llm", None  # "Is a strike rate above 150 good?" asks about the number, not for players
+        if stat is None and role is not None and (top or filters):
+            stat = DEFAULT_STAT_FOR_ROLE[role]
+        if stat is None or not (top or filters):
+            return "llm", None
+
+        lower_is_better = STATS[stat][1]
+        if top and top.group(1) in ("lowest", "fewest", "least"):
+            lower_is_better = True
+        elif top and top.group(1) in ("highest", "most"):
+            lower_is_better = False
+        n = min(int(top.group(2)), 20) if top and top.group(2) else (5 if top else 10)
+        overseas = 1.0 if "overseas" in words or "foreign" in words else (0.0 if "indian" in words else None)
+        _, _, qualifier, minimum = STATS[stat]
+        ranking_by_ratio = qualifier is not None and not any(f[0] == qualifier for f in filters)
+
+        candidates = []
+        for name, table in tables.items():
+            mask = np.isfinite(table[stat])
+            if role is not None:
+                mask &= table["role"] == role
+            if overseas is not None:
+                mask &= table["is_overseas"] == overseas
+            if ranking_by_ratio and top:
+                mask &= table[qualifier] >= minimum  # don't rank a 2-innings average
+            for filter_stat, op, value in filters:
+                mask &= op(table[filter_stat], value)
+            for i in np.flatnonzero(mask):
+                candidates.append((table[stat][i], table["names"][i], name))
+
+        if not candidates:
+            if not top:
+                return "llm", None  # an empty filter is more likely a misread question than a real answer
+            return "top_n", "No players in the loaded data match that question."
+        candidates.sort(key=lambda c: c[0], reverse=not lower_is_better)
+        shown = candidates[:n]
+        label = STATS[stat][0]
+        header = (f"{'Lowest' if lower_is_better else 'Top'} {len(shown)} by {label}" if top
+                  else f"{len(candidates)} players match; showing {len(shown)} by {label}")
+        if top and ranking_by_ratio:
+            header += f" (min {minimum} {qualifier.replace('_', ' ')})"
+        lines = [f"{i}. {player} ({source}): {_format_value(stat, value)}"
+                 for i, (value, player, source) in enumerate(shown, 1)]
+        return ("top_n" if top else "filter"), header + ":\n" + "\n".join(lines)
+
+    def stats(self):
+        total = sum(self.counts.values())
+        local = total - self.counts["llm"]
+        return {"queries": total, **dict(self.counts), "offload_rate": local / total if total else 0.0}
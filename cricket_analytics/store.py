@@ -0,0 +1,104 @@
+"""Columnar player store (Arrow IPC / Parquet) in front of the scraped JSON files.
+
+    python -m cricket_analytics.store ODI_output.json test_output.json
+
+converts each JSON file into an uncompressed Arrow IPC file next to it
+(ODI_output.arrow), with roles already normalized. Reading an .arrow store
+memory-maps the file and only materializes the requested columns; numeric
+columns come back without a copy.
+"""
+import argparse
+import os
+import tempfile
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from .players import PLAYER_COLUMNS, REFERENCE_FILES, load_players_json
+
+STORE_SUFFIX = ".arrow"
+
+
+def store_path(json_path, suffix=STORE_SUFFIX):
+    return os.path.splitext(json_path)[0] + suffix
+
+
+def write_player_store(players_df, path):
+    """Write a player frame as Arrow IPC (.arrow/.feather, uncompressed) or Parquet (.parquet)."""
+    table = pa.Table.from_pandas(players_df, preserve_index=False)
+    # A temp file of its own per writer, so concurrent writers never clobber each other before the rename
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(path)),
+                                     prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        if path.endswith(".parquet"):
+            pq.write_table(table, tmp_path)
+        else:
+            # Uncompressed so readers can map the buffers straight from the page cache
+            with pa.OSFile(tmp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+
+def convert_json(json_path, path=None):
+    """Parse and normalize a scraped JSON file once and store it columnar; returns the store path."""
+    return write_player_store(load_players_json(json_path), path or store_path(json_path))
+
+
+def read_player_store(path, columns=PLAYER_COLUMNS):
+    """Read the given columns of a player store into a DataFrame (memory-mapped for .arrow).
+
+    Numeric columns may be read-only views of the file; copy before editing in place.
+    """
+    if path.endswith(".parquet"):
+        schema = pq.read_schema(path)
+        table = pq.read_table(path, columns=[c for c in columns if c in schema.names], memory_map=True)
+    else:
+        with pa.memory_map(path, "r") as source:
+            table = ipc.open_file(source).read_all()
+        table = table.select([c for c in columns if c in table.column_names])
+    # split_blocks keeps one block per column, so numeric columns are wrapped rather than copied
+    return table.to_pandas(split_blocks=True)
+
+
+def _is_fresh(path, json_path):
+    return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(json_path)
+
+
+def load_players(json_path, columns=PLAYER_COLUMNS):
+    """Load a scraped player file through its columnar store, converting it first if missing or stale.
+
+    Falls back to parsing the JSON when the store cannot be written (read-only checkout).
+    """
+    path = store_path(json_path)
+    if not _is_fresh(path, json_path):
+        try:
+            convert_json(json_path, path)
+        except OSError:
+            players = load_players_json(json_path)
+            return players[[c for c in columns if c in players]]
+    return read_player_store(path, columns)
+
+
+def load_reference(name, root="."):
+    """Load one bundled reference dataset ("ODI" or "Test") through the store."""
+    return load_players(os.path.join(root, REFERENCE_FILES[name]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert scraped player JSON files into columnar stores.")
+    parser.add_argument("json_files", nargs="*", default=list(REFERENCE_FILES.values()))
+    parser.add_argument("--format", choices=["arrow", "parquet"], default="arrow")
+    args = parser.parse_args()
+    for json_path in args.json_files:
+        path = convert_json(json_path, store_path(json_path, f".{args.format}"))
+        print(f"{json_path} -> {path} ({os.path.getsize(path) / 1e6:.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Best XI scenario sweeps across formats and constraint grids.
+
+compute_impact runs once per format in the caller. The impact, overseas and
+role arrays go to each worker process once (pool initializer), and the
+scenarios are solved there in chunks with the exact DP solver, so a sweep of
+thousands of scenarios uses every core without re-scoring or re-pickling the
+pool per scenario.
+"""
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .impact import compute_impact
+from .team import ROLE_MINIMUMS, TeamConstraints, dp_groups, solve_team_dp, team_arrays
+
+FORMATS = ["T20", "ODI", "Test"]
+# Constraint fields the app lets analysts sweep
+SWEEP_FIELDS = ["max_overseas", "min_bowlers", "min_allrounders"]
+# Below this many scenarios, starting worker processes costs more than it saves
+INLINE_SCENARIOS = 500
+
+# Worker process state: format -> (impact, overseas, role_masks, groups, prices)
+_worker_arrays = {}
+
+
+def scenario_grid(formats=FORMATS, base=TeamConstraints(), **grid):
+    """[(format, TeamConstraints)] for every combination of the grid values; other fields come from base.
+
+        scenario_grid(["T20", "ODI"], max_overseas=range(0, 5), min_bowlers=[3, 4, 5])
+    """
+    unknown = set(grid) - set(TeamConstraints._fields)
+    if unknown:
+        raise ValueError(f"Unknown constraint fields: {', '.join(sorted(unknown))}")
+    fields = list(grid)
+    return [(format_type, base._replace(**dict(zip(fields, values))))
+            for format_type in formats
+            for values in itertools.product(*(grid[field] for field in fields))]
+
+
+def _prepare(arrays):
+    return {format_type: (impact, overseas, role_masks, dp_groups(impact, overseas, role_masks), prices)
+            for format_type, (impact, overseas, role_masks, prices) in arrays.items()}
+
+
+def _init_worker(arrays):
+    _worker_arrays.clear()
+    _worker_arrays.update(_prepare(arrays))
+
+
+def _solve_chunk(chunk, prepared=None):
+    """[(selected row positions, violated)] for a list of (format, TeamConstraints)."""
+    prepared = _worker_arrays if prepared is None else prepared
+    solved = []
+    for format_type, constraints in chunk:
+        impact, overseas, role_masks, groups, prices = prepared[format_type]
+        selected, violated = solve_team_dp(impact, overseas, role_masks, constraints, groups=groups, prices=prices)
+        solved.append((np.flatnonzero(selected), violated))
+    return solved
+
+
+def _team_columns(scored, prices):
+    """NumPy columns of a scored pool that the results table aggregates over."""
+    return {
+        "price": np.full(len(scored), np.nan) if prices is None else prices,
+        "impact": scored["impact"].to_numpy(dtype=np.float64),
+        "batting_impact": scored["batting_impact"].to_numpy(dtype=np.float64),
+        "bowling_impact": scored["bowling_impact"].to_numpy(dtype=np.float64),
+        "is_overseas": scored["is_overseas"].to_numpy(dtype=np.float64),
+        "role": scored["role"].to_numpy(dtype=object),
+        "player_name": scored["player_name"].astype(str).to_numpy(dtype=object),
+    }
+
+
+def _result_row(format_type, constraints, columns, selected, violated):
+    row = {"format": format_type, **constraints._asdict(), "feasible": not violated}
+    if violated:
+        return {**row, "total_impact": np.nan, "batting_impact": np.nan, "bowling_impact": np.nan,
+                "total_price_cr": np.nan, "overseas": np.nan, **{role: np.nan for _, role, _ in ROLE_MINIMUMS},
+                "players": "", "violated": ", ".join(violated)}
+    impact = columns["impact"][selected]
+    roles = columns["role"][selected]
+    ranked = selected[np.argsort(-impact, kind="stable")]
+    return {**row, "total_impact": impact.sum(), "batting_impact": columns["batting_impact"][selected].sum(),
+            "bowling_impact": columns["bowling_impact"][selected].sum(),
+            "total_price_cr": columns["price"][selected].sum(),
+            "overseas": int(columns["is_overseas"][selected].sum()),
+            **{role: int((roles == role).sum()) for _, role, _ in ROLE_MINIMUMS},
+            "players": ", ".join(columns["player_name"][ranked]), "violated": ""}
+
+
+def run_sweep(players_df, scenarios, workers=None, on_progress=None, prices=None):
+    """Solve every (format, TeamConstraints) scenario; returns a tidy DataFrame, one row per scenario.
+
+    workers defaults to every core; sweeps under INLINE_SCENARIOS (or
+    workers=1) run in this process. on_progress is called with the fraction
+    of scenarios solved. prices (crores, one per row of players_df) are
+    needed for scenarios with a purse or price cap.
+    """
+    formats = list(dict.fromkeys(format_type for format_type, _ in scenarios))
+    prices = None if prices is None else np.asarray(prices, dtype=np.float64)
+    scored = {format_type: compute_impact(players_df, format_type) for format_type in formats}
+    arrays = {format_type: (*team_arrays(scored[format_type]), prices) for format_type in formats}
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(scenarios) < INLINE_SCENARIOS:
+        solved = _solve_chunk(scenarios, _prepare(arrays))
+        if on_progress is not None:
+            on_progress(1.0)
+    else:
+        chunk_size = max(1, min(256, -(-len(scenarios) // (workers * 4))))
+        chunks = [scenarios[i:i + chunk_size] for i in range(0, len(scenarios), chunk_size)]
+        solved = []
+        # spawn: forking a process that runs server threads (Streamlit, tornado) is unsafe
+        with ProcessPoolExecutor(min(workers, len(chunks)), mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(arrays,)) as executor:
+            for done, chunk_solved in enumerate(executor.map(_solve_chunk, chunks), start=1):
+                solved.extend(chunk_solved)
+                if on_progress is not None:
+                    on_progress(done / len(chunks))
+
+    columns = {format_type: _team_columns(scored[format_type], prices) for format_type in formats}
+    return pd.DataFrame([
+        _result_row(format_type, constraints, columns[format_type], selected, violated)
+        for (format_type, constraints), (selected, violated) in zip(scenarios, solved)
+    ])
+
+
+def sensitivity(results, rows, columns, value="total_impact"):
+    """{format: pivot of value by rows x columns}, averaged over the other swept fields."""
+    return {format_type: group.pivot_table(index=rows, columns=columns, values=value, aggfunc="mean")
+            for format_type, group in results.groupby("format", sort=False)}
@@ -0,0 +1,491 @@
+import heapq
+from collections import namedtuple
+
+import numpy as np
+
+from .cache import LRUCache
+from .impact import compute_impact
+
+# Slider values from the Team Configuration panel; budget (the purse) and
+# max_player_price are in crores, None means no limit
+TeamConstraints = namedtuple(
+    'TeamConstraints',
+    ['team_size', 'max_overseas', 'min_batsmen', 'min_bowlers', 'min_allrounders', 'min_wk',
+     'budget', 'max_player_price'],
+    defaults=[11, 4, 3, 3, 2, 1, None, None]
+)
+
+# (constraint name, role, TeamConstraints field) for every role minimum
+ROLE_MINIMUMS = [
+    ("MinBatsmen", "Batsman", "min_batsmen"),
+    ("MinBowlers", "Bowler", "min_bowlers"),
+    ("MinAllRounders", "All-Rounder", "min_allrounders"),
+    ("MinWicketkeepers", "Wicketkeeper", "min_wk"),
+]
+
+
+def has_price_limits(constraints):
+    return constraints.budget is not None or constraints.max_player_price is not None
+
+
+def _check_prices(prices, constraints):
+    if prices is None and has_price_limits(constraints):
+        raise ValueError("A purse or price cap needs a price for every player")
+
+
+def team_arrays(players_df, with_role_masks=True):
+    """Impact vector, overseas vector and role masks for a pool that already has impact scores."""
+    impact = players_df['impact'].to_numpy(dtype=np.float64)
+    overseas = players_df['is_overseas'].to_numpy(dtype=np.float64)
+    if not with_role_masks:
+        return impact, overseas, None
+    role = players_df['role'].to_numpy(dtype=object)
+    role_masks = {r: role == r for _, r, _ in ROLE_MINIMUMS}
+    return impact, overseas, role_masks
+
+
+def build_team_problem(impact, overseas, role_masks, constraints, prices=None):
+    """Build the Best XI ILP straight from the arrays (one affine expression per row)."""
+    from pulp import LpAffineExpression, LpMaximize, LpProblem, LpVariable
+
+    _check_prices(prices, constraints)
+    prob = LpProblem("BestXI", LpMaximize)
+    choices = [LpVariable(f"select_{i}", cat="Binary") for i in range(len(impact))]
+
+    # Objective: maximize impact
+    prob += LpAffineExpression(zip(choices, impact.tolist()))
+
+    # Constraints
+    prob += LpAffineExpression((c, 1) for c in choices) == constraints.team_size, "TeamSize"
+    overseas_idx = np.flatnonzero(overseas)
+    prob += LpAffineExpression(
+        zip([choices[i] for i in overseas_idx], overseas[overseas_idx].tolist())
+    ) <= constraints.max_overseas, "OverseasLimit"
+    for name, role, field in ROLE_MINIMUMS:
+        members = np.flatnonzero(role_masks[role])
+        prob += LpAffineExpression((choices[i], 1) for i in members) >= getattr(constraints, field), name
+    if constraints.budget is not None:
+        prob += LpAffineExpression(zip(choices, prices.tolist())) <= constraints.budget, "Budget"
+    if constraints.max_player_price is not None:
+        over_cap = np.flatnonzero(prices > constraints.max_player_price)
+        prob += LpAffineExpression((choices[i], 1) for i in over_cap) <= 0, "MaxPlayerPrice"
+
+    return prob, choices
+
+
+def solve_team_problem(prob, choices, msg=False, solved=False):
+    """Run CBC (unless already solved); returns (selected mask, violated constraint names).
+
+    Without an optimal solution nothing is selected, and the names are the
+    rows CBC's last point breaks (or its status); callers holding the arrays
+    should diagnose with _unmet_team_constraints instead.
+    """
+    from pulp import PULP_CBC_CMD, LpStatus
+
+    if not solved:
+        prob.solve(PULP_CBC_CMD(msg=msg))
+
+    # valid() checks the sign against the row's sense, so breached <= and == rows count too
+    violated = [name for name, c in prob.constraints.items() if c.value() is not None and not c.valid(1e-6)]
+    if prob.status != 1 or violated:  # infeasible or not solved
+        return np.zeros(len(choices), dtype=bool), violated or [LpStatus[prob.status]]
+
+    selected = np.array([(c.varValue or 0) > 0.5 for c in choices], dtype=bool)
+    return selected, []
+
+
+def build_team_matrix(impact, overseas, role_masks, constraints, prices=None):
+    """Same model as build_team_problem as (c, A, lower, upper) for scipy's HiGHS MILP."""
+    from scipy.sparse import csr_matrix
+
+    _check_prices(prices, constraints)
+    rows = [np.ones(len(impact)), overseas] + [role_masks[role].astype(np.float64) for _, role, _ in ROLE_MINIMUMS]
+    lower = [constraints.team_size, -np.inf] + [getattr(constraints, f) for _, _, f in ROLE_MINIMUMS]
+    upper = [constraints.team_size, constraints.max_overseas] + [np.inf] * len(ROLE_MINIMUMS)
+    if constraints.budget is not None:
+        rows.append(prices)
+        lower.append(-np.inf)
+        upper.append(constraints.budget)
+    if constraints.max_player_price is not None:
+        rows.append((prices > constraints.max_player_price).astype(np.float64))
+        lower.append(-np.inf)
+        upper.append(0)
+    A = csr_matrix(np.vstack(rows))
+    lower = np.array(lower, dtype=np.float64)
+    upper = np.array(upper, dtype=np.float64)
+    # milp minimizes
+    return -impact, A, lower, upper
+
+
+def solve_team_matrix(c, A, lower, upper):
+    """Solve the sparse model with HiGHS; returns (selected mask, violated constraint names)."""
+    from scipy.optimize import Bounds, LinearConstraint, milp
+
+    # HiGHS stops within a 1e-4 relative gap by default; a zero gap makes it exact like CBC and the DP
+    result = milp(c, constraints=LinearConstraint(A, lower, upper),
+                  integrality=np.ones(len(c)), bounds=Bounds(0, 1), options={"mip_rel_gap": 0})
+    if result.x is None:
+        return np.zeros(len(c), dtype=bool), _unmet_constraints(A, lower)
+    return result.x > 0.5, []
+
+
+def _unmet_constraints(A, lower):
+    """Names of rows that cannot be met on their own; otherwise the role
+    minimums and overseas cap together clash with the team size."""
+    names = ["TeamSize", "OverseasLimit"] + [name for name, _, _ in ROLE_MINIMUMS]
+    counts = np.asarray(A.sum(axis=1)).ravel()
+    violated = [name for name, count, lo in zip(names, counts, lower) if count < lo]
+    return violated or ["TeamSize"]
+
+
+def _unmet_team_constraints(impact, overseas, role_masks, constraints, prices=None):
+    """Why no team fits, the same way for every backend."""
+    if has_price_limits(constraints):
+        return _unmet_price_limits(impact, overseas, role_masks, prices, constraints)
+    rows = np.vstack([np.ones(len(impact)), overseas] +
+                     [role_masks[role].astype(np.float64) for _, role, _ in ROLE_MINIMUMS])
+    return _unmet_constraints(rows, [constraints.team_size, -np.inf] +
+                              [getattr(constraints, field) for _, _, field in ROLE_MINIMUMS])
+
+
+def _top_k(members, impact, k):
+    """Indices of the k highest-impact members, best first."""
+    if k < len(members):
+        members = members[np.argpartition(-impact[members], k - 1)[:k]] if k > 0 else members[:0]
+    return members[np.argsort(-impact[members], kind='stable')]
+
+
+def _group_masks(overseas, role_masks):
+    """(local, overseas) member masks per role group: role minimums first, then everyone else."""
+    is_overseas = overseas > 0
+
+    # Players whose role has no minimum still compete for the open slots
+    other = np.ones(len(overseas), dtype=bool)
+    masks = []
+    for _, role, _ in ROLE_MINIMUMS:
+        other &= ~role_masks[role]
+        masks.append(role_masks[role])
+    masks.append(other)
+    return [(mask & ~is_overseas, mask & is_overseas) for mask in masks]
+
+
+def dp_groups(impact, overseas, role_masks, limit=None):
+    """Per role group (role minimums first, then everyone else): the local and
+    overseas member indices sorted best first, truncated to limit if given."""
+    groups = []
+    for local_mask, foreign_mask in _group_masks(overseas, role_masks):
+        local = np.flatnonzero(local_mask)
+        foreign = np.flatnonzero(foreign_mask)
+        if limit is None:
+            groups.append((_top_k(local, impact, len(local)), _top_k(foreign, impact, len(foreign))))
+        else:
+            groups.append((_top_k(local, impact, limit), _top_k(foreign, impact, limit)))
+    return groups
+
+
+def solve_team_dp(impact, overseas, role_masks, constraints, groups=None, prices=None):
+    """Exact solver without an ILP: per (role, overseas) top-k lists merged by
+    a DP over (players picked, overseas picked). Returns (selected mask, violated).
+
+    For a fixed number of picks from one (role, overseas) group the best choice
+    is always that group's top-k, so only the first team_size entries of each
+    group matter and the DP state is at most (team_size + 1) x (max_overseas + 1).
+    Pass groups from dp_groups() to reuse the sorted groups across solves.
+    Under a purse or price cap the top-k argument no longer holds, and the
+    solve goes to solve_team_budget instead.
+    """
+    if has_price_limits(constraints):
+        _check_prices(prices, constraints)
+        return solve_team_budget(impact, overseas, role_masks, prices, constraints)
+
+    team_size = constraints.team_size
+    max_overseas = min(max(constraints.max_overseas, 0), team_size)
+    selected = np.zeros(len(impact), dtype=bool)
+    if groups is None:
+        groups = dp_groups(impact, overseas, role_masks, limit=team_size)
+    minimums = [getattr(constraints, field) for _, _, field in ROLE_MINIMUMS] + [0]
+
+    best = np.full((team_size + 1, max_overseas + 1), -np.inf)
+    best[0, 0] = 0.0
+    steps = []
+    for (local, foreign), minimum in zip(groups, minimums):
+        local, foreign = local[:team_size], foreign[:max_overseas]
+        local_sums = np.concatenate([[0.0], np.cumsum(impact[local])])
+        foreign_sums = np.concatenate([[0.0], np.cumsum(impact[foreign])])
+
+        # Every feasible (a local, b overseas) pick from this group at once:
+        # state (n, o) comes from (n - a - b, o - b); out-of-range reads hit the -inf pad
+        a, b = np.divmod(np.arange(len(local_sums) * len(foreign_sums)), len(foreign_sums))
+        ok = (a + b >= minimum) & (a + b <= team_size)
+        a, b = a[ok], b[ok]
+        if len(a) == 0:
+            best[:] = -np.inf
+            break
+        padded = np.full((team_size + 2, max_overseas + 2), -np.inf)
+        padded[:-1, :-1] = best
+        rows = np.arange(team_size + 1)[None, :, None] - (a + b)[:, None, None]
+        cols = np.arange(max_overseas + 1)[None, None, :] - b[:, None, None]
+        rows[rows < 0] = team_size + 1
+        cols[cols < 0] = max_overseas + 1
+        candidate = padded[rows, cols] + (local_sums[a] + foreign_sums[b])[:, None, None]
+        k = candidate.argmax(axis=0)
+        best = candidate.max(axis=0)
+        steps.append((a[k], b[k], local, foreign))
+
+    end_overseas = int(np.argmax(best[team_size]))
+    if not np.isfinite(best[team_size, end_overseas]):
+        return selected, _unmet_team_constraints(impact, overseas, role_masks, constraints)
+
+    # Walk the DP back to recover how many each group contributed
+    picked, picked_overseas = team_size, end_overseas
+    for a_choice, b_choice, local, foreign in reversed(steps):
+        a, b = a_choice[picked, picked_overseas], b_choice[picked, picked_overseas]
+        selected[local[:a]] = True
+        selected[foreign[:b]] = True
+        picked, picked_overseas = picked - a - b, picked_overseas - b
+
+    return selected, []
+
+
+def budget_candidates(impact, overseas, role_masks, prices, constraints, keep=None):
+    """Sorted row indices that can be in an optimal team under the price limits.
+
+    Players priced above max_player_price are dropped. Within a (role,
+    overseas) group, a player that keep (default team_size) group-mates match
+    or beat on both impact and price can always be swapped for one of them
+    that is not picked, at no extra cost, so only players with fewer such
+    dominators are kept: one pass per group in price order with a heap of
+    the best impacts seen so far.
+    """
+    keep = constraints.team_size if keep is None else keep
+    eligible = np.ones(len(impact), dtype=bool)
+    if constraints.max_player_price is not None:
+        eligible = prices <= constraints.max_player_price
+    kept = []
+    if keep > 0:
+        for group in _group_masks(overseas, role_masks):
+            for mask in group:
+                members = np.flatnonzero(mask & eligible)
+                members = members[np.lexsort((-impact[members], prices[members]))]
+                best = []  # min-heap of the keep highest impacts among cheaper group-mates
+                for i, value in zip(members.tolist(), impact[members].tolist()):
+                    if len(best) < keep:
+                        heapq.heappush(best, value)
+                    elif value > best[0]:
+                        heapq.heapreplace(best, value)
+                    else:
+                        continue
+                    kept.append(i)
+    return np.sort(np.array(kept, dtype=np.int64))
+
+
+def _unmet_price_limits(impact, overseas, role_masks, prices, constraints):
+    """Why no team fits the price limits: the plain constraints, then the price cap, then the purse."""
+    _, violated = solve_team_dp(impact, overseas, role_masks, constraints._replace(budget=None, max_player_price=None))
+    if violated:
+        return violated
+    if constraints.max_player_price is not None:
+        eligible = prices <= constraints.max_player_price
+        _, violated = solve_team_dp(impact[eligible], overseas[eligible],
+                                    {role: mask[eligible] for role, mask in role_masks.items()},
+                                    constraints._replace(budget=None, max_player_price=None))
+        if violated:
+            return ["MaxPlayerPrice"]
+    return ["Budget"]
+
+
+def solve_team_budget(impact, overseas, role_masks, prices, constraints):
+    """Exact Best XI under a purse and/or per-player price cap: zero-gap HiGHS on
+    budget_candidates() only. Returns (selected mask, violated constraint names)."""
+    _check_prices(prices, constraints)
+    selected = np.zeros(len(impact), dtype=bool)
+    candidates = budget_candidates(impact, overseas, role_masks, prices, constraints)
+    if len(candidates) == 0:
+        # Nobody is affordable; only an empty team with no role minimums fits
+        empty_ok = constraints.team_size == 0 and all(getattr(constraints, f) <= 0 for _, _, f in ROLE_MINIMUMS)
+        return selected, [] if empty_ok else _unmet_price_limits(impact, overseas, role_masks, prices, constraints)
+    picked, violated = solve_team_matrix(*build_team_matrix(
+        impact[candidates], overseas[candidates],
+        {role: mask[candidates] for role, mask in role_masks.items()}, constraints, prices[candidates]
+    ))
+    if violated:
+        return selected, _unmet_price_limits(impact, overseas, role_masks, prices, constraints)
+    selected[candidates[picked]] = True
+    return selected, []
+
+
+def _solve_pulp(impact, overseas, role_masks, constraints, prices=None):
+    selected, violated = solve_team_problem(*build_team_problem(impact, overseas, role_masks, constraints, prices))
+    if violated:
+        return selected, _unmet_team_constraints(impact, overseas, role_masks, constraints, prices)
+    return selected, []
+
+
+def _solve_highs(impact, overseas, role_masks, constraints, prices=None):
+    if has_price_limits(constraints):
+        return solve_team_budget(impact, overseas, role_masks, prices, constraints)
+    return solve_team_matrix(*build_team_matrix(impact, overseas, role_masks, constraints))
+
+
+# Solver backends: each takes (impact, overseas, role_masks, constraints, prices=None)
+# and returns (selected mask, violated constraint names); prices are needed
+# only for a purse or price cap
+SOLVERS = {
+    "pulp": _solve_pulp,
+    "highs": _solve_highs,
+    "dp": solve_team_dp,
+}
+
+
+def top_k_teams(impact, overseas, role_masks, constraints, k=5, groups=None, prices=None):
+    """Up to k distinct teams, best first, as a list of (selected mask, total impact).
+
+    Enumerates with no-good cuts (each found team may share at most
+    team_size - 1 players with a later one) on HiGHS. A player ranked below
+    team_size + k - 1 within its (role, overseas) group can never make the
+    top k, since swapping in any of the k better unused group-mates keeps the
+    team feasible, so the model only ever sees those candidates. Under price
+    limits "better" means no worse on both impact and price (budget_candidates).
+    """
+    from scipy.sparse import csr_matrix, vstack
+
+    team_size = constraints.team_size
+    if has_price_limits(constraints):
+        _check_prices(prices, constraints)
+        candidates = budget_candidates(impact, overseas, role_masks, prices, constraints, keep=team_size + k - 1)
+    else:
+        if groups is None:
+            groups = dp_groups(impact, overseas, role_masks, limit=team_size + k - 1)
+        candidates = np.sort(np.concatenate(
+            [np.concatenate([local[:team_size + k - 1], foreign[:team_size + k - 1]]) for local, foreign in groups]
+        ).astype(np.int64))
+    if len(candidates) == 0:
+        return []
+
+    c, A, lower, upper = build_team_matrix(
+        impact[candidates], overseas[candidates],
+        {role: mask[candidates] for role, mask in role_masks.items()}, constraints,
+        None if prices is None else prices[candidates]
+    )
+    teams = []
+    for _ in range(k):
+        picked, violated = solve_team_matrix(c, A, lower, upper)
+        if violated:
+            break
+        selected = np.zeros(len(impact), dtype=bool)
+        selected[candidates[picked]] = True
+        teams.append((selected, float(impact[selected].sum())))
+
+        # No-good cut: never pick exactly this team again
+        A = vstack([A, csr_matrix(picked.astype(np.float64))], format='csr')
+        lower = np.append(lower, -np.inf)
+        upper = np.append(upper, team_size - 1)
+    return teams
+
+
+class IncrementalTeamSelector:
+    """Best XI solver for one player pool that is re-run as the sliders move.
+
+    compute_impact, the impact/overseas/role arrays and the sorted role groups
+    are built once per pool; each solve() only redoes the part that depends on
+    the constraints. The last solution is returned as-is when nothing changed,
+    and the PuLP backend keeps its model, updating right-hand sides and warm
+    starting CBC from the previous team. With prices (one per row, in crores)
+    the purse and price cap constraints can be used, and teams carry a
+    predicted_price_cr column.
+    """
+
+    def __init__(self, players_df, format_type, backend="dp", scored=False, role_masks=None, prices=None):
+        if backend not in SOLVERS:
+            raise ValueError(f"Unknown solver backend {backend!r}; expected one of {', '.join(SOLVERS)}")
+        self.format_type = format_type
+        self.backend = backend
+        # scored=True: players_df already went through compute_impact for this format
+        self.players = players_df if scored else compute_impact(players_df, format_type)
+        self.prices = None if prices is None else np.asarray(prices, dtype=np.float64)
+        if self.prices is not None:
+            self.players = self.players.assign(predicted_price_cr=self.prices)
+        self.impact, self.overseas, masks = team_arrays(self.players, role_masks is None)
+        # role_masks: precomputed masks over the same rows (e.g. PlayerPool.role_masks())
+        self.role_masks = masks if role_masks is None else role_masks
+        self.groups = dp_groups(self.impact, self.overseas, self.role_masks)
+        self._last = None
+        self._problem = None
+        self._problem_shape = None
+        # Recent top_k() answers; the selector lives as long as its pool, so only constraint changes add entries
+        self._top_k = LRUCache(max_entries=32, max_bytes=32 * 1024 * 1024)
+
+    def _solve_pulp(self, constraints):
+        selected, violated = self._solve_pulp_model(constraints)
+        if violated:
+            return selected, _unmet_team_constraints(self.impact, self.overseas, self.role_masks, constraints,
+                                                     self.prices)
+        return selected, []
+
+    def _solve_pulp_model(self, constraints):
+        from pulp import PULP_CBC_CMD
+
+        # Which price rows the model has; the cap row's members depend on the cap itself
+        shape = (constraints.budget is not None, constraints.max_player_price)
+        if self._problem is None or self._problem_shape != shape:
+            self._problem = build_team_problem(self.impact, self.overseas, self.role_masks, constraints,
+                                               self.prices)
+            self._problem_shape = shape
+            return solve_team_problem(*self._problem)
+
+        prob, choices = self._problem
+        prob.constraints["TeamSize"].changeRHS(constraints.team_size)
+        prob.constraints["OverseasLimit"].changeRHS(constraints.max_overseas)
+        for name, _, field in ROLE_MINIMUMS:
+            prob.constraints[name].changeRHS(getattr(constraints, field))
+        if constraints.budget is not None:
+            prob.constraints["Budget"].changeRHS(constraints.budget)
+        prob.solve(PULP_CBC_CMD(msg=False, warmStart=True))
+        return solve_team_problem(prob, choices, solved=True)
+
+    def solve(self, constraints):
+        """Returns (team DataFrame, violated constraint names)."""
+        if self._last is not None and self._last[0] == constraints:
+            team, violated = self._last[1]
+            return team.copy(), violated
+
+        if self.backend == "dp":
+            selected, violated = solve_team_dp(self.impact, self.overseas, self.role_masks, constraints,
+                                               groups=self.groups, prices=self.prices)
+        elif self.backend == "pulp":
+            selected, violated = self._solve_pulp(constraints)
+        else:
+            selected, violated = SOLVERS[self.backend](self.impact, self.overseas, self.role_masks, constraints,
+                                                       prices=self.prices)
+
+        team = self.players.iloc[:0] if violated else self.players[selected]
+        self._last = (constraints, (team, violated))
+        return team.copy(), violated
+
+    def top_k(self, constraints, k=5):
+        """Ranked alternative teams as a list of (team DataFrame, total impact)."""
+        def compute():
+            teams = top_k_teams(self.impact, self.overseas, self.role_masks, constraints, k, groups=self.groups,
+                                prices=self.prices)
+            return [(self.players[selected], total) for selected, total in teams]
+
+        return self._top_k.get_or_compute((constraints, k), compute)
+
+
+def select_best_team(players_df, format_type, constraints=TeamConstraints(), backend="pulp", prices=None):
+    """Pick the highest-impact team; returns (team DataFrame, violated constraint names).
+
+    prices (crores, one per row of players_df) are needed for a purse or price cap.
+    """
+    if backend not in SOLVERS:
+        raise ValueError(f"Unknown solver backend {backend!r}; expected one of {', '.join(SOLVERS)}")
+
+    players_df = compute_impact(players_df, format_type)
+    if prices is not None:
+        prices = np.asarray(prices, dtype=np.float64)
+        players_df = players_df.assign(predicted_price_cr=prices)
+    selected, violated = SOLVERS[backend](*team_arrays(players_df), constraints, prices=prices)
+
+    if violated:
+        return players_df.iloc[:0], violated
+    return players_df[selected], violated
@@ -0,0 +1,59 @@
+"""Server-side views of large frames for the UI: paging, downsampling and payload sizes.
+
+The Best XI page filters, sorts and slices the pool here and sends only the
+visible page to the browser; the pool map plots at most MAX_POINTS players.
+payload_bytes() measures what an element costs to ship, so reruns can
+report it when asked.
+"""
+import numpy as np
+
+PAGE_SIZE = 50
+# Scatter plots switch to WebGL above this many points and drop per-point labels above LABEL_POINTS
+WEBGL_POINTS = 1000
+LABEL_POINTS = 40
+MAX_POINTS = 5000
+
+
+def page_count(total, page_size=PAGE_SIZE):
+    return max((total + page_size - 1) // page_size, 1)
+
+
+def table_page(frame, sort_by, ascending=False, page=0, page_size=PAGE_SIZE, search=""):
+    """One page of frame after a name search and a stable sort; returns (page rows, matching rows, page).
+
+    Only the sort column is sorted (missing values last); page is clamped to
+    the pages that exist.
+    """
+    rows = frame
+    if search:
+        rows = rows[rows["player_name"].astype(str).str.contains(search, case=False, regex=False).to_numpy()]
+    page = min(max(page, 0), page_count(len(rows), page_size) - 1)
+    keys = rows[sort_by].reset_index(drop=True)
+    order = keys.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+    return rows.iloc[order[page * page_size:(page + 1) * page_size]], len(rows), page
+
+
+def downsample(values, max_points=MAX_POINTS):
+    """Positions of at most max_points rows to plot: the max_points // 10 largest
+    values, then an even spread of the rest."""
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+    top = max_points // 10
+    ranked = np.argsort(-np.asarray(values, dtype=np.float64), kind="stable")
+    rest = np.sort(ranked[top:])
+    spread = rest[np.linspace(0, len(rest) - 1, max_points - top).astype(np.int64)]
+    return np.sort(np.concatenate([ranked[:top], spread]))
+
+
+def payload_bytes(value):
+    """Approximate bytes sent to the browser: Arrow IPC for frames, JSON spec for Plotly figures."""
+    if hasattr(value, "to_plotly_json"):
+        return len(value.to_json())
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(value)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size